@@ -1,7 +1,8 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import assets, system, admin
+from app.api.v1.endpoints import assets, system, admin, notifications
 
 api_router = APIRouter()
 api_router.include_router(assets.router, prefix="/assets", tags=["assets"])
 api_router.include_router(system.router, prefix="/system", tags=["system"])
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
@@ -1,26 +1,60 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.database import get_db
-from app.models.all_models import PermissionRequest, ServiceRequest, AssetComment, AssetPermission
-from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.activity_rollup import dashboard, rebuild_rollups
+from app.core.config import settings
+from app.core.grants import ConcurrentReviewError, grant_sweeper, review_requests
+from app.core.permission_index import current_user_id
+from app.database import call_sync, get_async_db
+from app.schemas.permission import PermissionReviewRequest
 
 router = APIRouter()
 
 @router.get("/stats")
-def get_admin_stats(db: Session = Depends(get_db)):
-    pending_permissions = db.query(PermissionRequest).filter(PermissionRequest.status == "pending").count()
-    pending_requests = db.query(ServiceRequest).filter(ServiceRequest.status == "submitted").count()
-    
-    yesterday = datetime.now() - timedelta(days=1)
-    new_comments = db.query(AssetComment).filter(AssetComment.created_at >= yesterday).count()
-    
-    # Active users is mocked for now as we don't have login history table fully defined
-    active_users = 12
+async def get_admin_stats(
+    days: int = Query(30, ge=1, le=365),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # 원본 테이블 COUNT 대신 쓰기 시점에 갱신되는 시간 단위 집계(activity_rollups)만 읽음
+    return await db.run_sync(dashboard, days)
+
+@router.post("/stats/rebuild")
+async def rebuild_admin_stats(db: AsyncSession = Depends(get_async_db)):
+    # 이벤트를 거치지 않고 적재된 데이터가 있을 때 원본 테이블에서 집계를 재구성
+    buckets = await db.run_sync(rebuild_rollups)
+    return {"buckets": buckets}
+
+@router.post("/permission-requests/review")
+async def review_permission_requests(
+    body: PermissionReviewRequest,
+    user_id: Optional[str] = Depends(current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # 여러 요청을 한 트랜잭션으로 승인/반려 (권한 부여와 요청자 알림도 벌크 insert)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="X-User-Id header is required")
+    if len(body.ids) > settings.PERMISSION_REVIEW_MAX_BATCH:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.PERMISSION_REVIEW_MAX_BATCH} requests per batch"
+        )
+    try:
+        return await db.run_sync(
+            review_requests, body.ids, body.decision, user_id, body.reviewer_name, body.comment
+        )
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except ConcurrentReviewError as e:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/permissions/sweep")
+def read_grant_sweep_status():
+    return grant_sweeper.stats()
 
-    return {
-        "pendingPermissions": pending_permissions,
-        "pendingRequests": pending_requests,
-        "newComments": new_comments,
-        "activeUsers": active_users
-    }
+@router.post("/permissions/sweep")
+async def sweep_expired_grants():
+    # 주기 실행(GRANT_SWEEP_INTERVAL_SECONDS)을 기다리지 않고 만료 권한을 바로 정리
+    return await run_in_threadpool(call_sync, grant_sweeper.sweep)
@@ -1,81 +1,351 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from datetime import datetime
 from typing import List, Optional
-from app.database import get_db
+from app.core.cache import response_cache
+from app.core.catalog_snapshot import catalog_snapshot
+from app.core.config import settings
+from app.core.facets import FACET_FIELDS, facet_counts
+from app.database import async_engine, get_async_db
 from app.crud.crud_asset import asset as crud_asset
-from app.schemas.asset import AssetResponse
-from app.models.all_models import Service, AssetColumn, DataLineage, AssetComment, DataAsset
+from app.crud.crud_comment import comment as crud_comment
+from app.core.lineage_index import lineage_graph
+from app.core.permission_index import UserGrants, current_user_id, permission_index
+from app.core.sample_store import iter_json_array, sample_columns, sample_store, select_columns, table_to_rows
+from app.core.search_index import search_index, sql_search
+from app.core.serialization import FastJSONResponse, column_keys, row_dicts
+from app.schemas.asset import AssetResponse, AssetPage, AssetSearchHit, AssetFacets, CommentThreadPage
+from app.models.all_models import (
+    Service, AssetColumn, DataLineage, AssetComment, DataAsset, SampleData, AssetProfile
+)
 
 router = APIRouter()
 
+# 자산을 AssetResponse 와 같은 모양의 dict 로 (isMasked/hasPermission 은 요청마다 계산)
+_RESPONSE_FIELDS = tuple(f for f in AssetResponse.model_fields if f not in ("isMasked", "hasPermission"))
+# 목록 응답은 ORM 객체 대신 컬럼 튜플을 SELECT 해 바로 dict 로 매핑
+_COLUMN_KEYS = column_keys(AssetColumn)
+_LINEAGE_KEYS = column_keys(DataLineage)
+_COMMENT_KEYS = column_keys(AssetComment)
+
 @router.get("/services")
-def read_services(db: Session = Depends(get_db)):
-    return db.query(Service).all()
+async def read_services(request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        if settings.CATALOG_SNAPSHOT_ENABLED:
+            return (await catalog_snapshot.current(async_engine)).services
+        return (await db.execute(select(Service))).scalars().all()
+    return await response_cache.respond(request, ["services"], build)
 
-@router.get("/", response_model=List[AssetResponse])
-def read_assets(
-    db: Session = Depends(get_db),
-    service_id: Optional[str] = None
+@router.get("/", response_model=AssetPage)
+async def read_assets(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: Optional[str] = Depends(current_user_id),
+    service_id: Optional[str] = None,
+    limit: int = Query(settings.ASSET_PAGE_DEFAULT_LIMIT, ge=1, le=settings.ASSET_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="쉼표로 구분된 컬럼 목록 (예: id,name,schema_name)")
 ):
-    query = db.query(DataAsset)
-    if service_id:
-        query = query.filter(DataAsset.service_id == service_id)
-    assets = query.all()
-    
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    grants = await _user_grants(db, user_id)
+    now = datetime.now()
+
+    async def build():
+        try:
+            if settings.CATALOG_SNAPSHOT_ENABLED:
+                # 메모리 스냅샷에서 필터/정렬/페이지네이션 (ORM 객체 생성과 Pydantic 검증 없음)
+                snapshot = await catalog_snapshot.current(async_engine)
+                crud_asset.check_fields(field_list)
+                rows, next_cursor = snapshot.page(service_id=service_id, limit=limit, cursor=cursor)
+            else:
+                # 동기 CRUD 코드를 비동기 커넥션 위에서 그대로 재사용
+                rows, next_cursor = await db.run_sync(
+                    lambda s: crud_asset.get_multi(s, service_id=service_id, limit=limit, cursor=cursor, fields=field_list)
+                )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return _to_asset_page(rows, next_cursor, field_list, grants, now)
+
+    # 마스킹 결과가 사용자마다 다르므로 사용자(와 유효 권한 수)별로 캐시를 구분
+    return await response_cache.respond(request, ["assets", "permissions"], build, vary=grants.cache_key(now))
+
+async def _user_grants(db: AsyncSession, user_id: Optional[str]) -> UserGrants:
+    # 사용자별 권한 색인은 캐시되어 있으면 DB 를 거치지 않음
+    return await db.run_sync(permission_index.for_user, user_id)
+
+def _to_asset_page(rows, next_cursor: Optional[str], field_list: Optional[List[str]],
+                   grants: UserGrants, now: datetime) -> dict:
+    # 페이지 전체를 한 번 순회하며 권한 판단과 마스킹을 함께 처리 (행마다 dict 조회 한 번)
+    # 스냅샷 레코드/ORM 객체/Row 모두 속성으로 읽어 AssetPage 모양의 dict 로 만듦 (행별 Pydantic 검증 없음)
+    allows = grants.allows
+    keys = ["id", *field_list] if field_list else _RESPONSE_FIELDS
     result = []
-    for a in assets:
+    for a in rows:
         is_masked = a.requires_permission
-        asset_res = AssetResponse.model_validate(a)
-        asset_res.isMasked = is_masked
-        # [데모용] 모든 권한을 True로 설정하여 마스킹 해제 (관리자 계정 시나리오)
-        asset_res.hasPermission = True 
-        
-        # 권한이 없을 때만 이름을 마스킹해야 하는데, 현재는 데모이므로 마스킹 처리 안 함
-        if is_masked and not asset_res.hasPermission:
-            asset_res.name = "****"
-        result.append(asset_res)
-        
-    return result
+        has_permission = allows(a.id, a.owner_id, is_masked, now)
+
+        item = {f: getattr(a, f) for f in keys}
+        item["isMasked"] = is_masked
+        item["hasPermission"] = has_permission
+
+        if is_masked and not has_permission and "name" in item:
+            item["name"] = "****"
+        result.append(item)
+
+    return {"items": result, "next_cursor": next_cursor}
+
+@router.get("/search", response_model=List[AssetSearchHit])
+async def search_assets(
+    q: str = Query(..., min_length=1),
+    service_id: Optional[str] = None,
+    sensitivity_level: Optional[str] = None,
+    prefix: bool = True,
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: Optional[str] = Depends(current_user_id),
+):
+    grants = await _user_grants(db, user_id)
+    # 색인은 백그라운드에서 구성하고 준비될 때까지는 SQL 로 검색. 이후에는 쓰기 이벤트/워터마크로 증분 갱신
+    if not await search_index.ensure_fresh(async_engine):
+        hits = await db.run_sync(lambda s: sql_search(
+            s, q, service_id=service_id, sensitivity_level=sensitivity_level, limit=limit, prefix=prefix
+        ))
+    else:
+        hits = search_index.search(
+            q, service_id=service_id, sensitivity_level=sensitivity_level, limit=limit, prefix=prefix
+        )
+    return FastJSONResponse(_mask_hits(hits, grants, datetime.now()))
+
+def _mask_hits(hits: List[dict], grants: UserGrants, now: datetime) -> List[dict]:
+    # 목록/단건 조회와 같은 기준으로 권한 없는 보호 자산의 이름을 가림 (판단용 필드는 응답에서 제외)
+    for h in hits:
+        owner_id = h.pop("owner_id")
+        requires_permission = h.pop("requires_permission")
+        if requires_permission and not grants.allows(h["id"], owner_id, requires_permission, now):
+            h["name"] = "****"
+    return hits
+
+def _mask_graph(graph: dict, grants: UserGrants, now: datetime) -> dict:
+    # 탐색 결과는 공유 캐시이므로 노드를 바꾸지 않고 가린 사본을 만듦 (_asset_item 과 같은 기준)
+    nodes = []
+    for n in graph["nodes"]:
+        requires_permission, owner_id = lineage_graph.protected(n["asset_id"])
+        if requires_permission and not grants.allows(n["asset_id"], owner_id, requires_permission, now):
+            n = {**n, "name": "****"}
+        nodes.append(n)
+    return {**graph, "nodes": nodes}
+
+@router.get("/facets", response_model=AssetFacets)
+async def read_asset_facets(
+    request: Request,
+    service_id: Optional[str] = None,
+    database_name: Optional[str] = None,
+    schema_name: Optional[str] = None,
+    sensitivity_level: Optional[str] = None,
+    tag: List[str] = Query([], description="모든 태그를 포함하는 자산만 (반복 지정)"),
+    tag_limit: int = Query(50, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # 사이드바 패싯: 필터 조합별 결과를 캐시하고 자산이 바뀌면 무효화
+    filters = dict(zip(FACET_FIELDS, (service_id, database_name, schema_name, sensitivity_level)))
+
+    async def build():
+        return await db.run_sync(lambda s: facet_counts(s, filters, tag, tag_limit))
+    return await response_cache.respond(request, ["assets"], build)
 
 @router.get("/{asset_id}", response_model=AssetResponse)
-def read_asset(
+async def read_asset(
+    asset_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: Optional[str] = Depends(current_user_id),
+):
+    grants = await _user_grants(db, user_id)
+    now = datetime.now()
+
+    async def build():
+        a = (await catalog_snapshot.current(async_engine)).get(asset_id) if settings.CATALOG_SNAPSHOT_ENABLED else None
+        if a is None:
+            # 스냅샷에 아직 반영되지 않은 자산(다른 워커에서 방금 추가)일 수 있으므로 DB 로 확인
+            a = await db.get(DataAsset, asset_id)
+        if not a:
+            raise HTTPException(status_code=404, detail="Asset not found")
+        return _asset_item(a, grants, now)
+    return await response_cache.respond(request, ["assets", "permissions"], build, vary=grants.cache_key(now))
+
+BUNDLE_SECTIONS = ("columns", "lineage", "comments", "preview")
+PREVIEW_LIMIT = 100
+
+@router.get("/{asset_id}/bundle")
+async def read_asset_bundle(
     asset_id: str,
-    db: Session = Depends(get_db)
+    include: Optional[str] = Query(None, description="쉼표로 구분된 섹션 목록 (columns,lineage,comments,preview)"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: Optional[str] = Depends(current_user_id),
 ):
-    a = db.query(DataAsset).filter(DataAsset.id == asset_id).first()
+    sections = [s.strip() for s in include.split(",") if s.strip()] if include else list(BUNDLE_SECTIONS)
+    unknown = [s for s in sections if s not in BUNDLE_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+
+    # 관계별로 IN 쿼리 한 번씩 일괄 로딩 (N+1 없음)
+    options = []
+    if "columns" in sections:
+        options.append(selectinload(DataAsset.columns))
+    if "comments" in sections:
+        options.append(selectinload(DataAsset.comments))
+    if "lineage" in sections:
+        options += [selectinload(DataAsset.upstream_lineage), selectinload(DataAsset.downstream_lineage)]
+
+    a = (await db.execute(
+        select(DataAsset).options(*options).where(DataAsset.id == asset_id)
+    )).scalar_one_or_none()
     if not a:
         raise HTTPException(status_code=404, detail="Asset not found")
-    
-    asset_res = AssetResponse.model_validate(a)
-    asset_res.isMasked = a.requires_permission
-    # [데모용] 모든 권한을 True로 설정
-    asset_res.hasPermission = True
-    
-    if asset_res.isMasked and not asset_res.hasPermission:
-        asset_res.name = "****"
-        
-    return asset_res
+
+    grants = await _user_grants(db, user_id)
+    asset_item = _asset_item(a, grants, datetime.now())
+    bundle = {"asset": asset_item}
+    if "columns" in sections:
+        bundle["columns"] = [_row_dict(c) for c in a.columns]
+    if "lineage" in sections:
+        edges = {e.id: e for e in (*a.upstream_lineage, *a.downstream_lineage)}
+        bundle["lineage"] = [_row_dict(e) for e in edges.values()]
+    if "comments" in sections:
+        bundle["comments"] = [_row_dict(c) for c in a.comments]
+    if "preview" in sections and not asset_item["hasPermission"]:
+        # 권한이 없는 보호 자산의 샘플 데이터는 내려주지 않음
+        bundle["preview"] = []
+    elif "preview" in sections:
+        table = await _sample_table(asset_id, db)
+        bundle["preview"] = table_to_rows(table.slice(0, PREVIEW_LIMIT)) if table is not None else []
+    return FastJSONResponse(bundle)
+
+def _asset_item(a, grants: UserGrants, now: datetime) -> dict:
+    # AssetResponse 와 같은 모양의 dict (스냅샷 레코드와 ORM 객체 모두 지원)
+    item = {f: getattr(a, f) for f in _RESPONSE_FIELDS}
+    item["isMasked"] = a.requires_permission
+    item["hasPermission"] = grants.allows(a.id, a.owner_id, a.requires_permission, now)
+    if item["isMasked"] and not item["hasPermission"]:
+        item["name"] = "****"
+    return item
+
+def _row_dict(obj) -> dict:
+    # 관계 속성을 제외한 컬럼 값만 직렬화 (eager 로딩된 관계의 순환 참조 방지)
+    return {c.key: getattr(obj, c.key) for c in obj.__table__.columns}
 
 @router.get("/{asset_id}/columns")
-def read_asset_columns(asset_id: str, db: Session = Depends(get_db)):
-    return db.query(AssetColumn).filter(AssetColumn.asset_id == asset_id).order_by(AssetColumn.ordinal_position).all()
+async def read_asset_columns(asset_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        result = await db.execute(
+            select(*AssetColumn.__table__.columns).where(AssetColumn.asset_id == asset_id)
+            .order_by(AssetColumn.ordinal_position)
+        )
+        return row_dicts(_COLUMN_KEYS, result)
+    return await response_cache.respond(request, ["columns"], build)
 
 @router.get("/{asset_id}/lineage")
-def read_asset_lineage(asset_id: str, db: Session = Depends(get_db)):
-    return db.query(DataLineage).filter(
+async def read_asset_lineage(asset_id: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(*DataLineage.__table__.columns).where(
         (DataLineage.source_asset_id == asset_id) | (DataLineage.target_asset_id == asset_id)
-    ).all()
+    ))
+    return FastJSONResponse(row_dicts(_LINEAGE_KEYS, result))
+
+@router.get("/{asset_id}/lineage/graph")
+async def read_asset_lineage_graph(
+    asset_id: str,
+    direction: str = Query("both", pattern="^(upstream|downstream|both)$"),
+    depth: int = Query(3, ge=1, le=10),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: Optional[str] = Depends(current_user_id),
+):
+    # 인접 인덱스는 리니지(또는 노드 이름) 변경 시에만 다시 구성되며, 탐색 결과도 캐시됨
+    # 다른 워커의 변경은 워터마크로 감지하고, 복제 지연을 피하려고 구성은 primary 에서 읽음
+    if not lineage_graph.is_current():
+        async with async_engine.connect() as conn:
+            await conn.run_sync(lineage_graph.ensure_loaded)
+    # 리니지가 없는 자산은 인덱스에 없으므로 카탈로그에서 확인
+    if not lineage_graph.has_node(asset_id) and await db.scalar(
+        select(DataAsset.id).where(DataAsset.id == asset_id)
+    ) is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    grants = await _user_grants(db, user_id)
+    graph = lineage_graph.traverse(asset_id, direction=direction, depth=depth)
+    return FastJSONResponse(_mask_graph(graph, grants, datetime.now()))
 
 @router.get("/{asset_id}/comments")
-def read_asset_comments(asset_id: str, db: Session = Depends(get_db)):
-    return db.query(AssetComment).filter(AssetComment.asset_id == asset_id).all()
+async def read_asset_comments(asset_id: str, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(*AssetComment.__table__.columns).where(AssetComment.asset_id == asset_id))
+    return FastJSONResponse(row_dicts(_COMMENT_KEYS, result))
+
+@router.get("/{asset_id}/comments/threads", response_model=CommentThreadPage)
+async def read_asset_comment_threads(
+    asset_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = None,
+    since: Optional[str] = Query(None, description="이 커서보다 새로 작성된 스레드만 (새 글 확인용)"),
+):
+    async def build():
+        try:
+            items, next_cursor, total = await db.run_sync(
+                lambda s: crud_comment.get_threads(s, asset_id=asset_id, limit=limit, cursor=cursor, since=since)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"items": items, "next_cursor": next_cursor, "total_threads": total}
+    return await response_cache.respond(request, ["comments"], build)
+
+@router.get("/{asset_id}/profile")
+async def read_asset_profile(asset_id: str, db: AsyncSession = Depends(get_async_db)):
+    # 컬럼별 널 비율/고유값 수/최소·최대/신선도 (POST /system/dq-profile 로 계산)
+    profile = await db.get(AssetProfile, asset_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+async def _sample_table(asset_id: str, db: AsyncSession):
+    # 열 지향 샘플 파일을 memory-map 으로 열고, 아직 없으면 SampleData JSON 을 한 번만 변환해 저장
+    table = await run_in_threadpool(sample_store.load, asset_id)
+    if table is not None:
+        return table
+    generation = sample_store.generation(asset_id)
+    result = await db.execute(select(SampleData.row_data).where(SampleData.asset_id == asset_id))
+    rows = result.scalars().all()
+    if not rows:
+        return None
+    return await run_in_threadpool(sample_store.write, asset_id, rows, generation)
 
 @router.get("/{asset_id}/preview")
-def get_asset_preview(asset_id: str, db: Session = Depends(get_db)):
-    from app.models.all_models import SampleData
-    
-    # SampleData 테이블에서 해당 asset_id의 데이터를 조회
-    samples = db.query(SampleData).filter(SampleData.asset_id == asset_id).limit(100).all()
-    
-    # JSON 데이터만 추출하여 리스트로 반환
-    return [s.row_data for s in samples]
+async def get_asset_preview(
+    asset_id: str,
+    columns: Optional[str] = Query(None, description="쉼표로 구분된 컬럼 목록"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(PREVIEW_LIMIT, ge=1, le=settings.PREVIEW_MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: Optional[str] = Depends(current_user_id),
+):
+    grants = await _user_grants(db, user_id)
+    if not grants.full_access:
+        owner = (await db.execute(
+            select(DataAsset.requires_permission, DataAsset.owner_id).where(DataAsset.id == asset_id)
+        )).first()
+        if owner and not grants.allows(asset_id, owner.owner_id, owner.requires_permission, datetime.now()):
+            raise HTTPException(status_code=403, detail="Permission required")
+    table = await _sample_table(asset_id, db)
+    if table is None:
+        return []
+    if columns:
+        wanted = [c.strip() for c in columns.split(",") if c.strip()]
+        available = set(sample_columns(table))
+        unknown = [c for c in wanted if c not in available]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+        table = select_columns(table, wanted)
+    # 슬라이스는 복사 없이 mmap 버퍼를 가리키며, 응답은 레코드 배치 단위로 스트리밍
+    return StreamingResponse(iter_json_array(table.slice(offset, limit)), media_type="application/json")
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.notifications import format_sse, notification_broker, unread_counter
+from app.core.permission_index import current_user_id
+from app.core.serialization import FastJSONResponse
+from app.crud.crud_notification import notification as crud_notification, parse_event_id, to_event
+from app.database import AsyncSessionLocal, get_async_db
+from app.schemas.notification import MarkReadRequest, NotificationPage
+
+router = APIRouter()
+
+def _require_user(user_id: Optional[str] = Depends(current_user_id)) -> str:
+    if not user_id:
+        raise HTTPException(status_code=401, detail="X-User-Id header is required")
+    return user_id
+
+@router.get("/", response_model=NotificationPage)
+async def read_notifications(
+    user_id: str = Depends(_require_user),
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+):
+    try:
+        rows, next_cursor = await db.run_sync(
+            lambda s: crud_notification.get_multi(s, user_id=user_id, limit=limit, cursor=cursor, unread_only=unread_only)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"items": [to_event(n) for n in rows], "next_cursor": next_cursor})
+
+@router.get("/unread-count")
+async def read_unread_count(user_id: str = Depends(_require_user), db: AsyncSession = Depends(get_async_db)):
+    # 캐시된 카운터가 있으면 DB 를 거치지 않음 (발행/읽음 처리 시 증감)
+    count = await db.run_sync(
+        lambda s: unread_counter.load(user_id, lambda: crud_notification.count_unread(s, user_id))
+    )
+    return {"count": count}
+
+@router.post("/read")
+async def mark_notifications_read(
+    body: MarkReadRequest,
+    user_id: str = Depends(_require_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    updated = await db.run_sync(lambda s: crud_notification.mark_read(s, user_id=user_id, ids=body.ids))
+    # 벌크 UPDATE 는 세션 flush 이벤트를 타지 않으므로 카운터를 직접 차감
+    unread_counter.add(user_id, -updated)
+    return {"updated": updated}
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    header_user_id: Optional[str] = Depends(current_user_id),
+    user_id: Optional[str] = Query(None, description="EventSource 는 헤더를 지정할 수 없으므로 쿼리로도 허용"),
+    last_event_id: Optional[str] = Header(None),
+    last_event_id_query: Optional[str] = Query(None, alias="last_event_id"),
+):
+    user_id = header_user_id or user_id
+    if not user_id:
+        raise HTTPException(status_code=401, detail="X-User-Id header or user_id query is required")
+    resume_from = last_event_id or last_event_id_query
+    try:
+        after = parse_event_id(resume_from) if resume_from else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 누락 구간이 없도록 먼저 구독한 뒤 Last-Event-ID 이후분을 DB 에서 보내고,
+    # 그 사이 큐에 들어온 실시간 이벤트 중 재전송으로 이미 보낸 알림만 id 로 건너뜀
+    # (실시간 이벤트는 커밋 순서로 오므로 커서 비교로 거르면 먼저 찍히고 늦게 커밋된 알림을 잃음)
+    sub = notification_broker.subscribe(user_id)
+
+    async def events():
+        nonlocal after
+        replayed = set()
+        try:
+            yield b"retry: 3000\n\n"
+            if after is not None:
+                async with AsyncSessionLocal() as db:
+                    while True:
+                        rows = await db.run_sync(lambda s: crud_notification.since(
+                            s, user_id=user_id, after=after, limit=settings.NOTIFY_REPLAY_LIMIT
+                        ))
+                        for n in rows:
+                            yield format_sse(to_event(n))
+                            replayed.add(n.id)
+                            after = n.seq
+                        if len(rows) < settings.NOTIFY_REPLAY_LIMIT:
+                            break
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), settings.NOTIFY_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # 프록시가 유휴 연결을 끊지 않도록 주기적으로 주석 행 전송
+                    yield b": ping\n\n"
+                    continue
+                if event is None:
+                    # 큐가 넘친 느린 클라이언트는 끊어서 Last-Event-ID 로 다시 받게 함
+                    break
+                if event["id"] in replayed:
+                    replayed.discard(event["id"])
+                    continue
+                yield format_sse(event)
+        finally:
+            notification_broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,43 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from app.database import engine, Base, get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, text
+from app.core.activity_rollup import rebuild_rollups
+from app.core.cache import response_cache
+from app.core.catalog_snapshot import catalog_snapshot
+from app.core.config import settings
+from app.core.crawler import configured_sources, crawler, run_crawl_job
+from app.core.export import MEDIA_TYPES, export_catalog, export_filename
+from app.core.jobs import jobs, Job
+from app.core.notifications import unread_counter
+from app.core.permission_index import permission_index
+from app.core.profiling import run_profiling
+from app.core.sample_store import sample_store
+from app.core.synthetic import seed_synthetic_catalog
+from app.crud.crud_ingest import AssetIngestor
+from app.database import (
+    MYSQL_DIALECTS, async_engine, engine, Base, call_sync, get_async_db, iterate_sync, AsyncSessionLocal, SessionLocal,
+    replica_pool,
+)
+from app.schemas.asset import AssetIngest
+from app.schemas.system import CrawlRequest, DQProfileRequest, SyntheticCatalogConfig
+from app.core.lineage_index import lineage_graph
+from app.core.search_index import search_index
 from app.models.all_models import (
     Service, DataAsset, AssetColumn, PermissionRequest, AssetPermission, 
-    Notification, DataLineage, AssetComment, SampleData
+    Notification, DataLineage, AssetComment, SampleData, AssetProfile
 )
+import logging
+import time
+from typing import Optional
 import uuid
 import random
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 def get_uuid():
     return str(uuid.uuid4())
 
 @router.post("/init-sample-data")
-def init_sample_data(db: Session = Depends(get_db)):
+async def init_sample_data(db: AsyncSession = Depends(get_async_db)):
     try:
-        db.execute(text("SET FOREIGN_KEY_CHECKS = 0;"))
+        # FOREIGN_KEY_CHECKS 는 MariaDB 전용 (로컬 SQLite 에서는 생략)
+        is_mysql = async_engine.dialect.name in MYSQL_DIALECTS
+        if is_mysql:
+            await db.execute(text("SET FOREIGN_KEY_CHECKS = 0;"))
         tables = [
-            "asset_columns", "asset_comments", "asset_permissions", 
+            "asset_tags", "asset_tombstones", "asset_columns", "asset_comments", "asset_permissions", 
             "permission_requests", "data_lineage", "service_requests", 
             "request_types", "request_categories", "notifications",
-            "data_assets", "services", "sample_data"
+            "asset_profiles", "data_assets", "services", "sample_data",
+            "activity_rollups", "activity_totals", "user_activity_days", "crawl_state"
         ]
         for t in tables:
-            db.execute(text(f"DROP TABLE IF EXISTS {t};"))
-        db.execute(text("SET FOREIGN_KEY_CHECKS = 1;"))
-        db.commit()
+            await db.execute(text(f"DROP TABLE IF EXISTS {t};"))
+        if is_mysql:
+            await db.execute(text("SET FOREIGN_KEY_CHECKS = 1;"))
+        await db.commit()
 
-        Base.metadata.create_all(bind=engine)
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
 
         # 1. 서비스 생성
         svc_platform = Service(id=get_uuid(), name="데이터플랫폼", description="전사 데이터 분석 플랫폼", icon="database", color="blue")
         svc_hiring = Service(id=get_uuid(), name="채용솔루션", description="채용 관리 플랫폼", icon="users", color="emerald")
         svc_eng = Service(id=get_uuid(), name="엔지니어링솔루션", description="DevOps 도구 플랫폼", icon="code", color="orange")
         db.add_all([svc_platform, svc_hiring, svc_eng])
-        db.flush()
+        await db.flush()
 
         # 2. 모든 자산(32개) 생성 로직
         # [DB_STRUCTURE_PROMPT.md의 32개 명세를 리스트화]
@@ -84,7 +117,7 @@ def init_sample_data(db: Session = Depends(get_db)):
                 sensitivity_level=sens, requires_permission=(sens != "public"),
                 description=f"{real_name} 테이블 상세 명세"
             )
-            db.add(asset); db.flush()
+            db.add(asset); await db.flush()
 
             # [핵심] 모든 자산에 컬럼 5개씩 자동 생성
             cols = [
@@ -109,9 +142,206 @@ def init_sample_data(db: Session = Depends(get_db)):
                 "updated_at": "2024-02-05"
             }))
 
-        db.commit()
+        await db.commit()
+        # 테이블을 새로 만들었으므로 인메모리 색인은 다음 조회 때 다시 구성
+        search_index.clear()
+        catalog_snapshot.clear()
+        lineage_graph.invalidate()
+        sample_store.clear()
+        permission_index.clear()
+        unread_counter.clear()
         return {"message": "Success! 32 assets with full columns and sample rows created."}
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+
+MAX_REPORTED_ERRORS = 100
+
+async def _write_batch(ingestor: AssetIngestor, batch):
+    # 배치마다 독립된 세션/트랜잭션으로 커밋 (실패 시 이전 배치는 유지됨)
+    async with AsyncSessionLocal() as db:
+        try:
+            return await db.run_sync(ingestor.write_batch, batch)
+        except Exception:
+            await db.rollback()
+            raise
+
+@router.post("/ingest")
+async def ingest_assets(
+    request: Request,
+    batch_size: int = Query(settings.INGEST_BATCH_SIZE, ge=1, le=settings.INGEST_MAX_BATCH_SIZE)
+):
+    # 요청 본문(NDJSON)을 스트림으로 읽으며 한 줄씩 파싱하고, 배치가 차면 바로 기록
+    ingestor = AssetIngestor(batch_size=batch_size)
+    progress, errors = [], []
+    line_no, invalid, buf = 0, 0, b""
+    started = time.perf_counter()
+
+    async def flush():
+        result = await _write_batch(ingestor, ingestor.take_batch())
+        progress.append(result)
+        logger.info("ingest batch %(batch)d: %(assets)d assets, %(columns)d columns in %(elapsed_ms)sms", result)
+
+    def parse(line: bytes):
+        nonlocal line_no, invalid
+        line_no += 1
+        if not line.strip():
+            return False
+        try:
+            return ingestor.add(AssetIngest.model_validate_json(line))
+        except ValidationError as e:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_no, "error": e.errors(include_url=False)[0]["msg"]})
+            return False
+
+    try:
+        async for chunk in request.stream():
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                if parse(line):
+                    await flush()
+        if buf and parse(buf):
+            await flush()
+        if ingestor.pending:
+            await flush()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail={"error": str(e), "batches": progress})
+
+    return {
+        "lines": line_no,
+        "assets": sum(p["assets"] for p in progress),
+        "inserted": sum(p["inserted"] for p in progress),
+        "updated": sum(p["updated"] for p in progress),
+        "columns": sum(p["columns"] for p in progress),
+        "samples": sum(p["samples"] for p in progress),
+        "invalid": invalid,
+        "errors": errors,
+        "batches": progress,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _run_synthetic_seed(job: Job, cfg: SyntheticCatalogConfig):
+    db = SessionLocal()
+    try:
+        counts = seed_synthetic_catalog(db, cfg, job=job)
+        # Core insert 는 집계 이벤트를 거치지 않으므로 대시보드 집계를 다시 구성
+        rebuild_rollups(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    search_index.clear()
+    catalog_snapshot.clear()
+    lineage_graph.invalidate()
+    sample_store.clear()
+    permission_index.clear()
+    unread_counter.clear()
+    response_cache.invalidate(["assets", "columns", "services", "permissions", "comments"])
+    return counts
+
+@router.post("/synthetic-catalog", status_code=202)
+async def start_synthetic_catalog(cfg: SyntheticCatalogConfig):
+    # 대용량 생성은 수 분이 걸릴 수 있으므로 백그라운드 작업으로 실행하고 job id 를 반환
+    if jobs.running("synthetic-catalog"):
+        raise HTTPException(status_code=409, detail="Synthetic catalog job already running")
+    job = jobs.submit("synthetic-catalog", _run_synthetic_seed, cfg, params=cfg.model_dump())
+    return job.to_dict()
+
+def _run_dq_profile(job: Job, req: DQProfileRequest):
+    db = SessionLocal()
+    try:
+        return run_profiling(db, force=req.force, asset_ids=req.asset_ids, workers=req.workers, job=job)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+@router.post("/dq-profile", status_code=202)
+async def start_dq_profile(req: DQProfileRequest):
+    if jobs.running("dq-profile"):
+        raise HTTPException(status_code=409, detail="Profiling job already running")
+    job = jobs.submit("dq-profile", _run_dq_profile, req, params=req.model_dump())
+    return job.to_dict()
+
+@router.get("/dq-profile")
+async def read_dq_profile_status(db: AsyncSession = Depends(get_async_db)):
+    profiled, latest = (await db.execute(
+        select(func.count(), func.max(AssetProfile.profiled_at)).select_from(AssetProfile)
+    )).one()
+    with_samples = await db.scalar(select(func.count(func.distinct(SampleData.asset_id))))
+    last = next(iter(jobs.list("dq-profile")), None)
+    return {
+        "profiled_assets": profiled,
+        "assets_with_samples": with_samples,
+        "last_profiled_at": latest,
+        "job": last.to_dict() if last else None,
+    }
+
+@router.post("/crawl", status_code=202)
+async def start_crawl(req: CrawlRequest):
+    # 설정된 소스 DB 의 스키마를 병렬로 수집해 카탈로그에 변경분만 반영
+    names = {s.name for s in configured_sources()}
+    if not names:
+        raise HTTPException(status_code=400, detail="No crawl sources configured (CRAWL_SOURCES)")
+    unknown = set(req.sources or ()) - names
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown crawl sources: {', '.join(sorted(unknown))}")
+    if jobs.running("crawl"):
+        raise HTTPException(status_code=409, detail="Crawl job already running")
+    job = jobs.submit("crawl", run_crawl_job, req.sources, req.resume, req.full, params=req.model_dump())
+    return job.to_dict()
+
+@router.get("/crawl")
+def read_crawl_status():
+    # 동기 세션으로 상태 테이블을 읽으므로 스레드풀에서 실행되도록 def 로 둠
+    states = call_sync(crawler.states)
+    last = next(iter(jobs.list("crawl")), None)
+    return {
+        "sources": [
+            {"name": s.name, "state": {
+                k: getattr(states[s.name], k)
+                for k in ("run_id", "status", "tables", "stats", "error", "started_at", "finished_at")
+            } if s.name in states else None}
+            for s in configured_sources()
+        ],
+        "job": last.to_dict() if last else None,
+    }
+
+@router.get("/export")
+async def export_catalog_dump(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    table: str = Query("catalog", pattern="^(catalog|lineage)$",
+                       description="catalog: 자산+컬럼(+NDJSON 은 상위 리니지 포함), lineage: 리니지 엣지"),
+    gzip: bool = False,
+    batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=settings.INGEST_MAX_BATCH_SIZE),
+):
+    # 전체 카탈로그를 배치 단위로 스트리밍 (카탈로그 크기와 무관하게 메모리 사용량 일정)
+    if gzip and format == "parquet":
+        raise HTTPException(status_code=400, detail="Parquet output is already compressed")
+    # 조회 전용이므로 정상 레플리카가 있으면 레플리카에서 읽음
+    replica = replica_pool.choose()
+    source = replica.async_engine.sync_engine if replica is not None else engine
+    filename = export_filename(format, table, gzip)
+    return StreamingResponse(
+        iterate_sync(export_catalog, source, format, table, batch_size, gzip=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.get("/jobs")
+async def list_jobs(kind: Optional[str] = None):
+    return [j.to_dict() for j in jobs.list(kind)]
+
+@router.get("/jobs/{job_id}")
+async def read_job(job_id: str):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
@@ -0,0 +1,243 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.database import MYSQL_DIALECTS
+from app.models.all_models import (
+    ActivityRollup, ActivityTotal, AssetComment, PermissionRequest, ServiceRequest, UserActivityDay,
+)
+
+# 모델 -> (지표 이름, 상태 컬럼, 사용자 컬럼). 상태가 없는 지표는 빈 문자열로 집계
+ROLLUP_MODELS = {
+    AssetComment: ("comments", None, "user_id"),
+    PermissionRequest: ("permission_requests", "status", "requester_id"),
+    ServiceRequest: ("service_requests", "status", "requester_id"),
+}
+
+Key = Tuple[datetime, str, str]
+
+
+# 대기 건수로 보여주는 (지표, 상태)
+PENDING_STATUSES = {"permission_requests": "pending", "service_requests": "submitted"}
+
+
+def db_now(conn) -> datetime:
+    # created_at 의 server_default(func.now()) 와 같은 DB 시계. 버킷/활동일/대시보드 기간을 모두 이 시계로 계산
+    return conn.execute(select(func.now())).scalar().replace(tzinfo=None)
+
+
+def hour_bucket(value: datetime) -> datetime:
+    return value.replace(tzinfo=None, minute=0, second=0, microsecond=0)
+
+
+def _dialect_insert(conn):
+    if conn.dialect.name in MYSQL_DIALECTS:
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _add_counts(conn, table, key_columns, rows):
+    insert = _dialect_insert(conn)
+    stmt = insert(table)
+    if conn.dialect.name in MYSQL_DIALECTS:
+        stmt = stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted["count"])
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={"count": table.c.count + stmt.excluded["count"]},
+        )
+    conn.execute(stmt, rows)
+
+
+def apply_deltas(conn, deltas: Dict[Key, int]):
+    # 시간 버킷과 (지표, 상태) 누계를 같은 트랜잭션에서 함께 증감
+    rows = [{"bucket": b, "metric": m, "status": s, "count": n} for (b, m, s), n in deltas.items() if n]
+    if not rows:
+        return
+    totals: Counter = Counter()
+    for (_, m, s), n in deltas.items():
+        totals[(m, s)] += n
+    _add_counts(conn, ActivityRollup.__table__, ["bucket", "metric", "status"], rows)
+    total_rows = [{"metric": m, "status": s, "count": n} for (m, s), n in totals.items() if n]
+    if total_rows:
+        _add_counts(conn, ActivityTotal.__table__, ["metric", "status"], total_rows)
+
+
+def rebuild_totals(conn):
+    # activity_rollups 로부터 누계를 다시 채움 (마이그레이션용)
+    conn.execute(delete(ActivityTotal))
+    conn.execute(insert(ActivityTotal).from_select(
+        ["metric", "status", "count"],
+        select(ActivityRollup.metric, ActivityRollup.status, func.sum(ActivityRollup.count))
+        .group_by(ActivityRollup.metric, ActivityRollup.status),
+    ))
+
+
+def record_activity(conn, pairs: Iterable[Tuple[date, str]]):
+    rows = [{"day": d, "user_id": u} for d, u in set(pairs) if u]
+    if not rows:
+        return
+    insert = _dialect_insert(conn)
+    stmt = insert(UserActivityDay.__table__)
+    if conn.dialect.name in MYSQL_DIALECTS:
+        stmt = stmt.prefix_with("IGNORE")
+    else:
+        stmt = stmt.on_conflict_do_nothing()
+    conn.execute(stmt, rows)
+
+
+def rebuild_rollups(db: Session, yield_per: int = 10_000) -> int:
+    # 대량 Core insert(합성 데이터 등)는 세션 이벤트를 거치지 않으므로 원본 테이블을 한 번 스트리밍해 재구성
+    deltas: Counter = Counter()
+    active = set()
+    now = db_now(db)
+    for model, (metric, status_col, user_col) in ROLLUP_MODELS.items():
+        cols = [model.created_at, getattr(model, user_col)]
+        if status_col:
+            cols.append(getattr(model, status_col))
+        for row in db.execute(select(*cols).execution_options(yield_per=yield_per)):
+            deltas[(hour_bucket(row[0] or now), metric, row[2] if status_col else "")] += 1
+            if row[0] is not None and row[1]:
+                active.add((row[0].date(), row[1]))
+
+    db.execute(delete(ActivityRollup))
+    db.execute(delete(ActivityTotal))
+    db.execute(delete(UserActivityDay))
+    conn = db.connection()
+    apply_deltas(conn, deltas)
+    record_activity(conn, active)
+    db.commit()
+    return len(deltas)
+
+
+def dashboard(db: Session, days: int = 30) -> dict:
+    now = db_now(db)
+    since = hour_bucket(now - timedelta(days=days - 1)).replace(hour=0)
+    last_24h = hour_bucket(now - timedelta(hours=23))
+
+    # 대기 건수는 누계 행, 나머지는 기간 내 시간 버킷만 읽음 (원본 테이블 크기/보관 기간과 무관)
+    pending = dict(db.execute(
+        select(ActivityTotal.metric, ActivityTotal.count)
+        .where(ActivityTotal.metric.in_(PENDING_STATUSES), ActivityTotal.status.in_(PENDING_STATUSES.values()))
+    ).all())
+    rows = db.execute(
+        select(ActivityRollup.bucket, ActivityRollup.metric, ActivityRollup.status, ActivityRollup.count)
+        .where(ActivityRollup.bucket >= min(since, last_24h))
+    ).all()
+    # 이틀 모두 활동한 사용자를 한 번만 세도록 user_id 기준으로 집계
+    active_users = db.scalar(
+        select(func.count(func.distinct(UserActivityDay.user_id)))
+        .where(UserActivityDay.day >= (now - timedelta(days=1)).date())
+    )
+
+    day_keys = [(since + timedelta(days=i)).date().isoformat() for i in range(days)]
+    comments = dict.fromkeys(day_keys, 0)
+    by_status = {"permission_requests": {}, "service_requests": {}}
+    new_comments = 0
+    for bucket, metric, status, count in rows:
+        if metric == "comments" and bucket >= last_24h:
+            new_comments += count
+        if bucket < since:
+            continue
+        day = bucket.date().isoformat()
+        if metric == "comments":
+            comments[day] += count
+        else:
+            series = by_status[metric].setdefault(status, dict.fromkeys(day_keys, 0))
+            series[day] += count
+
+    return {
+        "pendingPermissions": int(pending.get("permission_requests") or 0),
+        "pendingRequests": int(pending.get("service_requests") or 0),
+        "newComments": new_comments,
+        # 로그인 이력이 없으므로 최근 이틀(어제~오늘) 댓글/요청을 작성한 사용자 수로 대신함
+        "activeUsers": active_users or 0,
+        "trends": {
+            "days": day_keys,
+            "comments": [comments[d] for d in day_keys],
+            "permissionRequests": {s: list(v.values()) for s, v in by_status["permission_requests"].items()},
+            "serviceRequests": {s: list(v.values()) for s, v in by_status["service_requests"].items()},
+        },
+    }
+
+
+# --- 쓰기 시점 증분 갱신 (같은 트랜잭션 안에서 반영되므로 롤백 시 함께 취소됨) ---------------
+
+def _loaded(obj, attr: str):
+    state = inspect(obj)
+    value = state.dict.get(attr)
+    if value is None and attr in state.unloaded and state.key is not None and not state.deleted:
+        with state.session.no_autoflush:
+            value = getattr(obj, attr)
+    return value
+
+
+def _keep_previous_status(target, value, oldvalue, initiator):
+    return value
+
+
+# 만료된 객체의 상태를 바꿔도 이전 값이 history 에 남도록 (없으면 이전 상태 버킷을 차감하지 못함)
+for _model, (_, _status_col, _) in ROLLUP_MODELS.items():
+    if _status_col:
+        event.listen(getattr(_model, _status_col), "set", _keep_previous_status, active_history=True, retval=True)
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted(session, flush_context, instances):
+    # 삭제될 행은 flush 후에 읽을 수 없으므로 차감할 버킷/상태를 미리 적재
+    for obj in session.deleted:
+        spec = ROLLUP_MODELS.get(type(obj))
+        if spec is not None:
+            _loaded(obj, "created_at")
+            if spec[1]:
+                _loaded(obj, spec[1])
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_rollup(session, flush_context):
+    deltas: Counter = Counter()
+    active = set()
+    clock = []
+
+    def now() -> datetime:
+        # server_default 로 채워진 created_at 은 아직 읽지 않았으므로 같은 DB 시계로 버킷/활동일을 정함 (flush 당 한 번)
+        if not clock:
+            clock.append(db_now(session.connection()))
+        return clock[0]
+
+    for obj in session.new:
+        spec = ROLLUP_MODELS.get(type(obj))
+        if spec is None:
+            continue
+        metric, status_col, user_col = spec
+        status = (getattr(obj, status_col) or "") if status_col else ""
+        created_at = obj.__dict__.get("created_at") or now()
+        deltas[(hour_bucket(created_at), metric, status)] += 1
+        active.add((created_at.date(), getattr(obj, user_col)))
+    for obj in session.deleted:
+        spec = ROLLUP_MODELS.get(type(obj))
+        if spec is None:
+            continue
+        metric, status_col, _ = spec
+        status = (obj.__dict__.get(status_col) or "") if status_col else ""
+        deltas[(hour_bucket(obj.__dict__.get("created_at") or now()), metric, status)] -= 1
+    for obj in session.dirty:
+        spec = ROLLUP_MODELS.get(type(obj))
+        if spec is None or spec[1] is None:
+            continue
+        history = inspect(obj).attrs[spec[1]].history
+        if not history.has_changes() or not history.deleted:
+            continue
+        bucket = hour_bucket(_loaded(obj, "created_at") or now())
+        deltas[(bucket, spec[0], history.deleted[0] or "")] -= 1
+        deltas[(bucket, spec[0], (history.added[0] if history.added else None) or "")] += 1
+
+    if deltas or active:
+        conn = session.connection()
+        apply_deltas(conn, deltas)
+        record_activity(conn, active)
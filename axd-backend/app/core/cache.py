@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.database import served_by_replica
+from app.models.all_models import AssetColumn, AssetComment, AssetPermission, DataAsset, Service
+
+logger = logging.getLogger(__name__)
+
+# 모델 -> 캐시 네임스페이스 (해당 모델이 변경되면 네임스페이스의 워터마크가 갱신됨)
+MODEL_NAMESPACES = {
+    DataAsset: ("assets",),
+    AssetColumn: ("columns",),
+    Service: ("services",),
+    AssetPermission: ("permissions",),
+    AssetComment: ("comments",),
+}
+
+
+class LocalVersionBackend:
+    # 단일 프로세스용: 네임스페이스별 워터마크를 메모리에 보관
+
+    def __init__(self):
+        # 재시작 전에 발급된 ETag 가 우연히 일치하지 않도록 기동 시각을 기본 워터마크로 사용
+        self._base = str(time.time_ns())
+        self._versions: Dict[str, str] = {}
+
+    def get_versions(self, namespaces: Sequence[str]) -> Dict[str, str]:
+        return {ns: self._versions.get(ns, self._base) for ns in namespaces}
+
+    def bump(self, namespaces: Iterable[str]):
+        now = str(time.time_ns())
+        for ns in namespaces:
+            self._versions[ns] = now
+
+
+class SqliteVersionBackend:
+    # 여러 uvicorn 워커가 같은 무효화를 보도록 워터마크를 공유 SQLite 파일에 저장 (Redis 등의 대체용)
+    # 조회는 메모리 사본으로 바로 답하고, 파일 읽기/쓰기는 전용 스레드 하나에서만 수행해 이벤트 루프를 막지 않음
+    # (다른 워커의 무효화는 최대 poll_interval 만큼 늦게 보이고, 자기 워커의 무효화는 즉시 반영)
+
+    def __init__(self, path: str, poll_interval: float = 0.5):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_versions (namespace TEXT PRIMARY KEY, version TEXT NOT NULL)"
+        )
+        self._poll_interval = poll_interval
+        # 작업자 1개라 bump 쓰기가 순서대로 반영됨
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="axd-cache-versions")
+        self._versions: Dict[str, str] = dict(self._conn.execute("SELECT namespace, version FROM cache_versions"))
+        self._fetched_at = time.monotonic()
+        self._refreshing = False
+
+    def _merge(self, versions: Dict[str, str]):
+        # 아직 파일에 쓰지 않은 로컬 bump 를 이전 값으로 되돌리지 않도록 더 큰 워터마크만 받아들임
+        # (되돌아가면 무효화 전 워터마크로 저장된 엔트리가 다시 유효해짐)
+        with self._lock:
+            for ns, version in versions.items():
+                if int(version) > int(self._versions.get(ns, "0")):
+                    self._versions[ns] = version
+
+    def _refresh(self):
+        try:
+            self._merge(dict(self._conn.execute("SELECT namespace, version FROM cache_versions")))
+        except sqlite3.Error:
+            logger.exception("cache version refresh failed")
+        finally:
+            with self._lock:
+                self._fetched_at = time.monotonic()
+                self._refreshing = False
+
+    def _write(self, rows: List[Tuple[str, str]]):
+        try:
+            self._conn.executemany(
+                "INSERT INTO cache_versions (namespace, version) VALUES (?, ?) "
+                "ON CONFLICT(namespace) DO UPDATE SET version = excluded.version "
+                "WHERE CAST(excluded.version AS INTEGER) > CAST(cache_versions.version AS INTEGER)",
+                rows,
+            )
+        except sqlite3.Error:
+            logger.exception("cache version bump failed")
+
+    def get_versions(self, namespaces: Sequence[str]) -> Dict[str, str]:
+        with self._lock:
+            if not self._refreshing and time.monotonic() - self._fetched_at >= self._poll_interval:
+                self._refreshing = True
+                self._io.submit(self._refresh)
+            return {ns: self._versions.get(ns, "0") for ns in namespaces}
+
+    def bump(self, namespaces: Iterable[str]):
+        now = str(time.time_ns())
+        versions = {ns: now for ns in namespaces}
+        self._merge(versions)
+        self._io.submit(self._write, list(versions.items()))
+
+    def flush(self):
+        # 대기 중인 쓰기가 끝날 때까지 기다림 (종료 시/테스트용)
+        self._io.submit(lambda: None).result()
+
+
+def create_version_backend(url: Optional[str]):
+    if not url:
+        return LocalVersionBackend()
+    if url.startswith("sqlite:///"):
+        return SqliteVersionBackend(url[len("sqlite:///"):], poll_interval=settings.CACHE_VERSION_POLL_SECONDS)
+    raise ValueError(f"Unsupported cache backend: {url}")
+
+
+class ResponseCache:
+    def __init__(self, backend, max_entries: int = 1024, ttl: float = 60.0):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (워터마크, ETag, 본문, 만료 시각)
+        self._entries: "OrderedDict[str, Tuple[str, str, bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def make_key(request: Request, vary: str = "") -> str:
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        return f"{request.url.path}?{query}|{vary}"
+
+    def version_token(self, namespaces: Sequence[str]) -> str:
+        versions = self.backend.get_versions(namespaces)
+        return "|".join(f"{ns}={versions[ns]}" for ns in sorted(namespaces))
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        # 실제로 만든 응답 본문에서 ETag 를 계산 (워터마크만 보고 발급하면 오래된 본문이 304 로 고정될 수 있음)
+        return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    def _get(self, key: str, token: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry_token, etag, body, expires_at = entry
+            if entry_token != token or expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return etag, body
+
+    def _put(self, key: str, token: str, etag: str, body: bytes):
+        with self._lock:
+            self._entries[key] = (token, etag, body, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespaces: Iterable[str]):
+        # 워터마크만 갱신하면 이전 워터마크로 만든 엔트리는 조회 시점에 자연스럽게 폐기됨
+        self.backend.bump(list(namespaces))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+    async def respond(
+        self,
+        request: Request,
+        namespaces: Sequence[str],
+        build: Callable[[], Awaitable[Any]],
+        vary: str = "",
+    ) -> Response:
+        key = self.make_key(request, vary)
+        # build 전에 읽은 워터마크로 저장하므로 build 중에 무효화되면 다음 요청에서 다시 만든다
+        token = self.version_token(namespaces)
+        cached = self._get(key, token)
+        if cached is not None:
+            etag, body = cached
+            self.hits += 1
+            state = "HIT"
+        else:
+            self.misses += 1
+            body = dumps(await build())
+            etag = self.make_etag(body)
+            # 레플리카에서 만든 본문은 복제 지연분일 수 있으므로 저장하지 않음 (현재 워터마크로 고정되면 쓴 사람도 받게 됨)
+            if not served_by_replica():
+                self._put(key, token, etag, body)
+            state = "MISS"
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": state})
+
+
+response_cache = ResponseCache(
+    create_version_backend(settings.CACHE_BACKEND_URL),
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl=settings.CACHE_TTL_SECONDS,
+)
+
+
+# --- 쓰기 시점 무효화 -----------------------------------------------------------
+
+_PENDING_KEY = "response_cache_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_namespaces(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        pending.update(MODEL_NAMESPACES.get(type(obj), ()))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        response_cache.invalidate(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,387 @@
+import asyncio
+import logging
+import sys
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.metrics import Counter, metrics
+from app.crud.crud_asset import ASSET_FIELDS, decode_cursor, encode_cursor
+from app.models.all_models import AssetTombstone, DataAsset, Service
+
+logger = logging.getLogger(__name__)
+
+_SERVICE_FIELDS = tuple(c.key for c in Service.__table__.columns)
+# 반복되는 짧은 문자열은 intern 해서 자산마다 같은 객체를 공유
+_INTERNED = ("schema_name", "database_name", "service_id", "owner_id", "owner_name", "owner_email",
+             "sensitivity_level")
+
+snapshot_assets = metrics.register(Counter("axd_catalog_snapshot_assets", "Assets held in the in-memory catalog snapshot", "gauge"))
+snapshot_bytes = metrics.register(Counter("axd_catalog_snapshot_bytes_per_asset", "Approximate memory per snapshot asset", "gauge"))
+
+SortKey = Tuple[bool, datetime, str]
+
+# 스냅샷이 담는 응답 캐시 네임스페이스. 다른 워커가 이 워터마크를 올리면 스냅샷부터 따라잡은 뒤 응답을 만듦
+CACHE_NAMESPACES = ("assets", "services")
+# 이보다 오래된 삭제 기록은 정리 (스냅샷은 수 초 간격으로 새로고침하므로 충분히 김)
+TOMBSTONE_RETENTION = timedelta(days=1)
+
+_tombstones = AssetTombstone.__table__
+
+
+class AssetRecord:
+    # DataAsset 한 행. ORM 객체 대신 슬롯만 가진 읽기 전용 레코드 (태그/문서 링크는 튜플)
+    __slots__ = ASSET_FIELDS + ("key",)
+
+    def __init__(self, row):
+        for field, value in zip(ASSET_FIELDS, row):
+            if field in _INTERNED and value is not None:
+                value = sys.intern(value)
+            elif field == "tags" or field == "doc_links":
+                value = tuple(value or ())
+            setattr(self, field, value)
+        # (updated_at DESC, id DESC) 정렬 키. SQL 과 같이 updated_at 이 NULL 인 행은 맨 뒤
+        self.key: SortKey = (self.updated_at is not None, self.updated_at or datetime.min, self.id)
+
+    def size(self) -> int:
+        total = sys.getsizeof(self)
+        for field in ASSET_FIELDS:
+            value = getattr(self, field)
+            if field in _INTERNED:
+                continue
+            total += sys.getsizeof(value)
+            if field == "doc_links":
+                total += sum(sys.getsizeof(link) for link in value)
+        return total
+
+
+class _Ordered:
+    # 정렬 키 오름차순 배열과 레코드 배열. 페이지는 뒤에서부터 읽어 내림차순으로 반환
+    __slots__ = ("keys", "records")
+
+    def __init__(self, records: List[AssetRecord]):
+        self.records = sorted(records, key=lambda r: r.key)
+        self.keys = [r.key for r in self.records]
+
+    def patch(self, removed: Iterable[AssetRecord], added: Iterable[AssetRecord]) -> "_Ordered":
+        # 바뀐 레코드만 bisect 로 빼고 끼워 넣은 새 배열 (다시 정렬하지 않음).
+        # 기존 배열은 이전 스냅샷을 쓰는 요청이 읽고 있을 수 있으므로 복사본에서 수정
+        patched = _Ordered.__new__(_Ordered)
+        keys, records = self.keys[:], self.records[:]
+        for r in removed:
+            i = bisect_left(keys, r.key)
+            if i < len(keys) and keys[i] == r.key:
+                del keys[i]
+                del records[i]
+        for r in added:
+            i = bisect_left(keys, r.key)
+            keys.insert(i, r.key)
+            records.insert(i, r)
+        patched.keys, patched.records = keys, records
+        return patched
+
+    def page(self, limit: int, before: Optional[SortKey]) -> Tuple[List[AssetRecord], bool]:
+        end = len(self.keys) if before is None else bisect_left(self.keys, before)
+        start = max(0, end - limit)
+        return self.records[start:end][::-1], start > 0
+
+
+class Snapshot:
+    # 한 시점의 자산/서비스. 만들어진 뒤에는 바꾸지 않고 통째로 교체하므로
+    # 요청 하나가 같은 스냅샷 객체를 계속 쓰면 새로고침 중에도 페이지가 섞이지 않음
+
+    def __init__(self, assets: Dict[str, AssetRecord], services: List[dict], watermark: Optional[datetime],
+                 version: int, deleted_mark: Optional[datetime] = None):
+        self.assets = assets
+        self.services = services
+        self.watermark = watermark
+        self.version = version
+        # 반영한 asset_tombstones.deleted_at 의 최댓값
+        self.deleted_mark = deleted_mark
+        records = list(assets.values())
+        self.ordered = _Ordered(records)
+        by_service: Dict[str, List[AssetRecord]] = {}
+        for r in records:
+            by_service.setdefault(r.service_id, []).append(r)
+        self.by_service = {sid: _Ordered(rs) for sid, rs in by_service.items()}
+
+    def apply(self, modified: List[AssetRecord], removed: List[str], services: List[dict],
+              watermark: Optional[datetime], deleted_mark: Optional[datetime]) -> "Snapshot":
+        # 변경분만 반영한 다음 버전. 전체 재정렬/서비스별 재구성 없이 바뀐 레코드만 bisect 로 교체하고
+        # 바뀌지 않은 서비스의 배열은 그대로 공유 (새로고침 비용이 자산 수가 아니라 변경 수에 비례)
+        assets = dict(self.assets)
+        gone = set(removed)
+        added = [r for r in modified if r.id not in gone]
+        old = [assets[i] for i in {*gone, *(r.id for r in added)} if i in assets]
+        assets.update((r.id, r) for r in added)
+        for asset_id in gone:
+            assets.pop(asset_id, None)
+
+        snap = Snapshot.__new__(Snapshot)
+        snap.assets, snap.services, snap.watermark = assets, services, watermark
+        snap.version, snap.deleted_mark = self.version + 1, deleted_mark
+        snap.ordered = self.ordered.patch(old, added)
+        old_by, added_by = defaultdict(list), defaultdict(list)
+        for r in old:
+            old_by[r.service_id].append(r)
+        for r in added:
+            added_by[r.service_id].append(r)
+        snap.by_service = dict(self.by_service)
+        for sid in {*old_by, *added_by}:
+            base = self.by_service.get(sid) or _Ordered([])
+            patched = base.patch(old_by.get(sid, ()), added_by.get(sid, ()))
+            if patched.records:
+                snap.by_service[sid] = patched
+            else:
+                snap.by_service.pop(sid, None)
+        return snap
+
+    def get(self, asset_id: str) -> Optional[AssetRecord]:
+        return self.assets.get(asset_id)
+
+    def page(self, service_id: Optional[str] = None, limit: int = 100,
+             cursor: Optional[str] = None) -> Tuple[List[AssetRecord], Optional[str]]:
+        # crud_asset.get_multi 와 같은 keyset 의미 (같은 커서를 그대로 주고받을 수 있음)
+        before = None
+        if cursor:
+            updated_at, last_id = decode_cursor(cursor)
+            before = (updated_at is not None, updated_at or datetime.min, last_id)
+        ordered = self.ordered if not service_id else self.by_service.get(service_id)
+        if ordered is None:
+            return [], None
+        rows, more = ordered.page(limit, before)
+        next_cursor = encode_cursor(rows[-1].updated_at, rows[-1].id) if more and rows else None
+        return rows, next_cursor
+
+
+def _select_assets():
+    return select(*[getattr(DataAsset, f) for f in ASSET_FIELDS])
+
+
+class CatalogSnapshot:
+    # 자산 목록/단건 조회를 DB 대신 메모리 스냅샷에서 처리.
+    # updated_at 워터마크 이후 바뀐 행과 asset_tombstones 의 삭제 기록만 주기적으로 읽어 새 스냅샷을 만듦.
+    # 이 프로세스의 커밋은 세션 이벤트로 stale 표시 (삭제도 같은 트랜잭션의 삭제 기록으로) -> 다음 조회 전에 바로 반영.
+    # 다른 워커의 커밋은 응답 캐시 워터마크 변화로 감지해 조회 전에 따라잡음 (새 워터마크로 오래된 본문을 캐시하지 않도록)
+
+    def __init__(self, overlap: float = 5.0):
+        # 커밋 순서와 updated_at 순서가 어긋나도 놓치지 않도록 워터마크보다 조금 앞에서부터 다시 읽음
+        self.overlap = timedelta(seconds=overlap)
+        self._snapshot: Optional[Snapshot] = None
+        # run_sync 안의 조회는 이벤트 루프 스레드에서 실행되므로 스레드 락 대신 asyncio 락으로 직렬화
+        self._lock = asyncio.Lock()
+        # 쓰기 세대: 새로고침이 시작된 시점의 세대까지만 반영된 것으로 봄
+        self._dirty = 0
+        self._clean = 0
+        self._reload = True
+        # 마지막 새로고침 직전에 읽은 응답 캐시 워터마크
+        self._cache_token: Optional[str] = None
+        self.refreshes = 0
+        self.full_reloads = 0
+        self.last_refresh_ms = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def stale(self) -> bool:
+        return self._reload or self._dirty != self._clean
+
+    def mark_stale(self):
+        self._dirty += 1
+
+    def clear(self):
+        # 테이블을 새로 만든 경우 등: 다음 조회 때 전체 재적재
+        self._reload = True
+        self._dirty += 1
+
+    async def current(self, engine) -> Snapshot:
+        # 읽기 레플리카의 복제 지연에 영향받지 않도록 새로고침은 항상 primary(engine) 에서 읽음
+        token = response_cache.version_token(CACHE_NAMESPACES)
+        if self.stale or token != self._cache_token:
+            await self.ensure_fresh(engine, token=token)
+        return self._snapshot
+
+    def peek(self) -> Optional[Snapshot]:
+        # 새로고침 없이 현재 스냅샷 (적재 전이면 None)
+        return self._snapshot
+
+    async def ensure_fresh(self, engine, force: bool = False, token: Optional[str] = None):
+        # token: 새로고침 전에 읽은 응답 캐시 워터마크. 워터마크는 커밋 후에 올라가므로 이후의 새로고침은 그 변경을 포함
+        async with self._lock:
+            if force or self.stale or (token is not None and token != self._cache_token):
+                async with engine.connect() as conn:
+                    await conn.run_sync(self.refresh)
+                if token is not None:
+                    self._cache_token = token
+
+    def refresh(self, db):
+        # db 는 Session 또는 Connection. 동시 호출은 호출자가 직렬화 (ensure_fresh)
+        started = time.perf_counter()
+        dirty, reload = self._dirty, self._reload
+        self._reload = False
+        try:
+            if reload or self._snapshot is None:
+                self._snapshot = self._load_full(db, version=(self._snapshot.version + 1) if self._snapshot else 1)
+                self.full_reloads += 1
+                logger.info("catalog snapshot loaded: %d assets, ~%.0f bytes/asset",
+                            len(self._snapshot.assets), self.bytes_per_asset(self._snapshot))
+            else:
+                self._snapshot = self._load_changes(db, self._snapshot)
+        except Exception:
+            self._reload = self._reload or reload
+            raise
+        self._clean = dirty
+        self.refreshes += 1
+        self.last_refresh_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._report()
+
+    def _services(self, db) -> List[dict]:
+        # 서비스는 수가 적고 updated_at 이 없으므로 매번 전체를 읽음
+        return [dict(zip(_SERVICE_FIELDS, r)) for r in db.execute(
+            select(*[getattr(Service, f) for f in _SERVICE_FIELDS])
+        )]
+
+    def _load_full(self, db, version: int) -> Snapshot:
+        # 삭제 기록의 기준점을 먼저 읽음 (자산을 읽는 사이에 지워진 행은 다음 새로고침의 겹침 구간에서 제거)
+        deleted_mark = db.execute(select(func.max(_tombstones.c.deleted_at))).scalar()
+        assets = {r.id: r for r in map(AssetRecord, db.execute(_select_assets()))}
+        watermark = max((r.updated_at for r in assets.values() if r.updated_at is not None), default=None)
+        return Snapshot(assets, self._services(db), watermark, version, deleted_mark)
+
+    def _load_changes(self, db, snap: Snapshot) -> Snapshot:
+        query = _select_assets()
+        if snap.watermark is not None:
+            query = query.where(DataAsset.updated_at >= snap.watermark - self.overlap)
+        tomb_query = select(_tombstones.c.asset_id, _tombstones.c.deleted_at)
+        # 아직 본 삭제 기록이 없으면 자산 워터마크(같은 서버 시계) 이후만 읽음
+        since = snap.deleted_mark or snap.watermark
+        if since is not None:
+            tomb_query = tomb_query.where(_tombstones.c.deleted_at >= since - self.overlap)
+        deleted = db.execute(tomb_query).all()
+        changed = [AssetRecord(r) for r in db.execute(query)]
+        services = self._services(db)
+        count = db.execute(select(func.count()).select_from(DataAsset)).scalar()
+
+        assets = snap.assets
+        modified = [r for r in changed if _differs(assets.get(r.id), r)]
+        removed = list({d.asset_id for d in deleted if d.asset_id in assets})
+        expected = len(assets) + len({r.id for r in modified if r.id not in assets}) - len(removed)
+        if expected != count:
+            # 워터마크 이전 시각으로 들어온 행 등 변경분으로 맞출 수 없으면 전체 재적재
+            self.full_reloads += 1
+            return self._load_full(db, snap.version + 1)
+        deleted_mark = max((d.deleted_at for d in deleted), default=snap.deleted_mark)
+        if snap.deleted_mark is not None and deleted_mark is not None:
+            deleted_mark = max(deleted_mark, snap.deleted_mark)
+        if not modified and not removed and services == snap.services:
+            # 조회 쪽이 쓰지 않는 기준점이라 스냅샷을 새로 만들지 않고 제자리에서 갱신
+            snap.deleted_mark = deleted_mark
+            return snap
+        watermark = max((r.updated_at for r in changed if r.updated_at is not None), default=snap.watermark)
+        if snap.watermark is not None and watermark is not None:
+            watermark = max(watermark, snap.watermark)
+        return snap.apply(modified, removed, services, watermark, deleted_mark)
+
+    def _report(self):
+        snap = self._snapshot
+        snapshot_assets.set((), len(snap.assets))
+        snapshot_bytes.set((), self.bytes_per_asset(snap))
+
+    @staticmethod
+    def bytes_per_asset(snap: Snapshot, sample: int = 1000) -> float:
+        # 레코드(슬롯+값) 크기를 표본으로 추정하고 정렬/서비스 배열의 참조 몫을 더함
+        if not snap.assets:
+            return 0.0
+        records = list(snap.assets.values())
+        step = max(1, len(records) // sample)
+        picked = records[::step]
+        record_bytes = sum(r.size() + sys.getsizeof(r.key) for r in picked) / len(picked)
+        # 키 배열/레코드 배열이 전체용과 서비스별로 두 벌, 그리고 id -> 레코드 dict
+        index_bytes = (sys.getsizeof(snap.assets) + 4 * sys.getsizeof(snap.ordered.keys)) / len(records)
+        return round(record_bytes + index_bytes, 1)
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        if snap is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "version": snap.version,
+            "assets": len(snap.assets),
+            "services": len(snap.services),
+            "watermark": snap.watermark,
+            "bytes_per_asset": self.bytes_per_asset(snap),
+            "refreshes": self.refreshes,
+            "full_reloads": self.full_reloads,
+            "last_refresh_ms": self.last_refresh_ms,
+        }
+
+    async def run_refresh(self, engine, interval: float):
+        # 다른 워커/프로세스가 쓴 변경을 주기적으로 반영
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.ensure_fresh(engine, force=True, token=response_cache.version_token(CACHE_NAMESPACES))
+            except Exception:
+                logger.exception("catalog snapshot refresh failed")
+
+
+def _differs(old: Optional[AssetRecord], new: AssetRecord) -> bool:
+    return old is None or any(getattr(old, f) != getattr(new, f) for f in ASSET_FIELDS)
+
+
+catalog_snapshot = CatalogSnapshot(settings.CATALOG_SNAPSHOT_OVERLAP_SECONDS)
+
+
+# --- 쓰기 시점 무효화 -----------------------------------------------------------
+# 자산/서비스가 바뀐 커밋만 stale 로 표시하고, 다음 조회가 워터마크 이후 변경분을 읽음.
+# 자산 삭제는 같은 트랜잭션에서 asset_tombstones 에 기록하고, 다음 새로고침이 그 기록으로 스냅샷에서 뺌
+
+_PENDING_KEY = "catalog_snapshot_pending"
+
+
+@event.listens_for(DataAsset, "after_delete")
+def _record_tombstone(mapper, connection, target):
+    connection.execute(delete(_tombstones).where(_tombstones.c.asset_id == target.id))
+    connection.execute(_tombstones.insert().values(asset_id=target.id))
+
+
+@event.listens_for(DataAsset, "after_insert")
+def _clear_tombstone(mapper, connection, target):
+    # 같은 id 로 다시 만들어진 자산이 겹침 구간의 삭제 기록 때문에 빠지지 않도록
+    connection.execute(delete(_tombstones).where(_tombstones.c.asset_id == target.id))
+
+
+def prune_tombstones(conn, retention: timedelta = TOMBSTONE_RETENTION):
+    # 기준 시각을 DB 에 기록된 deleted_at 에서 잡아 서버 시계 하나로만 비교
+    latest = conn.execute(select(func.max(_tombstones.c.deleted_at))).scalar()
+    if latest is not None:
+        conn.execute(delete(_tombstones).where(_tombstones.c.deleted_at < latest - retention))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    if any(isinstance(obj, DataAsset) for obj in session.deleted):
+        prune_tombstones(session.connection())
+    if any(isinstance(obj, (DataAsset, Service)) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_stale(session):
+    if session.info.pop(_PENDING_KEY, None):
+        catalog_snapshot.mark_stale()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -1,16 +1,117 @@
-import os
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "AXD Backend"
     API_V1_STR: str = "/api/v1"
-    
-    # DATABASE_URL이 환경 변수에 없으면 로컬 SQLite 파일(axd_app.db)을 사용합니다.
-    DATABASE_URL: str = os.getenv(
-        "DATABASE_URL", 
-        "sqlite:///./axd_app.db"
-    )
+
+    # docker-compose 내부에서는 'db', 로컬 직접 실행 시에는 'localhost'
+    # 13306 포트는 로컬에서 접근할 때용, 3306은 컨테이너끼리 통신할 때용
+    DB_HOST: str = "db"
+    DB_PORT: str = "3306"
+    MARIADB_USER: str = "axd_user"
+    MARIADB_PASSWORD: str = "axd_password"
+    MARIADB_DATABASE: str = "axd_db"
+
+    # 우선순위: 환경변수 DATABASE_URL > 조합된 URL
+    # 로컬 테스트 시에는 DATABASE_URL=sqlite:///./axd_app.db 처럼 SQLite 를 사용할 수 있습니다.
+    DATABASE_URL: Optional[str] = None
+
+    # 커넥션 풀 설정 (SQLite 에는 적용되지 않음)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_ECHO: bool = False
+
+    # 읽기 레플리카 (쉼표로 구분). GET 요청 세션은 레플리카로, 쓰기는 primary 로 보냄
+    # 로컬 테스트 시 DB_REPLICA_URLS=sqlite:///./replica1.db,sqlite:///./replica2.db 처럼 SQLite 파일을 사용
+    DB_REPLICA_URLS: Optional[str] = None
+    DB_REPLICA_STRATEGY: str = "round_robin"  # round_robin | least_latency
+    DB_REPLICA_HEALTH_INTERVAL: float = 5.0
+    DB_REPLICA_HEALTH_TIMEOUT: float = 2.0
+    # 쓰기 직후 같은 클라이언트(X-User-Id 또는 IP)의 조회는 복제 지연을 피해 이 시간 동안 primary 로
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # 자산 목록 페이지네이션 (GET /assets)
+    ASSET_PAGE_DEFAULT_LIMIT: int = 100
+    ASSET_PAGE_MAX_LIMIT: int = 1000
+
+    # 자산/서비스 조회용 인메모리 스냅샷 (GET /assets, /assets/{id}, /assets/services)
+    # 주기마다 updated_at 워터마크 이후 변경분만 읽고, OVERLAP 만큼 앞에서부터 다시 읽어 늦은 커밋을 놓치지 않음
+    CATALOG_SNAPSHOT_ENABLED: bool = True
+    CATALOG_SNAPSHOT_REFRESH_SECONDS: float = 2.0
+    CATALOG_SNAPSHOT_OVERLAP_SECONDS: float = 5.0
+
+    # 조회 API 응답 캐시 (ETag/304). 여러 워커가 무효화를 공유하려면
+    # CACHE_BACKEND_URL=sqlite:////tmp/axd_cache.db 처럼 공유 백엔드를 지정
+    CACHE_BACKEND_URL: Optional[str] = None
+    # 공유 백엔드의 워터마크를 다시 읽는 주기 (다른 워커의 무효화가 보이기까지의 최대 지연)
+    CACHE_VERSION_POLL_SECONDS: float = 0.5
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_TTL_SECONDS: float = 60.0
+
+    # 요청 성능 지표 (/metrics, Server-Timing 헤더)
+    METRICS_ENABLED: bool = True
+    METRICS_SERVER_TIMING: bool = True
+    # 요청당 SQL 구문 수가 이 값을 넘으면 경고 로그와 카운터로 표시 (N+1 탐지)
+    METRICS_QUERY_THRESHOLD: int = 20
+
+    # NDJSON 벌크 적재 (POST /system/ingest) 배치 크기
+    INGEST_BATCH_SIZE: int = 1000
+    INGEST_MAX_BATCH_SIZE: int = 20000
+
+    # 카탈로그 전체 내보내기 (GET /system/export) 스트리밍 배치 크기 (자산 수 기준)
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # 샘플 미리보기용 열 지향 저장소 (자산별 Arrow 파일) 와 조회 한도
+    SAMPLE_STORE_DIR: str = "./data/samples"
+    PREVIEW_MAX_LIMIT: int = 10000
+
+    # 권한 색인 (X-User-Id 헤더 기준 마스킹). 헤더가 없는 요청은 기본적으로 데모용 전체 권한
+    PERMISSION_ANONYMOUS_FULL_ACCESS: bool = True
+    PERMISSION_INDEX_MAX_USERS: int = 10000
+    PERMISSION_INDEX_TTL_SECONDS: float = 30.0
+
+    # 알림 실시간 전달 (GET /notifications/stream, SSE). 여러 워커에 전달하려면
+    # NOTIFY_BACKEND_URL=sqlite:////tmp/axd_notify.db 처럼 공유 백엔드를 지정
+    NOTIFY_BACKEND_URL: Optional[str] = None
+    NOTIFY_POLL_INTERVAL: float = 0.5
+    NOTIFY_HEARTBEAT_SECONDS: float = 15.0
+    NOTIFY_QUEUE_SIZE: int = 1000
+    # 재연결(Last-Event-ID) 시 한 번에 보내는 누락 알림 최대 건수
+    NOTIFY_REPLAY_LIMIT: int = 500
+    NOTIFY_UNREAD_TTL_SECONDS: float = 30.0
+
+    # 소스 DB 메타데이터 수집 (POST /system/crawl). 쉼표로 구분한 이름=URL 목록
+    # 예: CRAWL_SOURCES=sales=sqlite:///./sales.db,hr=mysql+pymysql://user:pw@hr-db/hr
+    CRAWL_SOURCES: Optional[str] = None
+    CRAWL_WORKERS: int = 4
+    # 0 보다 크면 이 주기(초)로 증분 수집을 예약 실행
+    CRAWL_INTERVAL_SECONDS: float = 0
+    # 소스별 수집 임대(초). running 상태가 이보다 오래되면 중단된 것으로 보고 다른 워커가 가져감
+    CRAWL_LEASE_SECONDS: float = 3600
+
+    # 권한 요청 일괄 심사 (POST /admin/permission-requests/review) 한 번에 처리하는 최대 요청 수
+    PERMISSION_REVIEW_MAX_BATCH: int = 1000
+    # 만료 권한 정리 주기(초, 0 이면 끔)와 배치 크기. 한 번 실행에 BATCH_SIZE * MAX_BATCHES 건까지 처리
+    GRANT_SWEEP_INTERVAL_SECONDS: float = 60.0
+    GRANT_SWEEP_BATCH_SIZE: int = 500
+    GRANT_SWEEP_MAX_BATCHES: int = 100
+
+    # 데이터 품질 프로파일링 (POST /system/dq-profile)
+    # WORKERS 미지정 시 CPU 수 - 1 과 4 중 작은 값 (단일 코어면 0), 0 이면 작업 스레드에서 직접 계산
+    DQ_PROFILE_WORKERS: Optional[int] = None
+    DQ_PROFILE_CHUNK_SIZE: int = 200
+    DQ_FRESHNESS_WARNING_HOURS: float = 24
+    DQ_FRESHNESS_CRITICAL_HOURS: float = 168
+
+    @property
+    def database_url(self) -> str:
+        return self.DATABASE_URL or (
+            f"mysql+pymysql://{self.MARIADB_USER}:{self.MARIADB_PASSWORD}"
+            f"@{self.DB_HOST}:{self.DB_PORT}/{self.MARIADB_DATABASE}"
+        )
 
     class Config:
         case_sensitive = True
@@ -0,0 +1,324 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, insert, inspect, or_, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine.reflection import ObjectKind
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.activity_rollup import db_now
+from app.core.config import settings
+from app.core.jobs import Job, jobs
+from app.core.lineage_index import lineage_graph
+from app.core.sample_store import sample_store
+from app.database import SessionLocal, call_sync, create_db_engine
+from app.models.all_models import (
+    AssetColumn, AssetProfile, CrawlState, DataAsset, DataLineage, SampleData, Service,
+)
+
+logger = logging.getLogger(__name__)
+
+_NAME = re.compile(r"^\w[\w.-]*$")
+
+# (schema, table) -> {"description": ..., "columns": [...]}
+Snapshot = Dict[Tuple[str, str], dict]
+
+
+class Source(NamedTuple):
+    name: str
+    url: str
+
+
+def parse_sources(value: Optional[str]) -> List[Source]:
+    # "이름=URL" 목록. 이름을 생략하면 URL 의 DB 이름(SQLite 는 파일명)을 사용
+    sources = []
+    for item in (v.strip() for v in (value or "").split(",")):
+        if not item:
+            continue
+        name, sep, url = item.partition("=")
+        if not sep or not _NAME.match(name):
+            url = item
+            database = make_url(url).database or ""
+            name = os.path.splitext(os.path.basename(database))[0] or make_url(url).host
+        sources.append(Source(name, url))
+    names = [s.name for s in sources]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate crawl source names: {names}")
+    return sources
+
+
+def introspect(source: Source) -> Snapshot:
+    # 소스 DB 의 기본 스키마에 있는 테이블/뷰와 컬럼을 읽음 (get_multi_* 로 테이블 수와 무관하게 몇 번의 조회로 끝냄)
+    engine = create_db_engine(source.url)
+    try:
+        insp = inspect(engine)
+        schema = insp.default_schema_name or "main"
+        columns = insp.get_multi_columns(kind=ObjectKind.ANY)
+        try:
+            comments = insp.get_multi_table_comment(kind=ObjectKind.ANY)
+        except NotImplementedError:
+            comments = {}
+    finally:
+        engine.dispose()
+
+    snapshot: Snapshot = {}
+    for (_, table), cols in columns.items():
+        comment = comments.get((None, table)) or {}
+        snapshot[(schema, table)] = {
+            "description": comment.get("text") or "",
+            "columns": [
+                {
+                    "column_name": c["name"],
+                    "data_type": str(c["type"]).lower()[:50],
+                    "is_nullable": bool(c.get("nullable", True)),
+                    "ordinal_position": i,
+                    "description": c.get("comment") or "",
+                }
+                for i, c in enumerate(cols, start=1)
+            ],
+        }
+    return snapshot
+
+
+def fingerprint(snapshot: Snapshot) -> str:
+    payload = sorted((list(key), value) for key, value in snapshot.items())
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+_COLUMN_FIELDS = ("data_type", "is_nullable", "ordinal_position")
+
+
+def _sync_columns(asset: DataAsset, columns: List[dict]) -> Tuple[int, int, int]:
+    # 컬럼명 기준으로 비교해 바뀐 컬럼만 수정 (기존 컬럼의 설명/품질 지표는 유지)
+    existing = {c.column_name: c for c in asset.columns}
+    added = updated = 0
+    for col in columns:
+        current = existing.pop(col["column_name"], None)
+        if current is None:
+            asset.columns.append(AssetColumn(**col))
+            added += 1
+        elif any(getattr(current, f) != col[f] for f in _COLUMN_FIELDS):
+            for f in _COLUMN_FIELDS:
+                setattr(current, f, col[f])
+            updated += 1
+    for stale in existing.values():
+        asset.columns.remove(stale)
+    return added, updated, len(existing)
+
+
+def apply_snapshot(db: Session, source: Source, snapshot: Snapshot) -> dict:
+    # 저장된 카탈로그와 비교해 추가/변경/삭제분만 반영. 커밋은 호출자가 수행
+    service = db.scalars(select(Service).where(Service.name == source.name)).first()
+    if service is None:
+        service = Service(name=source.name, description=f"Crawled from {make_url(source.url).get_backend_name()}")
+        db.add(service)
+        db.flush()
+
+    stored = {
+        (a.schema_name, a.name): a
+        for a in db.scalars(
+            select(DataAsset)
+            .where(DataAsset.service_id == service.id, DataAsset.database_name == source.name)
+            .options(selectinload(DataAsset.columns))
+        )
+    }
+    now = datetime.now()
+    stats = dict.fromkeys(
+        ("inserted", "updated", "deleted", "columns_added", "columns_updated", "columns_removed"), 0
+    )
+    for (schema, table), meta in snapshot.items():
+        asset = stored.pop((schema, table), None)
+        if asset is None:
+            asset = DataAsset(
+                name=table, schema_name=schema, database_name=source.name, service_id=service.id,
+                description=meta["description"], created_at=now, updated_at=now,
+            )
+            db.add(asset)
+            stats["inserted"] += 1
+        # 테이블 코멘트가 바뀐 기존 자산은 설명도 갱신
+        described = asset.id is not None and asset.description != meta["description"]
+        if described:
+            asset.description = meta["description"]
+        added, updated, removed = _sync_columns(asset, meta["columns"])
+        stats["columns_added"] += added
+        stats["columns_updated"] += updated
+        stats["columns_removed"] += removed
+        if asset.id is not None and (described or added or updated or removed):
+            asset.updated_at = now
+            stats["updated"] += 1
+
+    # 소스에서 사라진 테이블: ORM cascade 가 없는 샘플/프로파일/리니지를 먼저 지우고 자산 삭제
+    removed_ids = [a.id for a in stored.values()]
+    if removed_ids:
+        db.execute(delete(SampleData).where(SampleData.asset_id.in_(removed_ids)))
+        db.execute(delete(AssetProfile).where(AssetProfile.asset_id.in_(removed_ids)))
+        db.execute(delete(DataLineage).where(or_(
+            DataLineage.source_asset_id.in_(removed_ids), DataLineage.target_asset_id.in_(removed_ids)
+        )))
+        for asset in stored.values():
+            db.delete(asset)
+        stats["deleted"] = len(removed_ids)
+    stats["removed_ids"] = removed_ids
+    return stats
+
+
+class MetadataCrawler:
+    # 소스마다 스키마 조회는 작업자 풀에서 병렬로, 카탈로그 반영은 소스 단위 트랜잭션으로 하나씩 수행
+    # (중간에 실패한 소스는 카탈로그가 그대로이므로 같은 run_id 로 다시 실행하면 이어서 진행됨)
+
+    def __init__(self, session_factory=SessionLocal, workers: int = 4, lease_seconds: float = 3600):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self._apply_lock = threading.Lock()
+
+    def _claim(self, source: str, run_id: str, recent: float = 0) -> bool:
+        # 여러 워커(스케줄러/수동 실행)가 같은 소스를 동시에 수집하지 않도록 crawl_state 행을 조건부 UPDATE 로 선점.
+        # 다른 곳에서 running 이고 임대 시간 안이거나, recent 초 안에 시작해 성공한 소스면 False.
+        # 시각은 DB 시계 기준 (워커/호스트 간 시계 차이와 무관)
+        db = self.session_factory()
+        try:
+            now = db_now(db)
+            S = CrawlState
+            conditions = [S.source == source,
+                          or_(S.status != "running", S.started_at <= now - timedelta(seconds=self.lease_seconds))]
+            if recent:
+                conditions.append(or_(S.status != "succeeded", S.started_at <= now - timedelta(seconds=recent)))
+            values = dict(run_id=run_id, status="running", error=None, started_at=now, finished_at=None)
+            result = db.execute(update(S).where(*conditions).values(**values)
+                                .execution_options(synchronize_session=False))
+            claimed = result.rowcount == 1
+            if not claimed:
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(S).values(source=source, **values))
+                    claimed = True
+                except IntegrityError:
+                    pass
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+    def _finish(self, source: str, **values):
+        db = self.session_factory()
+        try:
+            state = db.get(CrawlState, source) or CrawlState(source=source)
+            for k, v in values.items():
+                setattr(state, k, v)
+            state.finished_at = db_now(db)
+            db.add(state)
+            db.commit()
+        finally:
+            db.close()
+
+    def states(self) -> Dict[str, CrawlState]:
+        db = self.session_factory()
+        try:
+            return {s.source: s for s in db.scalars(select(CrawlState))}
+        finally:
+            db.close()
+
+    def crawl_source(self, source: Source, run_id: str, full: bool = False,
+                     previous: Optional[str] = None, recent: float = 0) -> dict:
+        if not self._claim(source.name, run_id, recent):
+            return {"skipped": True, "claimed": False}
+        try:
+            snapshot = introspect(source)
+            digest = fingerprint(snapshot)
+            if not full and digest == previous:
+                stats = {"skipped": True}
+            else:
+                with self._apply_lock:
+                    db = self.session_factory()
+                    try:
+                        stats = apply_snapshot(db, source, snapshot)
+                        db.commit()
+                    except Exception:
+                        db.rollback()
+                        raise
+                    finally:
+                        db.close()
+                # 삭제한 자산의 샘플/리니지는 Core delete 라 ORM 이벤트를 거치지 않으므로 직접 무효화
+                removed_ids = stats.pop("removed_ids")
+                if removed_ids:
+                    lineage_graph.invalidate()
+                    sample_store.invalidate(removed_ids)
+        except Exception as e:
+            logger.exception("crawl of %s failed", source.name)
+            self._finish(source.name, status="failed", error=str(e))
+            raise
+        self._finish(source.name, status="succeeded", fingerprint=digest, tables=len(snapshot), stats=stats)
+        return stats
+
+    def run(self, sources: List[Source], resume: bool = False, full: bool = False,
+            job: Optional[Job] = None, recent: float = 0) -> dict:
+        states = self.states()
+        run_id = str(uuid.uuid4())
+        if resume:
+            # 마지막 실행에서 실패했거나 중단된 소스만 같은 run_id 로 다시 수집
+            pending = [states[s.name] for s in sources
+                       if s.name in states and states[s.name].status in ("running", "failed")]
+            if pending:
+                run_id = pending[0].run_id
+            names = {p.source for p in pending}
+            sources = [s for s in sources if s.name in names]
+
+        previous = {name: s.fingerprint for name, s in states.items() if s.status == "succeeded"}
+        results: Dict[str, dict] = {}
+        failed: Dict[str, str] = {}
+        if job:
+            job.update(run_id=run_id, sources=len(sources), done=0, failed=0)
+        if sources:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(sources)),
+                                    thread_name_prefix="axd-crawl") as pool:
+                futures = {
+                    pool.submit(call_sync, self.crawl_source, s, run_id, full, previous.get(s.name), recent): s.name
+                    for s in sources
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        failed[name] = str(e)
+                    if job:
+                        job.update(done=len(results) + len(failed), failed=len(failed))
+        return {"run_id": run_id, "sources": results, "failed": failed}
+
+
+def configured_sources() -> List[Source]:
+    return parse_sources(settings.CRAWL_SOURCES)
+
+
+def run_crawl_job(job: Job, names: Optional[List[str]] = None, resume: bool = False, full: bool = False,
+                  recent: float = 0) -> dict:
+    sources = [s for s in configured_sources() if names is None or s.name in names]
+    result = crawler.run(sources, resume=resume, full=full, job=job, recent=recent)
+    if result["failed"]:
+        # 일부 소스가 실패하면 작업을 실패로 표시 (성공한 소스는 이미 반영됨, resume=true 로 나머지 재실행)
+        raise RuntimeError(f"crawl failed for {', '.join(sorted(result['failed']))}: {result['failed']}")
+    return result
+
+
+async def schedule_crawls(interval: float):
+    # 주기적으로 전체 소스를 증분 수집 (스키마가 그대로인 소스는 지문 비교로 건너뜀)
+    # 모든 워커가 예약하지만 소스마다 crawl_state 임대를 얻은 한 곳만 수집하고,
+    # 다른 워커가 이번 주기 안에 이미 수집한 소스는 건너뜀
+    while True:
+        await asyncio.sleep(interval)
+        if not jobs.running("crawl"):
+            jobs.submit("crawl", run_crawl_job, recent=interval * 0.9, params={"scheduled": True})
+
+
+crawler = MetadataCrawler(workers=settings.CRAWL_WORKERS, lease_seconds=settings.CRAWL_LEASE_SECONDS)
@@ -0,0 +1,210 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import JSON, Boolean, DateTime, Integer, Numeric, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.serialization import dumps
+from app.models.all_models import AssetColumn, DataAsset, DataLineage
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+_ASSET_COLUMNS = tuple(DataAsset.__table__.columns)
+# 자산 행과 합칠 때 자산 컬럼과 이름이 겹치지 않도록 column_ 접두사를 붙임 (asset_id 는 중복이라 제외)
+_COLUMN_COLUMNS = tuple(c for c in AssetColumn.__table__.columns if c.key != "asset_id")
+_LINEAGE_COLUMNS = tuple(DataLineage.__table__.columns)
+
+
+def _arrow_type(column) -> pa.DataType:
+    t = column.type
+    if isinstance(t, Boolean):
+        return pa.bool_()
+    if isinstance(t, Integer):
+        return pa.int64()
+    if isinstance(t, Numeric):
+        return pa.float64()
+    if isinstance(t, DateTime):
+        return pa.timestamp("us")
+    # 문자열과 JSON(태그/문서 링크)은 문자열로 저장
+    return pa.string()
+
+
+def _converter(column) -> Optional[Callable]:
+    # 셀마다 타입을 검사하지 않도록 컬럼별 변환 함수를 미리 결정 (변환이 필요 없으면 None)
+    # JSON 컬럼은 NDJSON 에서 배열/객체 그대로 두고, 평면 형식에서만 문자열로 바꿈 (_flat_rows)
+    if isinstance(column.type, Numeric):
+        return float
+    if isinstance(column.type, DateTime):
+        return lambda v: v.replace(tzinfo=None)
+    return None
+
+
+def _row_reader(columns: Sequence, offset: int = 0) -> Callable[[tuple], dict]:
+    keys = [c.key for c in columns]
+    converters = [(offset + i, c.key, fn) for i, c in enumerate(columns) if (fn := _converter(c)) is not None]
+
+    def read(row: tuple) -> dict:
+        record = dict(zip(keys, row[offset:]))
+        for i, key, fn in converters:
+            if row[i] is not None:
+                record[key] = fn(row[i])
+        return record
+    return read
+
+
+def _fields(table: str) -> List[tuple]:
+    # (출력 필드명, 컬럼) 목록. 평면 형식(CSV/Parquet)의 catalog 는 자산 x 컬럼 행
+    if table == "lineage":
+        return [(c.key, c) for c in _LINEAGE_COLUMNS]
+    return [(c.key, c) for c in _ASSET_COLUMNS] + [(f"column_{c.key}", c) for c in _COLUMN_COLUMNS]
+
+
+def iter_catalog(conn: Connection, side: Connection, batch_size: int) -> Iterator[List[dict]]:
+    # 자산은 서버 측 커서로 배치 단위 스트리밍하고, 배치마다 컬럼/상위 리니지를 IN 쿼리 한 번씩으로 붙임
+    # (MariaDB 의 스트리밍 커서가 열려 있는 동안 같은 연결에서 다른 쿼리를 할 수 없어 보조 연결 사용)
+    read_asset, read_column = _row_reader(_ASSET_COLUMNS), _row_reader(_COLUMN_COLUMNS, offset=1)
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+        select(*_ASSET_COLUMNS).order_by(DataAsset.id)
+    )
+    for partition in result.partitions():
+        assets = [read_asset(row) for row in partition]
+        ids = [a["id"] for a in assets]
+        columns: Dict[str, list] = {}
+        rows = side.execute(
+            select(AssetColumn.asset_id, *_COLUMN_COLUMNS).where(AssetColumn.asset_id.in_(ids))
+            .order_by(AssetColumn.asset_id, AssetColumn.ordinal_position)
+        )
+        for asset_id, group in groupby(rows, key=itemgetter(0)):
+            columns[asset_id] = [read_column(r) for r in group]
+        upstream: Dict[str, list] = {}
+        for r in side.execute(select(*_LINEAGE_COLUMNS).where(DataLineage.target_asset_id.in_(ids))).mappings():
+            upstream.setdefault(r["target_asset_id"], []).append(dict(r))
+        for a in assets:
+            a["columns"] = columns.get(a["id"], [])
+            a["upstream"] = upstream.get(a["id"], [])
+        yield assets
+
+
+def iter_lineage(conn: Connection, batch_size: int) -> Iterator[List[dict]]:
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+        select(*_LINEAGE_COLUMNS).order_by(DataLineage.id)
+    )
+    for partition in result.mappings().partitions():
+        yield [dict(r) for r in partition]
+
+
+def _json_text(value):
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def _flat_values(columns: Sequence) -> Callable[[dict], tuple]:
+    # 레코드를 컬럼 순서의 튜플로. CSV/Parquet 셀에 넣을 수 있도록 JSON 컬럼(태그/문서 링크)은 문자열로
+    getters = [(c.key, _json_text if isinstance(c.type, JSON) else None) for c in columns]
+
+    def values(record: dict) -> tuple:
+        return tuple(fn(record[k]) if fn else record[k] for k, fn in getters)
+    return values
+
+
+def _flat_rows(table: str, batch: List[dict]) -> Iterator[tuple]:
+    # 평면 형식용 행을 _fields 순서의 튜플로 (자산 부분은 자산마다 한 번만 구성)
+    if table == "lineage":
+        yield from map(_flat_values(_LINEAGE_COLUMNS), batch)
+        return
+    asset_values, column_values = _flat_values(_ASSET_COLUMNS), _flat_values(_COLUMN_COLUMNS)
+    empty = (None,) * len(_COLUMN_COLUMNS)
+    for a in batch:
+        base = asset_values(a)
+        if not a["columns"]:
+            yield base + empty
+        for col in a["columns"]:
+            yield base + column_values(col)
+
+
+class _Sink:
+    # ParquetWriter 가 쓰는 바이트를 모아 두었다가 행 그룹마다 꺼내 응답으로 흘려보냄
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _encode(fmt: str, table: str, batches: Iterable[List[dict]]) -> Iterator[bytes]:
+    fields = _fields(table)
+    if fmt == "ndjson":
+        # orjson: JSON 컬럼은 배열/객체로, 일시는 ISO-8601 로 직렬화
+        for batch in batches:
+            yield b"".join(dumps(r) + b"\n" for r in batch)
+    elif fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow([name for name, _ in fields])
+        for batch in batches:
+            writer.writerows(_flat_rows(table, batch))
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode()
+    else:
+        schema = pa.schema([(name, _arrow_type(c)) for name, c in fields])
+        sink = _Sink()
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        for batch in batches:
+            rows = list(_flat_rows(table, batch))
+            columns = zip(*rows) if rows else [()] * len(fields)
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=f.type) for values, f in zip(columns, schema)], schema=schema
+            ))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_catalog(engine: Engine, fmt: str, table: str, batch_size: int, gzip: bool = False) -> Iterator[bytes]:
+    # 동기 제너레이터 (엔드포인트는 iterate_sync 로 한 스레드에서 순회). 배치 하나 분량만 메모리에 유지
+    with engine.connect() as conn, engine.connect() as side:
+        batches = iter_catalog(conn, side, batch_size) if table == "catalog" else iter_lineage(conn, batch_size)
+        chunks = _encode(fmt, table, batches)
+        yield from (_gzip(chunks) if gzip else chunks)
+
+
+def export_filename(fmt: str, table: str, gzip: bool, now: Optional[datetime] = None) -> str:
+    stamp = (now or datetime.now()).strftime("%Y%m%d-%H%M%S")
+    return f"axd-{table}-{stamp}.{fmt}" + (".gz" if gzip else "")
@@ -0,0 +1,103 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.all_models import AssetTag, DataAsset
+
+# 자산 컬럼 패싯 (태그 패싯은 asset_tags 에서 따로 집계)
+FACET_FIELDS = ("service_id", "database_name", "schema_name", "sensitivity_level")
+MAX_TAG_LENGTH = 255
+
+_tags = AssetTag.__table__
+
+
+def normalize_tags(tags: Optional[Iterable]) -> List[str]:
+    # 문자열 태그만 앞뒤 공백을 떼고 중복 제거 (순서 유지)
+    out: Dict[str, None] = {}
+    for t in tags or ():
+        if isinstance(t, str) and t.strip():
+            out[t.strip()[:MAX_TAG_LENGTH]] = None
+    return list(out)
+
+
+def sync_tags(conn, tags_by_asset: Mapping[str, Optional[Iterable]], replace: bool = True):
+    # 자산별 태그 행을 통째로 교체. conn 은 Session 또는 Connection 이며 호출자의 트랜잭션 안에서 실행
+    if not tags_by_asset:
+        return
+    if replace:
+        conn.execute(delete(_tags).where(_tags.c.asset_id.in_(list(tags_by_asset))))
+    rows = [{"asset_id": asset_id, "tag": t}
+            for asset_id, tags in tags_by_asset.items() for t in normalize_tags(tags)]
+    if rows:
+        conn.execute(_tags.insert(), rows)
+
+
+def rebuild_tags(conn, batch_size: int = 5000) -> int:
+    # data_assets.tags 로부터 asset_tags 전체를 다시 채움 (마이그레이션/수동 복구용)
+    conn.execute(delete(_tags))
+    written = 0
+    batch: Dict[str, Optional[list]] = {}
+    for asset_id, tags in conn.execute(select(DataAsset.id, DataAsset.tags)):
+        if tags:
+            batch[asset_id] = tags
+        if len(batch) >= batch_size:
+            sync_tags(conn, batch, replace=False)
+            written += len(batch)
+            batch = {}
+    sync_tags(conn, batch, replace=False)
+    return written + len(batch)
+
+
+def facet_counts(db: Session, filters: Mapping[str, Optional[str]], tags: Sequence[str] = (),
+                 tag_limit: int = 50) -> dict:
+    # 필터(컬럼 값 일치 + 모든 태그 포함)에 맞는 자산에 대해 차원별 건수
+    conditions = [getattr(DataAsset, f) == v for f, v in filters.items() if v is not None]
+    for tag in dict.fromkeys(tags):
+        conditions.append(DataAsset.id.in_(select(_tags.c.asset_id).where(_tags.c.tag == tag)))
+
+    # 네 차원의 조합별 건수를 GROUP BY 한 번으로 구한 뒤 차원별로 합산 (조합 수는 자산 수보다 훨씬 적음)
+    columns = [getattr(DataAsset, f) for f in FACET_FIELDS]
+    counts: Dict[str, Dict[Optional[str], int]] = {f: {} for f in FACET_FIELDS}
+    total = 0
+    for *values, n in db.execute(select(*columns, func.count()).where(*conditions).group_by(*columns)):
+        total += n
+        for field, value in zip(FACET_FIELDS, values):
+            counts[field][value] = counts[field].get(value, 0) + n
+
+    # 태그는 (tag, asset_id) 인덱스만 읽어 집계. 필터가 있으면 조건에 맞는 자산 id 목록으로 asset_tags 를 찾음
+    # (조인으로 쓰면 SQLite 가 asset_tags 전체를 먼저 읽음)
+    tag_query = select(_tags.c.tag, func.count()).group_by(_tags.c.tag)
+    if conditions:
+        tag_query = tag_query.where(_tags.c.asset_id.in_(select(DataAsset.id).where(*conditions)))
+    tag_counts = dict(db.execute(tag_query).all())
+
+    facets = {field: _ranked(values) for field, values in counts.items()}
+    facets["tags"] = _ranked(tag_counts)[:tag_limit]
+    return {"total": total, "facets": facets}
+
+
+def _ranked(counts: Mapping[Optional[str], int]) -> List[dict]:
+    # 건수 내림차순, 같으면 값 오름차순 (NULL 은 뒤)
+    items = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0] is None, kv[0] or ""))
+    return [{"value": value, "count": n} for value, n in items]
+
+
+# --- 쓰기 시점 동기화 -----------------------------------------------------------
+# ORM 으로 자산을 쓰면 같은 트랜잭션(flush 커넥션)에서 asset_tags 를 갱신. 벌크 경로는 sync_tags 를 직접 호출
+
+
+@event.listens_for(DataAsset, "after_insert")
+def _insert_tags(mapper, connection, target):
+    sync_tags(connection, {target.id: target.tags}, replace=False)
+
+
+@event.listens_for(DataAsset, "after_update")
+def _update_tags(mapper, connection, target):
+    if inspect(target).attrs.tags.history.has_changes():
+        sync_tags(connection, {target.id: target.tags})
+
+
+@event.listens_for(DataAsset, "before_delete")
+def _delete_tags(mapper, connection, target):
+    connection.execute(delete(_tags).where(_tags.c.asset_id == target.id))
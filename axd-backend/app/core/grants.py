@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import Counter as Deltas
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.activity_rollup import apply_deltas, db_now, hour_bucket
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.leases import acquire_lease
+from app.core.metrics import Counter, Histogram, metrics
+from app.core.notifications import add_notifications, notification_broker
+from app.core.permission_index import permission_index
+from app.crud.crud_notification import to_event
+from app.database import SessionLocal, call_sync
+from app.models.all_models import AssetPermission, DataAsset, Notification, PermissionRequest
+
+logger = logging.getLogger(__name__)
+
+# PermissionRequest.duration -> 권한 유효 기간 (permanent 는 만료 없음)
+DURATION_DAYS = {"1week": 7, "1month": 30, "3months": 90, "6months": 180, "1year": 365}
+PERMANENT = "permanent"
+DECISIONS = ("approved", "rejected")
+# 만료 처리한 권한의 revoked_by
+SWEEPER_ID = "system:expiry"
+# 주기 실행을 한 프로세스만 맡도록 하는 임대 이름 (scheduler_leases)
+SWEEP_LEASE = "grant_sweep"
+
+WAIT_BUCKETS = (60, 3600, 4 * 3600, 86400, 3 * 86400, 7 * 86400, 30 * 86400)
+
+reviews_total = metrics.register(Counter("axd_permission_reviews_total", "Permission requests reviewed in batches"))
+review_rate = metrics.register(Counter(
+    "axd_permission_review_rows_per_second", "Requests processed per second by the last review batch", "gauge"
+))
+review_wait = metrics.register(Histogram(
+    "axd_permission_review_wait_seconds", "Time from permission request to review", WAIT_BUCKETS
+))
+swept_total = metrics.register(Counter("axd_grant_sweep_expired_total", "Expired grants revoked by the sweeper"))
+sweep_rate = metrics.register(Counter(
+    "axd_grant_sweep_rows_per_second", "Grants revoked per second by the last sweep", "gauge"
+))
+sweep_lag = metrics.register(Counter(
+    "axd_grant_sweep_lag_seconds", "Age of the oldest expired grant still not revoked after the last sweep", "gauge"
+))
+
+
+class ConcurrentReviewError(Exception):
+    pass
+
+
+def grant_expiry(duration: Optional[str], granted_at: datetime) -> Optional[datetime]:
+    duration = duration or "1month"
+    if duration == PERMANENT:
+        return None
+    days = DURATION_DAYS.get(duration)
+    if days is None:
+        raise ValueError(f"Unknown grant duration: {duration}")
+    return granted_at + timedelta(days=days)
+
+
+def review_requests(db: Session, ids: Sequence[str], decision: str, reviewer_id: str,
+                    reviewer_name: str = "", comment: str = "") -> dict:
+    # 대기 중인 요청을 한 트랜잭션으로 승인/반려하고, 권한과 알림은 executemany 로 한 번에 기록
+    if decision not in DECISIONS:
+        raise ValueError(f"Unknown decision: {decision}")
+    started = time.perf_counter()
+    now = datetime.now()
+    ids = list(dict.fromkeys(ids))
+    R = PermissionRequest
+    rows = db.execute(
+        select(R.id, R.asset_id, R.requester_id, R.requester_name, R.requester_email, R.requested_level,
+               R.duration, R.created_at)
+        .where(R.id.in_(ids), R.status == "pending")
+    ).all()
+    found = {r.id for r in rows}
+    # 없거나 이미 처리된 요청은 건너뛰고 결과에 표시
+    skipped = [i for i in ids if i not in found]
+    if not rows:
+        return {"decision": decision, "reviewed": 0, "granted": 0, "notified": 0, "skipped": skipped,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    grants: List[dict] = []
+    if decision == "approved":
+        grants = [
+            {
+                "asset_id": r.asset_id, "user_id": r.requester_id, "user_name": r.requester_name or "",
+                "user_email": r.requester_email or "", "permission_level": r.requested_level,
+                "granted_by": reviewer_id, "granted_by_name": reviewer_name, "granted_at": now,
+                "expires_at": grant_expiry(r.duration, now),
+            }
+            for r in rows
+        ]
+
+    # 조건부 UPDATE: 조회 이후 다른 심사자가 먼저 처리한 요청이 있으면 전체를 취소
+    result = db.execute(
+        update(R).where(R.id.in_(found), R.status == "pending")
+        .values(status=decision, reviewer_id=reviewer_id, reviewer_name=reviewer_name,
+                reviewer_comment=comment, reviewed_at=now, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(rows):
+        db.rollback()
+        raise ConcurrentReviewError("Some requests were reviewed concurrently; retry the batch")
+
+    if grants:
+        db.execute(insert(AssetPermission.__table__), grants)
+
+    names = dict(db.execute(
+        select(DataAsset.id, DataAsset.name).where(DataAsset.id.in_({r.asset_id for r in rows}))
+    ).all())
+    verb = "승인" if decision == "approved" else "반려"
+    notifications = [
+        {
+            "id": str(uuid.uuid4()), "user_id": r.requester_id, "type": f"permission_{decision}",
+            "title": f"{names.get(r.asset_id, r.asset_id)} 권한 요청이 {verb}되었습니다",
+            "message": comment, "link": f"/assets/{r.asset_id}", "is_read": False, "created_at": now,
+        }
+        for r in rows
+    ]
+    # 재연결 커서(seq)를 커밋 직전에 매겨 INSERT (카운터 행 잠금을 커밋 순간으로 한정)
+    add_notifications(db, notifications)
+
+    # 벌크 UPDATE 는 flush 이벤트를 거치지 않으므로 대시보드 집계를 같은 트랜잭션에서 직접 이동
+    deltas: Deltas = Deltas()
+    for r in rows:
+        bucket = hour_bucket(r.created_at)
+        deltas[(bucket, "permission_requests", "pending")] -= 1
+        deltas[(bucket, "permission_requests", decision)] += 1
+    apply_deltas(db.connection(), deltas)
+    # 대기 시간은 created_at(server_default) 과 같은 DB 시계로 측정
+    reviewed_at = db_now(db)
+    db.commit()
+
+    if grants:
+        permission_index.invalidate_users({g["user_id"] for g in grants})
+        response_cache.invalidate(["permissions"])
+    notification_broker.publish([to_event(Notification(**n)) for n in notifications])
+
+    elapsed = time.perf_counter() - started
+    reviews_total.inc((("decision", decision),), len(rows))
+    review_rate.set((("decision", decision),), round(len(rows) / elapsed, 1) if elapsed else 0)
+    for r in rows:
+        if r.created_at is not None:
+            review_wait.observe((), (reviewed_at - r.created_at.replace(tzinfo=None)).total_seconds())
+    return {
+        "decision": decision,
+        "reviewed": len(rows),
+        "granted": len(grants),
+        "notified": len(notifications),
+        "skipped": skipped,
+        "elapsed_ms": round(elapsed * 1000, 2),
+    }
+
+
+class GrantSweeper:
+    # 만료된 권한을 (revoked_at, expires_at) 인덱스 순서로 batch_size 건씩 회수 처리.
+    # 배치마다 커밋하므로 잠금 시간이 짧고, 한 번 실행에 max_batches 까지만 처리해 나머지는 다음 주기로 넘김
+
+    def __init__(self, session_factory=SessionLocal, batch_size: int = 500, max_batches: int = 100):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._lock = threading.Lock()
+        self.last_run: Optional[dict] = None
+
+    @staticmethod
+    def _expired(now: datetime):
+        return AssetPermission.revoked_at.is_(None), AssetPermission.expires_at <= now
+
+    def sweep(self, now: Optional[datetime] = None) -> dict:
+        # 스케줄러와 수동 실행이 겹치면 뒤에 온 쪽이 기다림
+        with self._lock:
+            now = now or datetime.now()
+            started = time.perf_counter()
+            swept = batches = 0
+            users = set()
+            db = self.session_factory()
+            try:
+                while batches < self.max_batches:
+                    rows = db.execute(
+                        select(AssetPermission.id, AssetPermission.user_id)
+                        .where(*self._expired(now)).order_by(AssetPermission.expires_at).limit(self.batch_size)
+                    ).all()
+                    if not rows:
+                        break
+                    # 수동 실행과 겹쳐도 아직 회수되지 않은 행만 갱신하므로 실제 갱신 건수를 집계
+                    result = db.execute(
+                        update(AssetPermission)
+                        .where(AssetPermission.id.in_([r.id for r in rows]), AssetPermission.revoked_at.is_(None))
+                        .values(revoked_at=now, revoked_by=SWEEPER_ID)
+                        .execution_options(synchronize_session=False)
+                    )
+                    db.commit()
+                    batch_users = {r.user_id for r in rows}
+                    permission_index.invalidate_users(batch_users)
+                    users |= batch_users
+                    swept += result.rowcount
+                    batches += 1
+                    if len(rows) < self.batch_size:
+                        break
+                oldest = db.scalar(select(func.min(AssetPermission.expires_at)).where(*self._expired(now)))
+            finally:
+                db.close()
+
+            if swept:
+                response_cache.invalidate(["permissions"])
+            elapsed = time.perf_counter() - started
+            lag = (now - oldest.replace(tzinfo=None)).total_seconds() if oldest else 0.0
+            swept_total.inc((), swept)
+            sweep_rate.set((), round(swept / elapsed, 1) if elapsed and swept else 0)
+            sweep_lag.set((), round(lag, 3))
+            self.last_run = {
+                "started_at": now,
+                "swept": swept,
+                "batches": batches,
+                "users": len(users),
+                # 실행 후에도 남은 가장 오래된 만료 권한의 경과 시간 (max_batches 에 걸려 다음 주기로 넘긴 경우 > 0)
+                "lag_seconds": round(lag, 3),
+                "elapsed_ms": round(elapsed * 1000, 2),
+            }
+            return self.last_run
+
+    def sweep_if_leader(self, lease_ttl: float) -> Optional[dict]:
+        # 임대를 가진 프로세스만 실행하고 나머지 워커는 건너뜀 (None)
+        db = self.session_factory()
+        try:
+            if not acquire_lease(db, SWEEP_LEASE, lease_ttl):
+                return None
+        finally:
+            db.close()
+        return self.sweep()
+
+    async def run(self, interval: float):
+        # 모든 워커가 띄우지만 임대를 얻은 하나만 정리하고, 보유자가 멈추면 두 주기 뒤 다른 워커가 이어받음
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                result = await asyncio.to_thread(call_sync, self.sweep_if_leader, interval * 2)
+                if result and result["swept"]:
+                    logger.info("grant sweep: %(swept)d expired grants in %(batches)d batches (%(elapsed_ms)sms)",
+                                result)
+            except Exception:
+                logger.exception("grant sweep failed")
+
+    def stats(self) -> Dict[str, object]:
+        return {"batch_size": self.batch_size, "max_batches": self.max_batches, "last_run": self.last_run}
+
+
+grant_sweeper = GrantSweeper(batch_size=settings.GRANT_SWEEP_BATCH_SIZE, max_batches=settings.GRANT_SWEEP_MAX_BATCHES)
@@ -0,0 +1,91 @@
+import logging
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.database import call_sync
+
+logger = logging.getLogger(__name__)
+
+MAX_KEPT_JOBS = 200
+
+
+class Job:
+    def __init__(self, kind: str, params: Optional[dict] = None):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.params = params or {}
+        self.status = "pending"
+        self.progress: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    def update(self, **progress):
+        self.progress.update(progress)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobRegistry:
+    # 오래 걸리는 작업을 HTTP 요청과 분리해 백그라운드 스레드에서 실행하고 상태를 조회할 수 있게 한다
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="axd-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, params: Optional[dict] = None, **kwargs) -> Job:
+        job = Job(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > MAX_KEPT_JOBS:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: Job, fn, args, kwargs):
+        job.status = "running"
+        job.started_at = datetime.now()
+        try:
+            # 작업은 동기 DB 코드이므로 비동기 엔진의 풀을 쓰도록 call_sync 로 실행
+            job.result = call_sync(fn, job, *args, **kwargs)
+            job.status = "succeeded"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error("job %s (%s) failed\n%s", job.id, job.kind, traceback.format_exc())
+        finally:
+            job.finished_at = datetime.now()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [j for j in reversed(jobs) if kind is None or j.kind == kind]
+
+    def running(self, kind: str) -> Optional[Job]:
+        return next((j for j in self.list(kind) if j.status in ("pending", "running")), None)
+
+
+jobs = JobRegistry()
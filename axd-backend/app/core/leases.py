@@ -0,0 +1,38 @@
+import os
+import socket
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.activity_rollup import db_now
+from app.models.all_models import SchedulerLease
+
+# 이 프로세스의 임대 보유자 이름 (같은 호스트의 여러 워커도 구분)
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lease(db: Session, name: str, ttl: float, owner: str = PROCESS_ID) -> bool:
+    # 조건부 UPDATE 로 임대를 연장(보유자)하거나 만료된 임대를 가져옴. 행이 없으면 INSERT 로 선점
+    # 만료 시각은 DB 시계 기준이라 워커/호스트 간 시계 차이와 무관. 커밋까지 수행
+    now = db_now(db)
+    expires_at = now + timedelta(seconds=ttl)
+    L = SchedulerLease
+    result = db.execute(
+        update(L).where(L.name == name, or_(L.owner == owner, L.expires_at <= now))
+        .values(owner=owner, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    acquired = result.rowcount == 1
+    if not acquired:
+        try:
+            with db.begin_nested():
+                db.execute(insert(L).values(name=name, owner=owner, expires_at=expires_at))
+            acquired = True
+        except IntegrityError:
+            # 다른 프로세스가 아직 유효한 임대를 가지고 있음
+            pass
+    db.commit()
+    return acquired
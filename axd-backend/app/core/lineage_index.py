@@ -0,0 +1,225 @@
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.models.all_models import DataAsset, DataLineage
+
+DIRECTIONS = ("upstream", "downstream", "both")
+RESULT_CACHE_SIZE = 1024
+# 다른 워커의 리니지 변경을 감지하는 응답 캐시 네임스페이스 (변경한 워커가 워터마크를 올림)
+CACHE_NAMESPACES = ("lineage",)
+# 노드 메타와 이름 마스킹에 쓰이는 자산 필드 (이 필드가 바뀔 때만 다시 구성)
+NODE_FIELDS = ("name", "schema_name", "database_name", "owner_id", "requires_permission")
+
+
+def _node_key(asset_id: Optional[str], name: Optional[str], type_: Optional[str]) -> str:
+    # 카탈로그에 없는 외부 소스/타깃은 이름으로 노드를 식별
+    return asset_id or f"{type_ or 'external'}:{name or ''}"
+
+
+class LineageGraph:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._downstream: Dict[str, List[dict]] = {}
+        self._upstream: Dict[str, List[dict]] = {}
+        self._nodes: Dict[str, dict] = {}
+        # 보호 자산 id -> owner_id (응답에서 이름을 가릴지 판단용, 노드 메타에는 넣지 않음)
+        self._protected: Dict[str, Optional[str]] = {}
+        self._results: "OrderedDict[Tuple[str, str, int], dict]" = OrderedDict()
+        self.loaded = False
+        self.version = 0
+        # 구성 직전에 읽은 응답 캐시 워터마크
+        self._token: Optional[str] = None
+
+    def invalidate(self):
+        # 이 프로세스는 다음 조회 때 다시 구성하고, 다른 워커는 워터마크 변화로 알게 됨
+        with self._lock:
+            self.loaded = False
+            self.version += 1
+            self._results.clear()
+        response_cache.invalidate(CACHE_NAMESPACES)
+
+    def is_current(self) -> bool:
+        return self.loaded and self._token == response_cache.version_token(CACHE_NAMESPACES)
+
+    def rebuild(self, db):
+        # db 는 Session 또는 Connection
+        token = response_cache.version_token(CACHE_NAMESPACES)
+        version = self.version
+        downstream: Dict[str, List[dict]] = {}
+        upstream: Dict[str, List[dict]] = {}
+        nodes: Dict[str, dict] = {}
+        protected: Dict[str, Optional[str]] = {}
+
+        rows = db.execute(select(
+            DataLineage.id, DataLineage.source_asset_id, DataLineage.target_asset_id,
+            DataLineage.source_name, DataLineage.target_name,
+            DataLineage.source_type, DataLineage.target_type,
+            DataLineage.transformation_type,
+        )).all()
+        for r in rows:
+            src = _node_key(r.source_asset_id, r.source_name, r.source_type)
+            tgt = _node_key(r.target_asset_id, r.target_name, r.target_type)
+            edge = {"id": r.id, "source": src, "target": tgt, "transformation_type": r.transformation_type}
+            downstream.setdefault(src, []).append(edge)
+            upstream.setdefault(tgt, []).append(edge)
+            nodes.setdefault(src, {"id": src, "asset_id": r.source_asset_id, "name": r.source_name, "type": r.source_type})
+            nodes.setdefault(tgt, {"id": tgt, "asset_id": r.target_asset_id, "name": r.target_name, "type": r.target_type})
+
+        # 엣지에 이름이 비어있는 경우를 대비해 자산 메타를 한 번에 조회
+        asset_ids = [n["asset_id"] for n in nodes.values() if n["asset_id"]]
+        if asset_ids:
+            for a in db.execute(
+                select(DataAsset.id, DataAsset.name, DataAsset.schema_name, DataAsset.database_name,
+                       DataAsset.owner_id, DataAsset.requires_permission)
+                .where(DataAsset.id.in_(asset_ids))
+            ):
+                node = nodes[a.id]
+                node["name"] = a.name
+                node["schema_name"] = a.schema_name
+                node["database_name"] = a.database_name
+                if a.requires_permission:
+                    protected[a.id] = a.owner_id
+
+        with self._lock:
+            self._downstream, self._upstream, self._nodes = downstream, upstream, nodes
+            self._protected = protected
+            self._results.clear()
+            # 구성 도중 무효화되었으면 다음 조회에서 다시 구성
+            self.loaded = version == self.version
+            self._token = token
+
+    def ensure_loaded(self, db):
+        if not self.is_current():
+            with self._lock:
+                if not self.is_current():
+                    self.rebuild(db)
+
+    def has_node(self, node_id: str) -> bool:
+        return node_id in self._nodes
+
+    def protected(self, asset_id: Optional[str]) -> Tuple[bool, Optional[str]]:
+        # (requires_permission, owner_id)
+        if asset_id in self._protected:
+            return True, self._protected[asset_id]
+        return False, None
+
+    def _walk(self, root: str, adjacency: Dict[str, List[dict]], next_key: str, depth: int,
+              node_depths: Dict[str, int], edges: Dict[str, dict], sign: int):
+        queue = deque([(root, 0)])
+        seen = {root}
+        while queue:
+            node, d = queue.popleft()
+            if d >= depth:
+                continue
+            for edge in adjacency.get(node, ()):
+                edges[edge["id"]] = edge
+                nxt = edge[next_key]
+                if nxt not in seen:
+                    seen.add(nxt)
+                    node_depths.setdefault(nxt, sign * (d + 1))
+                    queue.append((nxt, d + 1))
+
+    @staticmethod
+    def _back_edges(edges: Dict[str, dict]) -> List[str]:
+        # 탐색된 부분 그래프에서 DFS(white/gray/black)로 순환을 만드는 엣지를 찾는다
+        out: Dict[str, List[dict]] = {}
+        for e in edges.values():
+            out.setdefault(e["source"], []).append(e)
+        state: Dict[str, int] = {}
+        back: List[str] = []
+        for start in out:
+            if state.get(start):
+                continue
+            state[start] = 1
+            stack = [(start, iter(out.get(start, ())))]
+            while stack:
+                node, it = stack[-1]
+                edge = next(it, None)
+                if edge is None:
+                    state[node] = 2
+                    stack.pop()
+                    continue
+                tgt = edge["target"]
+                if state.get(tgt) == 1:
+                    back.append(edge["id"])
+                elif not state.get(tgt):
+                    state[tgt] = 1
+                    stack.append((tgt, iter(out.get(tgt, ()))))
+        return back
+
+    def traverse(self, root: str, direction: str = "both", depth: int = 3) -> dict:
+        key = (root, direction, depth)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+
+            node_depths: Dict[str, int] = {root: 0}
+            edges: Dict[str, dict] = {}
+            if direction in ("upstream", "both"):
+                self._walk(root, self._upstream, "source", depth, node_depths, edges, -1)
+            if direction in ("downstream", "both"):
+                self._walk(root, self._downstream, "target", depth, node_depths, edges, +1)
+
+            cycle_edges = self._back_edges(edges)
+            nodes = []
+            for node_id, d in node_depths.items():
+                meta = self._nodes.get(node_id, {"id": node_id, "asset_id": node_id, "name": None, "type": "table"})
+                nodes.append({**meta, "depth": d})
+
+            result = {
+                "root": root,
+                "direction": direction,
+                "depth": depth,
+                "nodes": nodes,
+                "edges": list(edges.values()),
+                "has_cycle": bool(cycle_edges),
+                "cycle_edges": cycle_edges,
+            }
+            self._results[key] = result
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+            return result
+
+
+lineage_graph = LineageGraph()
+
+
+# 리니지가 바뀌거나 노드 메타로 쓰이는 자산 이름/위치가 바뀌거나 자산이 삭제되어 commit 되면 인접 인덱스를 무효화
+# (자산의 다른 필드 변경은 그래프와 무관하므로 무시)
+_DIRTY_KEY = "lineage_graph_dirty"
+
+
+def _renamed(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[f].history.has_changes() for f in NODE_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_dirty(session, flush_context):
+    if session.info.get(_DIRTY_KEY):
+        return
+    # 새 자산은 아직 어떤 엣지도 가리킬 수 없으므로 (같은 flush 의 엣지는 DataLineage 로 잡힘) 제외
+    if (
+        any(isinstance(obj, DataLineage) for obj in (*session.new, *session.dirty, *session.deleted))
+        or any(isinstance(obj, DataAsset) for obj in session.deleted)
+        or any(isinstance(obj, DataAsset) and _renamed(obj) for obj in session.dirty)
+    ):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session):
+    if session.info.pop(_DIRTY_KEY, False):
+        lineage_graph.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_DIRTY_KEY, None)
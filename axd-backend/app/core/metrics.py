@@ -0,0 +1,216 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _fmt_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"') for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name, self.help, self.buckets = name, help, tuple(buckets)
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            # [버킷별 카운트..., +Inf 카운트, 합계]
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket{_fmt_labels(labels, ('le', str(bound)))} {cumulative}"
+            yield f"{self.name}_sum{_fmt_labels(labels)} {series[-1]}"
+            yield f"{self.name}_count{_fmt_labels(labels)} {cumulative}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, type_: str = "counter"):
+        self.name, self.help, self.type = name, help, type_
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), value: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + value
+
+    def set(self, labels: Labels, value: float):
+        self._values[labels] = value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_fmt_labels(labels)} {value}"
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "started")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.started = time.perf_counter()
+
+
+# 요청 단위 DB 통계. 객체를 공유하므로 threadpool/greenlet 으로 컨텍스트가 복사돼도 같은 값을 누적
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("axd_request_stats", default=None)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests_total = Counter("axd_http_requests_total", "Total HTTP requests")
+        self.latency = Histogram("axd_http_request_duration_seconds", "HTTP request latency", LATENCY_BUCKETS)
+        self.response_size = Histogram("axd_http_response_size_bytes", "HTTP response body size", SIZE_BUCKETS)
+        self.in_flight = Counter("axd_http_requests_in_flight", "HTTP requests currently being served", "gauge")
+        self.request_queries = Histogram("axd_db_queries_per_request", "SQL statements per request", QUERY_BUCKETS)
+        self.db_time = Counter("axd_db_time_seconds_total", "Time spent executing SQL per route")
+        self.db_statements = Counter("axd_db_statements_total", "SQL statements executed per route")
+        self.slow_query_count = Counter(
+            "axd_http_requests_query_threshold_exceeded_total",
+            "Requests that issued more SQL statements than METRICS_QUERY_THRESHOLD",
+        )
+        self._extra = []
+        self.in_flight.set((), 0)
+
+    def register(self, metric):
+        # 다른 모듈(작업 스케줄러 등)이 자체 지표를 /metrics 에 노출할 때 사용
+        self._extra.append(metric)
+        return metric
+
+    def track_start(self):
+        with self._lock:
+            self.in_flight.inc((), 1)
+
+    def track_end(self, method: str, route: str, status: int, duration: float, size: int, stats: RequestStats):
+        labels = (("method", method), ("route", route))
+        with self._lock:
+            self.in_flight.inc((), -1)
+            self.requests_total.inc(labels + (("status", str(status)),))
+            self.latency.observe(labels, duration)
+            self.response_size.observe(labels, size)
+            self.request_queries.observe(labels, stats.queries)
+            self.db_statements.inc(labels, stats.queries)
+            self.db_time.inc(labels, stats.db_time)
+            if stats.queries > settings.METRICS_QUERY_THRESHOLD:
+                self.slow_query_count.inc(labels)
+        if stats.queries > settings.METRICS_QUERY_THRESHOLD:
+            logger.warning(
+                "%s %s issued %d SQL statements (threshold %d) - possible N+1",
+                method, route, stats.queries, settings.METRICS_QUERY_THRESHOLD,
+            )
+
+    def render(self) -> str:
+        metrics = [
+            self.requests_total, self.latency, self.response_size, self.in_flight,
+            self.request_queries, self.db_statements, self.db_time, self.slow_query_count, *self._extra,
+        ]
+        with self._lock:
+            lines = [line for m in metrics for line in m.render()]
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    # 순수 ASGI 미들웨어 (StreamingResponse 도 버퍼링하지 않고 통과)
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status, size = 500, 0
+        metrics.track_start()
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.METRICS_SERVER_TIMING:
+                    app_ms = (time.perf_counter() - stats.started) * 1000
+                    timing = (
+                        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+                        f"app;dur={app_ms:.2f}"
+                    )
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            metrics.track_end(
+                scope["method"], _route_label(scope), status, time.perf_counter() - stats.started, size, stats
+            )
+
+
+def _route_label(scope) -> str:
+    # id 가 들어간 실제 경로 대신 라우트 템플릿으로 집계 (지표 카디널리티 제한)
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "<unmatched>"
+    # include_router 로 중첩된 라우트는 prefix 를 뺀 상대 경로만 가지므로 실제 경로에서 prefix 를 복원
+    path_parts = scope["path"].lstrip("/").split("/")
+    template_parts = template.lstrip("/").split("/")
+    prefix = path_parts[:max(len(path_parts) - len(template_parts), 0)]
+    return ("/" + "/".join(prefix) if prefix else "") + template
+
+
+# --- SQLAlchemy 엔진 이벤트: 모든 엔진(동기/비동기)의 구문 수와 DB 시간을 요청에 귀속 --------------
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("axd_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["axd_query_start"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    starts = context.connection.info.get("axd_query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
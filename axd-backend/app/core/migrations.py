@@ -0,0 +1,165 @@
+"""버전 관리되는 스키마 마이그레이션
+
+create_all 은 없는 테이블만 만들고 기존 테이블에 인덱스를 추가하지 않으므로, 이미 운영 중인 DB 에
+필요한 변경은 MIGRATIONS 에 순서대로 추가하고 적용 여부를 schema_migrations 테이블에 기록한다.
+애플리케이션 시작 시 자동 적용되며 수동 실행도 가능:
+
+    python -m app.core.migrations           # 미적용 마이그레이션 적용
+    python -m app.core.migrations --status  # 적용 현황 출력
+"""
+import argparse
+import logging
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+
+from app.core.activity_rollup import rebuild_totals
+from app.core.facets import rebuild_tags
+from app.crud.crud_notification import assign_sequence, seed_sequence
+from app.models.all_models import Base, DataAsset, Notification
+
+logger = logging.getLogger(__name__)
+
+# drop_all/create_all(샘플 데이터 초기화)에 포함되지 않도록 모델과 별도 메타데이터에 둠
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def create_indexes(*names: str) -> Callable[[Connection], None]:
+    # 모델에 선언된 인덱스를 이름으로 찾아 생성 (이미 있으면 건너뜀)
+    indexes = {ix.name: ix for table in Base.metadata.tables.values() for ix in table.indexes}
+    missing = [n for n in names if n not in indexes]
+    if missing:
+        raise ValueError(f"Unknown indexes: {', '.join(missing)}")
+
+    def upgrade(conn: Connection):
+        for name in names:
+            conn.execute(CreateIndex(indexes[name], if_not_exists=True))
+    return upgrade
+
+
+def add_notification_seq(conn: Connection):
+    # create_all 은 기존 테이블에 컬럼을 추가하지 않으므로 직접 추가하고, 기존 알림에 생성 순서대로 seq 를 매김
+    if "seq" not in {c["name"] for c in inspect(conn).get_columns("notifications")}:
+        conn.execute(text("ALTER TABLE notifications ADD COLUMN seq BIGINT"))
+    create_indexes("ix_notifications_user_id_seq")(conn)
+    seed_sequence(conn)
+    ids = conn.execute(
+        select(Notification.id).where(Notification.seq.is_(None)).order_by(Notification.created_at, Notification.id)
+    ).scalars().all()
+    assign_sequence(conn, ids)
+
+
+def add_asset_natural_key(conn: Connection):
+    # 유니크 인덱스는 중복 자연키가 있으면 만들 수 없으므로 어떤 키가 겹치는지 알려주고 중단 (자동 병합은 하지 않음)
+    key = (DataAsset.database_name, DataAsset.schema_name, DataAsset.name)
+    duplicates = conn.execute(
+        select(*key, func.count()).group_by(*key).having(func.count() > 1).limit(10)
+    ).all()
+    if duplicates:
+        listed = ", ".join(f"{d}.{s}.{n} ({c})" for d, s, n, c in duplicates)
+        raise RuntimeError(f"Duplicate asset natural keys must be resolved before migration 6: {listed}")
+    create_indexes("ux_data_assets_natural_key")(conn)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "secondary indexes for catalog, lineage, comment, request and notification lookups", create_indexes(
+        "ix_data_assets_updated_at_id",
+        "ix_data_assets_service_id_updated_at_id",
+        "ix_asset_columns_asset_id_ordinal_position",
+        "ix_data_lineage_source_asset_id",
+        "ix_data_lineage_target_asset_id",
+        "ix_asset_comments_asset_id_created_at",
+        "ix_asset_permissions_user_id",
+        "ix_asset_permissions_asset_id",
+        "ix_permission_requests_status_created_at",
+        "ix_permission_requests_asset_id",
+        "ix_permission_requests_requester_id",
+        "ix_request_types_category_id",
+        "ix_service_requests_status_created_at",
+        "ix_service_requests_requester_id",
+        "ix_service_requests_request_type_id",
+        "ix_notifications_user_id_created_at_id",
+        "ix_notifications_user_id_is_read",
+        "ix_sample_data_asset_id",
+        "ix_activity_rollups_metric_status",
+    )),
+    Migration(2, "covering index for asset facet counts", create_indexes("ix_data_assets_facets")),
+    # asset_tags 테이블은 create_all 이 만들고, 기존 자산의 JSON 태그를 한 번 옮겨 담음
+    Migration(3, "backfill asset_tags from data_assets.tags", rebuild_tags),
+    Migration(4, "index for the expired grant sweeper", create_indexes("ix_asset_permissions_revoked_at_expires_at")),
+    Migration(5, "commit-ordered notification sequence for SSE resume", add_notification_seq),
+    Migration(6, "unique natural key for asset ingest upserts", add_asset_natural_key),
+    Migration(7, "running totals for dashboard pending counts", rebuild_totals),
+    # 5 를 이미 적용한 DB 에 카운터 행이 없을 수 있으므로 따로 한 번 더 (있으면 그대로)
+    Migration(8, "seed the notification sequence counter", seed_sequence),
+]
+
+
+def applied_versions(conn: Connection) -> set:
+    schema_migrations.create(conn, checkfirst=True)
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(conn: Connection) -> List[int]:
+    # 테이블 생성(create_all) 이후 호출. 적용한 버전 목록 반환
+    done = applied_versions(conn)
+    applied = []
+    for m in sorted(MIGRATIONS, key=lambda m: m.version):
+        if m.version in done:
+            continue
+        logger.info("applying schema migration %d: %s", m.version, m.description)
+        m.upgrade(conn)
+        try:
+            with conn.begin_nested():
+                conn.execute(schema_migrations.insert().values(
+                    version=m.version, description=m.description, applied_at=datetime.now()
+                ))
+        except IntegrityError:
+            # 다른 워커가 동시에 적용한 경우 (변경 자체는 IF NOT EXISTS 라 중복돼도 무해)
+            continue
+        applied.append(m.version)
+    return applied
+
+
+def main(argv=None):
+    from app.database import call_sync
+
+    p = argparse.ArgumentParser(description="Apply versioned schema migrations")
+    p.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    args = p.parse_args(argv)
+    call_sync(_main, args)
+
+
+def _main(args):
+    from app.database import engine
+
+    with engine.begin() as conn:
+        if args.status:
+            done = applied_versions(conn)
+            for m in MIGRATIONS:
+                print(f"{m.version:>4}  {'applied' if m.version in done else 'pending':<8} {m.description}")
+            return
+        Base.metadata.create_all(conn)
+        applied = run_migrations(conn)
+    print(f"applied {applied}" if applied else "schema is up to date")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, event, insert, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.crud.crud_notification import allocate_sequence, to_event
+from app.models.all_models import Notification
+
+logger = logging.getLogger(__name__)
+
+Dispatch = Callable[[List[dict]], None]
+
+
+class LocalBrokerBackend:
+    # 단일 프로세스용: 발행 즉시 같은 프로세스의 구독자에게 전달
+
+    def attach(self, dispatch: Dispatch):
+        self._dispatch = dispatch
+
+    def publish(self, events: List[dict]):
+        self._dispatch(events)
+
+
+class SqliteBrokerBackend:
+    # 여러 uvicorn 워커가 같은 알림을 받도록 공유 SQLite 파일을 이벤트 로그로 사용 (Redis pub/sub 등의 대체용)
+    # 각 워커는 폴링 스레드 하나로 새 이벤트를 읽어 자기 프로세스의 구독자에게 전달
+
+    RETENTION_SECONDS = 600
+
+    def __init__(self, path: str, poll_interval: float = 0.5):
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS broker_events "
+            "(seq INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._last_seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM broker_events").fetchone()[0]
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, dispatch: Dispatch):
+        self._dispatch = dispatch
+        self._thread = threading.Thread(target=self._poll, name="axd-notify-poll", daemon=True)
+        self._thread.start()
+
+    def publish(self, events: List[dict]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO broker_events (payload, created) VALUES (?, ?)",
+                [(json.dumps(e, default=str), now) for e in events],
+            )
+
+    def _poll(self):
+        last_prune = 0.0
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                with self._lock:
+                    rows = self._conn.execute(
+                        "SELECT seq, payload FROM broker_events WHERE seq > ? ORDER BY seq", (self._last_seq,)
+                    ).fetchall()
+                    if time.time() - last_prune > 60:
+                        self._conn.execute(
+                            "DELETE FROM broker_events WHERE created < ?", (time.time() - self.RETENTION_SECONDS,)
+                        )
+                        last_prune = time.time()
+                if rows:
+                    self._last_seq = rows[-1][0]
+                    self._dispatch([json.loads(p) for _, p in rows])
+            except Exception:
+                logger.exception("notification broker poll failed")
+
+
+def create_broker_backend(url: Optional[str]):
+    if not url:
+        return LocalBrokerBackend()
+    if url.startswith("sqlite:///"):
+        return SqliteBrokerBackend(url[len("sqlite:///"):], settings.NOTIFY_POLL_INTERVAL)
+    raise ValueError(f"Unsupported notification backend: {url}")
+
+
+class Subscriber:
+    __slots__ = ("user_id", "queue", "loop")
+
+    def __init__(self, user_id: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: "asyncio.Queue[Optional[dict]]" = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, event: dict):
+        # 이벤트 루프 스레드에서 실행. 느린 클라이언트는 큐가 차면 끊고(None) Last-Event-ID 로 다시 받게 함
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class NotificationBroker:
+    def __init__(self, backend, queue_size: int = 1000):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subs: Dict[str, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+        backend.attach(self._dispatch)
+
+    def subscribe(self, user_id: str) -> Subscriber:
+        sub = Subscriber(user_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subs.setdefault(user_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            subs = self._subs.get(sub.user_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.user_id]
+
+    def publish(self, events: List[dict]):
+        if events:
+            self.backend.publish(events)
+
+    def _dispatch(self, events: List[dict]):
+        # 발행 스레드(요청/작업 스레드 또는 폴링 스레드)에서 각 구독자의 이벤트 루프로 넘김
+        with self._lock:
+            targets = [(e, list(self._subs.get(e["user_id"], ()))) for e in events]
+        for e, subs in targets:
+            for sub in subs:
+                sub.loop.call_soon_threadsafe(sub.offer, e)
+            unread_counter.on_event(e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"users": len(self._subs), "connections": sum(len(s) for s in self._subs.values())}
+
+
+class UnreadCounter:
+    # 사용자별 읽지 않은 알림 수. 처음 한 번만 COUNT 하고 이후에는 발행/읽음 처리로 증감
+    # 다른 워커에서의 읽음 처리 등은 TTL 로 반영
+
+    def __init__(self, max_users: int = 10000, ttl: float = 30.0):
+        self.max_users = max_users
+        self.ttl = ttl
+        # user_id -> [건수, 적재 시각, COUNT 시점의 최신 알림 seq]
+        self._counts: "OrderedDict[str, list]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _generation(self, user_id: str) -> tuple:
+        return self._epoch, self._generations.get(user_id, 0)
+
+    def load(self, user_id: str, count: Callable[[], Tuple[int, Optional[int]]]) -> int:
+        with self._lock:
+            entry = self._counts.get(user_id)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                self._counts.move_to_end(user_id)
+                return entry[0]
+            generation = self._generation(user_id)
+
+        value, latest = count()
+        with self._lock:
+            # COUNT 도중 알림이 도착하거나 읽음 처리되었으면 결과를 보관하지 않음
+            if generation == self._generation(user_id):
+                self._counts[user_id] = [value, time.monotonic(), latest]
+                self._counts.move_to_end(user_id)
+                while len(self._counts) > self.max_users:
+                    self._counts.popitem(last=False)
+        return value
+
+    def add(self, user_id: str, delta: int):
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            entry = self._counts.get(user_id)
+            if entry is not None:
+                entry[0] = max(entry[0] + delta, 0)
+
+    def on_event(self, event: dict):
+        if event.get("is_read"):
+            return
+        # 공유 백엔드는 커밋보다 늦게 전달되므로 이미 COUNT 에 포함된 알림은 다시 더하지 않음
+        key = int(event["event_id"]) if event.get("event_id") else None
+        with self._lock:
+            self._generations[event["user_id"]] = self._generations.get(event["user_id"], 0) + 1
+            entry = self._counts.get(event["user_id"])
+            if entry is not None and (entry[2] is None or key is None or key > entry[2]):
+                entry[0] += 1
+                if key is not None:
+                    entry[2] = key
+
+    def invalidate(self, user_ids: Iterable[str]):
+        with self._lock:
+            for user_id in user_ids:
+                self._counts.pop(user_id, None)
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+
+unread_counter = UnreadCounter(ttl=settings.NOTIFY_UNREAD_TTL_SECONDS)
+notification_broker = NotificationBroker(
+    create_broker_backend(settings.NOTIFY_BACKEND_URL), queue_size=settings.NOTIFY_QUEUE_SIZE
+)
+
+
+def format_sse(event: dict) -> bytes:
+    return f"id: {event['event_id']}\nevent: notification\ndata: {json.dumps(event, ensure_ascii=False)}\n\n".encode()
+
+
+# --- notifications 테이블 쓰기 -> 발행 (커밋된 것만 전달) ---------------------------------------
+
+_PENDING_KEY = "notification_pending"
+_BULK_KEY = "notification_bulk"
+_TOUCHED_KEY = "notification_touched"
+_notifications = Notification.__table__
+
+
+def add_notifications(session: Session, rows: List[dict]):
+    # 벌크 경로: 알림 행(dict)을 커밋 직전에 seq 를 매겨 한 번에 INSERT (커밋 후 각 dict 의 "seq" 가 채워져 있음).
+    # 발행은 호출자가 커밋 후에 직접 수행
+    session.info.setdefault(_BULK_KEY, []).extend(rows)
+
+
+@event.listens_for(Notification, "before_insert")
+def _stamp_created_at(mapper, connection, target):
+    # 목록 정렬이 흔들리지 않도록 마이크로초 단위 생성 시각을 앱에서 지정
+    if target.created_at is None:
+        target.created_at = datetime.now()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_notifications(session, flush_context):
+    new = [obj for obj in session.new if isinstance(obj, Notification)]
+    touched = {obj.user_id for obj in (*session.dirty, *session.deleted) if isinstance(obj, Notification)}
+    if new:
+        session.info.setdefault(_PENDING_KEY, []).extend(new)
+    if touched:
+        session.info.setdefault(_TOUCHED_KEY, set()).update(touched)
+
+
+@event.listens_for(Session, "before_commit")
+def _assign_sequence(session):
+    # 재연결 커서 seq 는 트랜잭션의 알림 전체에 대해 커밋 직전에 UPDATE 한 번으로 예약.
+    # 카운터 행은 이 시점부터 커밋까지만 잠기므로 알림을 쓰는 트랜잭션끼리 전체가 직렬화되지 않고,
+    # 예약 순서 = 커밋 순서라 seq 로 이어받는 재연결이 늦게 커밋된 알림을 놓치지 않음
+    session.flush()
+    objects = [o for o in session.info.get(_PENDING_KEY, ()) if o.seq is None]
+    bulk = session.info.pop(_BULK_KEY, None) or []
+    if not objects and not bulk:
+        return
+    seq = allocate_sequence(session, len(objects) + len(bulk))
+    if objects:
+        session.execute(
+            update(_notifications).where(_notifications.c.id == bindparam("_id")).values(seq=bindparam("_seq")),
+            [{"_id": o.id, "_seq": seq + i} for i, o in enumerate(objects)],
+        )
+        for i, o in enumerate(objects):
+            set_committed_value(o, "seq", seq + i)
+        seq += len(objects)
+    if bulk:
+        for i, row in enumerate(bulk):
+            row["seq"] = seq + i
+        session.execute(insert(_notifications), bulk)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish(session):
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    if touched:
+        unread_counter.invalidate(touched)
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        notification_broker.publish([to_event(o) for o in pending])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_BULK_KEY, None)
+    session.info.pop(_TOUCHED_KEY, None)
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import Header
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.all_models import AssetPermission
+
+
+class UserGrants:
+    # 한 사용자의 유효한 권한 (asset_id -> 만료 시각, None 이면 무기한)
+    __slots__ = ("user_id", "grants", "full_access", "loaded_at")
+
+    def __init__(self, user_id: Optional[str], grants: Dict[str, Optional[datetime]], full_access: bool = False):
+        self.user_id = user_id
+        self.grants = grants
+        self.full_access = full_access
+        self.loaded_at = time.monotonic()
+
+    def allows(self, asset_id: str, owner_id: Optional[str], requires_permission: bool, now: datetime) -> bool:
+        if not requires_permission or self.full_access:
+            return True
+        if owner_id is not None and owner_id == self.user_id:
+            return True
+        if asset_id not in self.grants:
+            return False
+        # 만료는 조회 시점에 판단하므로 만료 직후에도 색인을 다시 읽을 필요가 없음
+        expires_at = self.grants[asset_id]
+        return expires_at is None or expires_at > now
+
+    def cache_key(self, now: datetime) -> str:
+        # 응답 캐시 구분용: 사용자와 현재 유효한 권한 수 (만료되면 값이 바뀌어 ETag 도 바뀜)
+        if self.full_access:
+            return "*"
+        valid = sum(1 for e in self.grants.values() if e is None or e > now)
+        return f"{self.user_id}:{valid}"
+
+
+FULL_ACCESS = UserGrants(None, {}, full_access=True)
+
+
+class PermissionIndex:
+    # 사용자별 부여 자산 색인. 요청마다 자산 단위로 AssetPermission 을 조회하지 않도록
+    # 사용자당 한 번 읽어 LRU 로 보관하고, 권한 부여/회수 커밋 시 해당 사용자만 비운다.
+    # 다른 워커의 변경은 TTL 로 반영
+
+    def __init__(self, max_users: int = 10000, ttl: float = 30.0):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._users: "OrderedDict[str, UserGrants]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _generation(self, user_id: str) -> tuple:
+        return self._epoch, self._generations.get(user_id, 0)
+
+    def for_user(self, db: Session, user_id: Optional[str]) -> UserGrants:
+        if user_id is None:
+            # 사용자 식별 헤더가 없는 요청은 기존 데모 동작(전체 권한)을 유지할지 설정으로 결정
+            return FULL_ACCESS if settings.PERMISSION_ANONYMOUS_FULL_ACCESS else UserGrants(None, {})
+
+        with self._lock:
+            cached = self._users.get(user_id)
+            if cached is not None and time.monotonic() - cached.loaded_at < self.ttl:
+                self._users.move_to_end(user_id)
+                return cached
+            generation = self._generation(user_id)
+
+        now = datetime.now()
+        # 결과를 TTL 동안 보관하므로 조회 요청의 세션이 레플리카여도 primary 에서 읽음 (복제 지연분을 고정하지 않도록)
+        rows = db.execute(
+            select(AssetPermission.asset_id, AssetPermission.expires_at).where(
+                AssetPermission.user_id == user_id,
+                AssetPermission.revoked_at.is_(None),
+                or_(AssetPermission.expires_at.is_(None), AssetPermission.expires_at > now),
+            ),
+            bind_arguments={"bind": db.bind} if db.bind is not None else None,
+        ).all()
+        grants: Dict[str, Optional[datetime]] = {}
+        for asset_id, expires_at in rows:
+            expires_at = expires_at.replace(tzinfo=None) if expires_at else None
+            # 같은 자산에 권한이 여러 건이면 가장 늦게 만료되는 것을 사용
+            if asset_id in grants and (grants[asset_id] is None or (expires_at and expires_at < grants[asset_id])):
+                continue
+            grants[asset_id] = expires_at
+        entry = UserGrants(user_id, grants)
+
+        with self._lock:
+            # 조회 도중 권한이 바뀌었으면 오래된 결과를 보관하지 않음
+            if generation == self._generation(user_id):
+                self._users[user_id] = entry
+                self._users.move_to_end(user_id)
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+        return entry
+
+    def invalidate_users(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def stats(self) -> dict:
+        return {"users": len(self._users), "max_users": self.max_users, "ttl": self.ttl}
+
+
+permission_index = PermissionIndex(settings.PERMISSION_INDEX_MAX_USERS, settings.PERMISSION_INDEX_TTL_SECONDS)
+
+
+def current_user_id(x_user_id: Optional[str] = Header(None)) -> Optional[str]:
+    # 인증 게이트웨이/프론트엔드가 전달하는 사용자 식별자
+    return x_user_id or None
+
+
+# --- 권한 부여/회수 시 해당 사용자 색인 무효화 (Core insert 경로는 호출부에서 clear) --------------
+
+_PENDING_KEY = "permission_index_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_users(session, flush_context):
+    users = {
+        obj.user_id for obj in (*session.new, *session.dirty, *session.deleted) if isinstance(obj, AssetPermission)
+    }
+    if users:
+        session.info.setdefault(_PENDING_KEY, set()).update(users)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        permission_index.invalidate_users(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_PENDING_KEY, None)
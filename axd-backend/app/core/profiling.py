@@ -0,0 +1,252 @@
+import hashlib
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Text, cast, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.jobs import Job
+from app.models.all_models import AssetColumn, AssetProfile, SampleData
+
+DATETIME_TYPES = {"datetime", "date", "timestamp", "timestamptz"}
+MAX_VALUE_LENGTH = 100
+
+# (asset_id, 샘플 행 JSON 문자열 목록, 컬럼명 -> data_type)
+ChunkItem = Tuple[str, List[str], Dict[str, str]]
+
+
+def _scalar(value, integral: bool = False):
+    # numpy/pandas 스칼라를 JSON 으로 저장 가능한 값으로 변환
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if integral and isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and len(value) > MAX_VALUE_LENGTH:
+        return value[:MAX_VALUE_LENGTH]
+    return value
+
+
+def classify_freshness(age_hours: float, warning: float, critical: float) -> str:
+    if age_hours > critical:
+        return "critical"
+    if age_hours > warning:
+        return "warning"
+    return "good"
+
+
+def profile_chunk(items: Sequence[ChunkItem], now_iso: str, warning: float, critical: float) -> List[Tuple[str, dict]]:
+    # 프로세스 풀에서 실행되는 순수 함수 (DB 접근 없음)
+    # 청크 안의 모든 자산 샘플을 (자산, 컬럼, 값) 긴 형식 프레임 하나로 펼쳐 groupby 한 번으로 집계
+    now = pd.Timestamp(now_iso)
+    assets, names, values = [], [], []
+    row_counts: Dict[str, int] = {}
+    seen: Dict[str, Dict[str, None]] = {}
+    datetime_pairs = []
+    for asset_id, raw_rows, types in items:
+        # JSON 파싱도 워커에서 수행 (메인 스레드는 문자열만 전달)
+        rows = [r for r in map(json.loads, raw_rows) if isinstance(r, dict)]
+        row_counts[asset_id] = len(rows)
+        keys = seen[asset_id] = {}
+        for row in rows:
+            for k, v in row.items():
+                keys[k] = None
+                if v is not None:
+                    assets.append(asset_id)
+                    names.append(k)
+                    values.append(v)
+        datetime_pairs += [(asset_id, c) for c, t in types.items() if (t or "").lower() in DATETIME_TYPES]
+
+    df = pd.DataFrame({"asset": assets, "column": names, "value": pd.Series(values, dtype=object)})
+    pairs = pd.MultiIndex.from_arrays([df["asset"], df["column"]])
+    # bool 은 int 의 하위 타입이므로 type() 으로 정확히 구분
+    df["is_num"] = df["value"].map(type).isin((int, float))
+    df["num"] = pd.to_numeric(df["value"].where(df["is_num"]), errors="coerce")
+    df["ts"] = pd.to_datetime(
+        df["value"].where(pairs.isin(datetime_pairs)), errors="coerce", utc=True, format="ISO8601"
+    )
+    # 문자열은 정렬된 범주 코드로 바꿔 정수 연산으로 min/max/distinct 를 구함 (object 집계는 파이썬 루프로 떨어짐)
+    text = pd.Categorical(df["value"].astype(str), ordered=True)
+    df["code"] = text.codes
+
+    agg = df.groupby(["asset", "column"], sort=False).agg(
+        nonnull=("code", "size"), distinct=("code", "nunique"), all_num=("is_num", "all"),
+        num_min=("num", "min"), num_max=("num", "max"),
+        str_min=("code", "min"), str_max=("code", "max"),
+        ts_min=("ts", "min"), ts_max=("ts", "max"), ts_count=("ts", "count"),
+    )
+
+    age_hours = lambda ts: (now - ts).total_seconds() / 3600
+    profiles = {a: {"row_count": n, "freshness": None, "latest": None, "columns": {}} for a, n in row_counts.items()}
+    latest: Dict[str, pd.Timestamp] = {}
+    for (asset_id, name), r in zip(agg.index, agg.itertuples(index=False)):
+        stats = {"null_ratio": round(100 - r.nonnull * 100 / row_counts[asset_id], 2), "distinct": int(r.distinct),
+                 "freshness": None}
+        if r.ts_count:
+            stats["min"], stats["max"] = _scalar(r.ts_min), _scalar(r.ts_max)
+            stats["freshness"] = classify_freshness(age_hours(r.ts_max), warning, critical)
+            if asset_id not in latest or r.ts_max > latest[asset_id]:
+                latest[asset_id] = r.ts_max
+        elif r.all_num:
+            stats["min"], stats["max"] = _scalar(r.num_min, True), _scalar(r.num_max, True)
+        else:
+            # 타입이 섞인 컬럼이나 문자열/리스트 값은 문자열 기준으로 비교
+            stats["min"], stats["max"] = _scalar(text.categories[r.str_min]), _scalar(text.categories[r.str_max])
+        profiles[asset_id]["columns"][str(name)] = stats
+
+    for asset_id, keys in seen.items():
+        columns = profiles[asset_id]["columns"]
+        for k in keys:
+            # 모든 값이 null 인 컬럼
+            columns.setdefault(str(k), {"null_ratio": 100.0, "distinct": 0, "min": None, "max": None, "freshness": None})
+        # 날짜형 컬럼이 없으면 자산 신선도는 판단하지 않음 (기존 값 유지)
+        if asset_id in latest:
+            profiles[asset_id]["freshness"] = classify_freshness(age_hours(latest[asset_id]), warning, critical)
+            profiles[asset_id]["latest"] = latest[asset_id].isoformat()
+    return list(profiles.items())
+
+
+def sample_fingerprints(db: Session, asset_ids: Optional[Sequence[str]] = None, yield_per: int = 10_000) -> Dict[str, str]:
+    # 자산별 샘플 건수와 (id, 행 내용) 해시로 변경 여부를 판단 (건수/id 범위만 보면 제자리 수정이나 일부 교체를 놓침)
+    stmt = select(SampleData.asset_id, SampleData.id, cast(SampleData.row_data, Text)) \
+        .order_by(SampleData.asset_id, SampleData.id).execution_options(yield_per=yield_per)
+    if asset_ids:
+        stmt = stmt.where(SampleData.asset_id.in_(asset_ids))
+    # asset_id -> [건수, sha1]
+    state: Dict[str, list] = {}
+    for asset_id, sample_id, row_data in db.execute(stmt):
+        entry = state.get(asset_id)
+        if entry is None:
+            entry = state[asset_id] = [0, hashlib.sha1()]
+        entry[0] += 1
+        entry[1].update(f"{sample_id}\0{row_data or ''}\n".encode())
+    return {a: f"{n}:{digest.hexdigest()}" for a, (n, digest) in state.items()}
+
+
+def _load_chunk(db: Session, asset_ids: List[str]) -> List[ChunkItem]:
+    rows: Dict[str, List[str]] = {a: [] for a in asset_ids}
+    for asset_id, row_data in db.execute(
+        select(SampleData.asset_id, cast(SampleData.row_data, Text)).where(SampleData.asset_id.in_(asset_ids))
+    ):
+        if row_data:
+            rows[asset_id].append(row_data)
+    types: Dict[str, Dict[str, str]] = {a: {} for a in asset_ids}
+    for asset_id, name, data_type in db.execute(
+        select(AssetColumn.asset_id, AssetColumn.column_name, AssetColumn.data_type)
+        .where(AssetColumn.asset_id.in_(asset_ids))
+    ):
+        types[asset_id][name] = data_type or ""
+    return [(a, rows[a], types[a]) for a in asset_ids]
+
+
+def _write_results(db: Session, results: List[Tuple[str, dict]], fingerprints: Dict[str, str]) -> int:
+    if not results:
+        return 0
+
+    ids = [a for a, _ in results]
+    column_updates = []
+    by_asset = dict(results)
+    for col_id, asset_id, name in db.execute(
+        select(AssetColumn.id, AssetColumn.asset_id, AssetColumn.column_name).where(AssetColumn.asset_id.in_(ids))
+    ):
+        profile = by_asset[asset_id]
+        stats = profile["columns"].get(name)
+        if stats is None:
+            continue
+        values = {"id": col_id, "dq_null_ratio": stats["null_ratio"]}
+        freshness = stats["freshness"] or profile["freshness"]
+        if freshness:
+            values["dq_freshness"] = freshness
+        column_updates.append(values)
+
+    # 기본키 기준 executemany UPDATE 한 번과 프로파일 교체(delete + insert)로 일괄 기록
+    if column_updates:
+        db.execute(update(AssetColumn), column_updates)
+    db.execute(delete(AssetProfile).where(AssetProfile.asset_id.in_(ids)))
+    now = datetime.now()
+    db.execute(insert(AssetProfile.__table__), [{
+        "asset_id": a, "sample_fingerprint": fingerprints[a], "row_count": r["row_count"],
+        "freshness": r["freshness"],
+        "latest_value_at": datetime.fromisoformat(r["latest"]) if r["latest"] else None,
+        "column_stats": r["columns"], "profiled_at": now,
+    } for a, r in results])
+    db.commit()
+    return len(results)
+
+
+def run_profiling(
+    db: Session,
+    *,
+    force: bool = False,
+    asset_ids: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    job: Optional[Job] = None,
+) -> dict:
+    if workers is None:
+        workers = settings.DQ_PROFILE_WORKERS
+    if workers is None:
+        workers = min(4, (os.cpu_count() or 1) - 1)
+    chunk_size = chunk_size or settings.DQ_PROFILE_CHUNK_SIZE
+
+    fingerprints = sample_fingerprints(db, asset_ids)
+    profiled = dict(db.execute(select(AssetProfile.asset_id, AssetProfile.sample_fingerprint)).all())
+    targets = [a for a, fp in fingerprints.items() if force or profiled.get(a) != fp]
+    # 샘플이 모두 삭제된 자산의 프로파일은 제거
+    orphaned = [a for a in profiled if a not in fingerprints and (not asset_ids or a in asset_ids)]
+    if orphaned:
+        db.execute(delete(AssetProfile).where(AssetProfile.asset_id.in_(orphaned)))
+        db.commit()
+
+    summary = {"assets_total": len(targets), "assets_done": 0, "skipped": len(fingerprints) - len(targets),
+               "removed": len(orphaned)}
+    if job is not None:
+        job.update(**summary)
+    if not targets:
+        return summary
+
+    args = (datetime.now(timezone.utc).isoformat(), settings.DQ_FRESHNESS_WARNING_HOURS,
+            settings.DQ_FRESHNESS_CRITICAL_HOURS)
+    # fork 는 엔진 커넥션/스레드 상태를 복제하므로 spawn 으로 순수 계산 프로세스만 띄움
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) \
+        if workers > 0 else None
+    in_flight: "deque[Future]" = deque()
+
+    def drain_one():
+        summary["assets_done"] += _write_results(db, in_flight.popleft().result(), fingerprints)
+        if job is not None:
+            job.update(**summary)
+
+    try:
+        for start in range(0, len(targets), chunk_size):
+            items = _load_chunk(db, targets[start:start + chunk_size])
+            if executor is not None:
+                fut = executor.submit(profile_chunk, items, *args)
+            else:
+                fut = Future()
+                fut.set_result(profile_chunk(items, *args))
+            in_flight.append(fut)
+            # 읽기(DB)와 계산(워커)을 겹치되 메모리에 올라가는 청크 수는 제한
+            while len(in_flight) > max(workers, 1) * 2:
+                drain_one()
+        while in_flight:
+            drain_one()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    # 벌크 UPDATE 는 세션 flush 이벤트를 타지 않으므로 컬럼 응답 캐시를 직접 무효화
+    response_cache.invalidate(["columns"])
+    return summary
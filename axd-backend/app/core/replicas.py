@@ -0,0 +1,158 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.metrics import Counter, metrics
+
+logger = logging.getLogger(__name__)
+
+_PROBE = text("SELECT 1 FROM data_assets LIMIT 1")
+
+replica_healthy = metrics.register(Counter("axd_db_replica_up", "Read replica health (1 = serving reads)", "gauge"))
+replica_routed = metrics.register(Counter("axd_db_sessions_routed_total", "Request sessions by target database"))
+replica_retried = metrics.register(Counter(
+    "axd_db_replica_retries_total", "Read requests re-run on the primary after a replica failed mid-request"
+))
+
+
+class Replica:
+    def __init__(self, name: str, url: str, async_engine):
+        # 레플리카마다 비동기 엔진(풀) 하나. 동기 코드는 async_engine.sync_engine 을 사용
+        self.name = name
+        self.url = url
+        self.async_engine = async_engine
+        self.healthy = True
+        # 헬스체크 응답 시간의 지수 이동 평균 (least_latency 선택 기준)
+        self.latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        replica_healthy.set((("replica", name),), 1)
+
+        # 요청 처리 중 연결 오류가 나면 다음 헬스체크를 기다리지 않고 바로 제외
+        @event.listens_for(async_engine.sync_engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+                self.mark_down(str(context.original_exception))
+
+    def mark_up(self, latency: float):
+        self.latency = latency if self.latency is None else self.latency * 0.7 + latency * 0.3
+        self.checked_at = time.monotonic()
+        if not self.healthy:
+            logger.info("read replica %s is back", self.name)
+        self.healthy = True
+        self.last_error = None
+        replica_healthy.set((("replica", self.name),), 1)
+
+    def mark_down(self, error: str):
+        self.checked_at = time.monotonic()
+        if self.healthy:
+            logger.warning("read replica %s is down, falling back to primary: %s", self.name, error)
+        self.healthy = False
+        self.last_error = error
+        replica_healthy.set((("replica", self.name),), 0)
+
+
+class ReplicaPool:
+    # 조회(GET) 요청 세션을 읽기 레플리카로 분산. 정상 레플리카가 없으면 primary 를 사용
+
+    def __init__(self, replicas: List[Replica], strategy: str = "round_robin", read_your_writes: float = 5.0):
+        if strategy not in ("round_robin", "least_latency"):
+            raise ValueError(f"Unsupported replica strategy: {strategy}")
+        self.replicas = replicas
+        self.strategy = strategy
+        self.read_your_writes = read_your_writes
+        self._rr = itertools.count()
+        # 클라이언트 -> 마지막 쓰기 시각 (직후 조회는 복제 지연을 피해 primary 로)
+        self._writes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_latency":
+            return min(healthy, key=lambda r: r.latency if r.latency is not None else float("inf"))
+        return healthy[next(self._rr) % len(healthy)]
+
+    def note_write(self, client: Optional[str]):
+        if not client or not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._writes[client] = now
+            if len(self._writes) > 10000:
+                self._writes = {c: t for c, t in self._writes.items() if now - t < self.read_your_writes}
+
+    def recently_wrote(self, client: Optional[str]) -> bool:
+        if not client:
+            return False
+        written = self._writes.get(client)
+        return written is not None and time.monotonic() - written < self.read_your_writes
+
+    def record_route(self, target: str):
+        replica_routed.inc((("target", target),))
+
+    def record_retry(self, replica: str):
+        replica_retried.inc((("replica", replica),))
+
+    @staticmethod
+    async def _probe(replica: Replica):
+        async with replica.async_engine.connect() as conn:
+            # 연결뿐 아니라 카탈로그 테이블을 실제로 읽을 수 있는지 확인
+            await conn.execute(_PROBE)
+
+    async def _check_one(self, replica: Replica, timeout: float):
+        started = time.perf_counter()
+        try:
+            # 연결 수립(응답 없는 호스트의 TCP 연결 포함)까지 제한 시간 안에
+            await asyncio.wait_for(self._probe(replica), timeout)
+        except Exception as e:
+            replica.mark_down(repr(e))
+        else:
+            replica.mark_up(time.perf_counter() - started)
+
+    async def check(self, timeout: float):
+        # 레플리카끼리 기다리지 않도록 동시에 확인 (한 주기는 최대 timeout)
+        await asyncio.gather(*(self._check_one(r, timeout) for r in self.replicas))
+
+    async def run_health_checks(self, interval: float, timeout: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.check(timeout)
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.async_engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "replicas": [
+                {"name": r.name, "healthy": r.healthy,
+                 "latency_ms": round(r.latency * 1000, 3) if r.latency is not None else None,
+                 "last_error": r.last_error}
+                for r in self.replicas
+            ],
+        }
+
+
+def create_replica_pool(urls: Optional[str], create_engine: Callable) -> ReplicaPool:
+    # DB_REPLICA_URLS 는 쉼표로 구분 (로컬 테스트 시 sqlite:///./replica1.db,sqlite:///./replica2.db)
+    replicas = []
+    for i, url in enumerate(u.strip() for u in (urls or "").split(",") if u.strip()):
+        u = make_url(url)
+        name = f"replica{i}:{u.host or u.database}"
+        replicas.append(Replica(name, url, create_engine(url, is_async=True)))
+    return ReplicaPool(replicas, settings.DB_REPLICA_STRATEGY, settings.DB_READ_YOUR_WRITES_SECONDS)
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import orjson
+import pyarrow as pa
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.models.all_models import SampleData
+
+# 파일 형식 버전. 열 변환 방식이 바뀌면 올려서 이전 형식 파일을 다시 만들게 함
+FORMAT_VERSION = 2
+
+
+class SampleStore:
+    # 자산별 샘플을 Arrow IPC(Feather v2, 비압축) 파일로 보관하고 읽을 때는 memory-map 으로 열어 복사 없이 슬라이스
+    # SampleData 테이블이 원본이며, 파일은 첫 조회 때 만들어지고 샘플이 바뀌면 삭제되는 열 지향 캐시
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        # 파일을 만드는 동안 무효화가 일어나면 오래된 샘플을 기록하지 않도록 세대 번호로 확인
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+    def _path(self, asset_id: str) -> str:
+        # asset_id 를 그대로 경로에 쓰지 않도록 해시로 파일명을 만든다
+        digest = hashlib.sha1(asset_id.encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], f"{digest}.v{FORMAT_VERSION}.arrow")
+
+    def generation(self, asset_id: str) -> tuple:
+        with self._lock:
+            return self._epoch, self._generations.get(asset_id, 0)
+
+    def load(self, asset_id: str) -> Optional[pa.Table]:
+        try:
+            source = pa.memory_map(self._path(asset_id), "r")
+        except FileNotFoundError:
+            return None
+        return pa.ipc.open_file(source).read_all()
+
+    def write(self, asset_id: str, rows: List[dict], generation: Optional[tuple] = None) -> pa.Table:
+        table = rows_to_table(rows)
+        with self._lock:
+            stale = generation is not None and generation != (self._epoch, self._generations.get(asset_id, 0))
+        if stale:
+            return table
+        path = self._path(asset_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+        return table
+
+    def invalidate(self, asset_ids: Sequence[str]):
+        with self._lock:
+            for asset_id in asset_ids:
+                self._generations[asset_id] = self._generations.get(asset_id, 0) + 1
+        for asset_id in asset_ids:
+            try:
+                os.remove(self._path(asset_id))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._generations.clear()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+# 값을 JSON 문자열로 저장한 열 (중첩 값이나 타입이 섞인 열). 읽을 때 다시 파싱해 원래 값으로 복원
+_JSON_ENCODED = {b"encoding": b"json"}
+# 행마다 없던 키 목록. 키 구성이 다른 행이 섞인 경우에만 만들며, 읽을 때 해당 키를 빼서 row_data 그대로 복원
+ABSENT_COLUMN = "__absent__"
+_SCALARS = {bool, int, float, str}
+
+
+def _column(name: str, values: list):
+    kinds = {type(v) for v in values if v is not None}
+    # 한 가지 스칼라 타입으로만 된 열은 Arrow 타입 그대로 (널이 섞인 정수 열도 int64 유지)
+    if len(kinds) <= 1 and kinds <= _SCALARS:
+        try:
+            array = pa.array(values)
+            return pa.field(name, array.type), array
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            pass
+    array = pa.array([None if v is None else dumps(v).decode() for v in values], type=pa.string())
+    return pa.field(name, pa.string(), metadata=_JSON_ENCODED), array
+
+
+def rows_to_table(rows: List[dict]) -> pa.Table:
+    # row_data 를 열 단위로 변환. 값 변환(정수 -> 실수, 중첩 값 -> repr 문자열, 빠진 키 -> null)이 없도록 저장
+    names: Dict[str, None] = {}
+    for row in rows:
+        names.update(dict.fromkeys(row))
+    fields, arrays = [], []
+    for name in names:
+        field, array = _column(str(name), [row.get(name) for row in rows])
+        fields.append(field)
+        arrays.append(array)
+    absent = [[n for n in names if n not in row] or None for row in rows]
+    if any(absent):
+        fields.append(pa.field(ABSENT_COLUMN, pa.list_(pa.string())))
+        arrays.append(pa.array(absent, type=pa.list_(pa.string())))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def sample_columns(table: pa.Table) -> List[str]:
+    return [c for c in table.column_names if c != ABSENT_COLUMN]
+
+
+def select_columns(table: pa.Table, wanted: Sequence[str]) -> pa.Table:
+    # 빠진 키 목록은 투영 후에도 유지 (선택하지 않은 키는 복원 시 무시됨)
+    return table.select([*wanted, ABSENT_COLUMN] if ABSENT_COLUMN in table.column_names else list(wanted))
+
+
+def table_to_rows(table: pa.Table) -> List[dict]:
+    rows = table.to_pylist()
+    encoded = [f.name for f in table.schema if f.metadata and f.metadata.get(b"encoding") == b"json"]
+    has_absent = ABSENT_COLUMN in table.column_names
+    if not encoded and not has_absent:
+        return rows
+    for row in rows:
+        for name in encoded:
+            if row[name] is not None:
+                row[name] = orjson.loads(row[name])
+        if has_absent:
+            for name in row.pop(ABSENT_COLUMN) or ():
+                row.pop(name, None)
+    return rows
+
+
+def iter_json_array(table: pa.Table, chunk_rows: int = 1000) -> Iterator[bytes]:
+    # 레코드 배치 단위로 JSON 배열을 흘려보냄 (전체 응답을 메모리에 만들지 않음)
+    yield b"["
+    first = True
+    for batch in table.to_batches(max_chunksize=chunk_rows):
+        if batch.num_rows == 0:
+            continue
+        body = dumps(table_to_rows(pa.Table.from_batches([batch])))[1:-1]
+        yield body if first else b"," + body
+        first = False
+    yield b"]"
+
+
+sample_store = SampleStore(settings.SAMPLE_STORE_DIR)
+
+
+# --- 샘플 변경 시 파일 무효화 (Core insert 경로는 호출부에서 직접 invalidate/clear) ------------
+
+_PENDING_KEY = "sample_store_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_samples(session, flush_context):
+    changed = {
+        obj.asset_id for obj in (*session.new, *session.dirty, *session.deleted) if isinstance(obj, SampleData)
+    }
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        sample_store.invalidate(list(pending))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    session.info.pop(_PENDING_KEY, None)
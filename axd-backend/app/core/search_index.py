@@ -0,0 +1,504 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Text, and_, cast, event, exists, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.database import SessionLocal, call_sync
+from app.models.all_models import AssetColumn, AssetTombstone, DataAsset
+
+logger = logging.getLogger(__name__)
+
+# 색인 내용이 의존하는 응답 캐시 네임스페이스 (다른 워커의 쓰기를 워터마크 변화로 감지)
+CACHE_NAMESPACES = ("assets", "columns")
+
+# 필드별 가중치 (이름/태그 매칭이 설명 매칭보다 높은 점수를 받도록)
+FIELD_WEIGHTS = {
+    "name": 5.0,
+    "tags": 3.0,
+    "column_name": 2.0,
+    "business_definition": 1.0,
+    "description": 1.0,
+    "column_description": 0.5,
+}
+PREFIX_PENALTY = 0.8
+MIN_PREFIX_LEN = 2
+# 짧은 접두어가 어휘 수천 개로 펼쳐지지 않도록 훑는 범위와 병합할 토큰 수를 제한 (길이가 가까운 토큰 우선)
+MAX_PREFIX_SCAN = 5000
+MAX_PREFIX_TERMS = 50
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    tokens = []
+    for word in _TOKEN_RE.findall(text.lower()):
+        tokens.append(word)
+        # snake_case 식별자는 각 부분도 색인 (user_events -> user, events)
+        if "_" in word:
+            tokens.extend(p for p in word.split("_") if p)
+    return tokens
+
+
+def _weigh(pairs: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, float]:
+    terms: Dict[str, float] = {}
+    for field, text in pairs:
+        w = FIELD_WEIGHTS[field]
+        for tok in tokenize(text):
+            terms[tok] = terms.get(tok, 0.0) + w
+    return terms
+
+
+def _asset_terms(a: dict) -> Dict[str, float]:
+    pairs = [
+        ("name", a.get("name")),
+        ("description", a.get("description")),
+        ("business_definition", a.get("business_definition")),
+    ]
+    pairs += [("tags", t) for t in (a.get("tags") or []) if isinstance(t, str)]
+    return _weigh(pairs)
+
+
+def _column_terms(c: dict) -> Dict[str, float]:
+    return _weigh([("column_name", c.get("column_name")), ("column_description", c.get("description"))])
+
+
+class _Doc:
+    __slots__ = ("meta", "asset_terms", "columns")
+
+    def __init__(self):
+        self.meta: dict = {}
+        self.asset_terms: Dict[str, float] = {}
+        self.columns: Dict[str, Dict[str, float]] = {}
+
+
+_ASSET_COLS = [
+    DataAsset.id, DataAsset.name, DataAsset.description, DataAsset.business_definition,
+    DataAsset.tags, DataAsset.schema_name, DataAsset.database_name,
+    DataAsset.service_id, DataAsset.sensitivity_level, DataAsset.owner_id, DataAsset.requires_permission,
+    DataAsset.updated_at,
+]
+_COLUMN_COLS = [AssetColumn.id, AssetColumn.asset_id, AssetColumn.column_name, AssetColumn.description]
+_tombstones = AssetTombstone.__table__
+
+
+class CatalogSearchIndex:
+    # 전체 구성은 백그라운드 스레드에서 새 구조에 만든 뒤 교체 (그동안 검색은 SQL 로 처리).
+    # 이 프로세스의 커밋은 세션 이벤트로 바로 반영하고, 다른 워커의 커밋은 응답 캐시 워터마크 변화로 감지해
+    # catalog_snapshot 처럼 updated_at 워터마크 이후 바뀐 자산(+컬럼)과 asset_tombstones 만 다시 읽음
+
+    def __init__(self, overlap: float = 5.0):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._vocab: List[str] = []
+        self._docs: Dict[str, _Doc] = {}
+        self._column_owner: Dict[str, str] = {}
+        self._assets = 0
+        self.loaded = False
+        self.overlap = timedelta(seconds=overlap)
+        # 반영한 자산 updated_at 최댓값, 삭제 기록 기준점, 응답 캐시 워터마크
+        self._watermark = None
+        self._deleted_mark = None
+        self._token: Optional[str] = None
+        # clear() 세대: 구성 도중 테이블이 다시 만들어지면 결과를 버림
+        self._generation = 0
+        self._building = False
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self.rebuilds = 0
+        self.refreshes = 0
+
+    # --- 색인 구성 ---------------------------------------------------------
+
+    def _post(self, asset_id: str, terms: Dict[str, float], sign: float):
+        for tok, w in terms.items():
+            plist = self._postings.get(tok)
+            if plist is None:
+                plist = self._postings[tok] = {}
+                insort(self._vocab, tok)
+            score = plist.get(asset_id, 0.0) + sign * w
+            if score > 1e-9:
+                plist[asset_id] = score
+            else:
+                plist.pop(asset_id, None)
+                if not plist:
+                    del self._postings[tok]
+                    del self._vocab[bisect_left(self._vocab, tok)]
+
+    def upsert_asset(self, a: dict):
+        with self._lock:
+            doc = self._docs.get(a["id"])
+            if doc is None:
+                doc = self._docs[a["id"]] = _Doc()
+            if not doc.meta:
+                self._assets += 1
+            self._post(a["id"], doc.asset_terms, -1)
+            doc.meta = {
+                "id": a["id"],
+                "name": a.get("name"),
+                "schema_name": a.get("schema_name"),
+                "database_name": a.get("database_name"),
+                "service_id": a.get("service_id"),
+                "sensitivity_level": a.get("sensitivity_level"),
+                # 응답 전에 요청 사용자 기준으로 이름을 마스킹하는 데 사용 (mask_hits)
+                "owner_id": a.get("owner_id"),
+                "requires_permission": a.get("requires_permission"),
+            }
+            doc.asset_terms = _asset_terms(a)
+            self._post(a["id"], doc.asset_terms, +1)
+
+    def remove_asset(self, asset_id: str):
+        with self._lock:
+            doc = self._docs.pop(asset_id, None)
+            if doc is None:
+                return
+            if doc.meta:
+                self._assets -= 1
+            self._post(asset_id, doc.asset_terms, -1)
+            for col_id, terms in doc.columns.items():
+                self._post(asset_id, terms, -1)
+                self._column_owner.pop(col_id, None)
+
+    def upsert_column(self, c: dict):
+        with self._lock:
+            self.remove_column(c["id"])
+            doc = self._docs.get(c["asset_id"])
+            if doc is None:
+                # 자산보다 컬럼이 먼저 들어온 경우 메타 없이 문서를 만들어 둔다
+                doc = self._docs[c["asset_id"]] = _Doc()
+            terms = _column_terms(c)
+            doc.columns[c["id"]] = terms
+            self._column_owner[c["id"]] = c["asset_id"]
+            self._post(c["asset_id"], terms, +1)
+
+    def replace_columns(self, asset_id: str, columns: Iterable[dict]):
+        # 벌크 적재처럼 ORM 이벤트를 거치지 않는 경로에서 자산의 컬럼 전체를 교체
+        with self._lock:
+            doc = self._docs.get(asset_id)
+            if doc is not None:
+                for col_id in list(doc.columns):
+                    self.remove_column(col_id)
+            for c in columns:
+                self.upsert_column(c)
+
+    def remove_column(self, column_id: str):
+        with self._lock:
+            asset_id = self._column_owner.pop(column_id, None)
+            if asset_id is None:
+                return
+            doc = self._docs.get(asset_id)
+            if doc is not None:
+                self._post(asset_id, doc.columns.pop(column_id, {}), -1)
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._vocab.clear()
+            self._docs.clear()
+            self._column_owner.clear()
+            self._assets = 0
+            self.loaded = False
+            self._watermark = self._deleted_mark = self._token = None
+            self._generation += 1
+
+    def rebuild(self, db: Session, batch_size: int = 5000):
+        # 새 구조에 전부 적재한 뒤 잠금 안에서 교체하므로 구성 중에도 증분 반영/검색이 막히지 않음
+        token = response_cache.version_token(CACHE_NAMESPACES)
+        generation = self._generation
+        fresh = CatalogSearchIndex()
+        # 삭제 기록의 기준점을 먼저 읽음 (자산을 읽는 사이에 지워진 행은 다음 변경분 반영의 겹침 구간에서 제거)
+        deleted_mark = db.execute(select(func.max(_tombstones.c.deleted_at))).scalar()
+        watermark = None
+        for row in db.execute(select(*_ASSET_COLS).execution_options(yield_per=batch_size)):
+            fresh.upsert_asset(row._asdict())
+            if row.updated_at is not None and (watermark is None or row.updated_at > watermark):
+                watermark = row.updated_at
+        for row in db.execute(select(*_COLUMN_COLS).execution_options(yield_per=batch_size)):
+            fresh.upsert_column(row._asdict())
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._postings, self._vocab = fresh._postings, fresh._vocab
+            self._docs, self._column_owner, self._assets = fresh._docs, fresh._column_owner, fresh._assets
+            self._watermark, self._deleted_mark = watermark, deleted_mark
+            # 구성 전에 읽은 워터마크: 구성 중에 들어온 쓰기는 다음 조회의 변경분 반영에서 따라잡음
+            self._token = token
+            self.loaded = True
+        self.rebuilds += 1
+        return True
+
+    def _build(self):
+        try:
+            db = SessionLocal()
+            try:
+                self.rebuild(db)
+            finally:
+                db.close()
+        except Exception:
+            logger.exception("search index build failed")
+        finally:
+            self._building = False
+
+    @property
+    def building(self) -> bool:
+        return self._building
+
+    def start_rebuild(self):
+        # 전체 구성은 작업 스레드에서 (이벤트 루프를 막지 않음). 이미 진행 중이면 무시
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        threading.Thread(target=call_sync, args=(self._build,), name="axd-search-build", daemon=True).start()
+
+    async def ensure_fresh(self, engine) -> bool:
+        # 검색 전에 호출. 색인을 쓸 수 있으면 True, 구성 중이면 False (호출자는 SQL 로 검색)
+        if not self.loaded:
+            self.start_rebuild()
+            return False
+        token = response_cache.version_token(CACHE_NAMESPACES)
+        if token == self._token:
+            return True
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if self.loaded and token != self._token:
+                # 읽기 레플리카의 복제 지연에 영향받지 않도록 항상 primary 에서 읽음
+                async with engine.connect() as conn:
+                    await conn.run_sync(self.refresh, token)
+        if not self.loaded:
+            self.start_rebuild()
+        return self.loaded
+
+    def refresh(self, db, token: str, chunk_size: int = 500):
+        # 다른 워커의 쓰기 반영: updated_at 워터마크 이후 바뀐 자산과 그 컬럼, 삭제 기록만 읽음
+        # (크롤러/적재 경로는 컬럼이 바뀌면 자산 updated_at 도 갱신함)
+        generation = self._generation
+        query = select(*_ASSET_COLS)
+        if self._watermark is not None:
+            query = query.where(DataAsset.updated_at >= self._watermark - self.overlap)
+        tomb_query = select(_tombstones.c.asset_id, _tombstones.c.deleted_at)
+        since = self._deleted_mark or self._watermark
+        if since is not None:
+            tomb_query = tomb_query.where(_tombstones.c.deleted_at >= since - self.overlap)
+        deleted = db.execute(tomb_query).all()
+        changed = [row._asdict() for row in db.execute(query)]
+        columns: Dict[str, List[dict]] = {a["id"]: [] for a in changed}
+        ids = list(columns)
+        for start in range(0, len(ids), chunk_size):
+            for row in db.execute(select(*_COLUMN_COLS).where(AssetColumn.asset_id.in_(ids[start:start + chunk_size]))):
+                columns[row.asset_id].append(row._asdict())
+        count = db.execute(select(func.count()).select_from(DataAsset)).scalar()
+
+        with self._lock:
+            if generation != self._generation or not self.loaded:
+                return
+            for a in changed:
+                self.upsert_asset(a)
+                self.replace_columns(a["id"], columns[a["id"]])
+                if a["updated_at"] is not None and (self._watermark is None or a["updated_at"] > self._watermark):
+                    self._watermark = a["updated_at"]
+            for d in deleted:
+                self.remove_asset(d.asset_id)
+                if self._deleted_mark is None or d.deleted_at > self._deleted_mark:
+                    self._deleted_mark = d.deleted_at
+            if self._assets != count:
+                # 워터마크 이전 시각으로 들어온 행 등 변경분으로 맞출 수 없으면 다시 구성 (그동안 SQL 검색)
+                self.loaded = False
+                return
+            self._token = token
+        self.refreshes += 1
+
+    # --- 검색 --------------------------------------------------------------
+
+    def _expand(self, term: str, prefix: bool) -> List[Tuple[str, float]]:
+        if not prefix or len(term) < MIN_PREFIX_LEN:
+            return [(term, 1.0)] if term in self._postings else []
+        i = bisect_left(self._vocab, term)
+        end = min(i + MAX_PREFIX_SCAN, len(self._vocab))
+        matches = []
+        while i < end and self._vocab[i].startswith(term):
+            matches.append(self._vocab[i])
+            i += 1
+        if len(matches) > MAX_PREFIX_TERMS:
+            matches = heapq.nsmallest(MAX_PREFIX_TERMS, matches, key=lambda tok: (len(tok), tok))
+        return [(tok, 1.0 if tok == term else PREFIX_PENALTY) for tok in matches]
+
+    def search(
+        self,
+        q: str,
+        *,
+        service_id: Optional[str] = None,
+        sensitivity_level: Optional[str] = None,
+        limit: int = 20,
+        prefix: bool = True,
+    ) -> List[dict]:
+        terms = list(dict.fromkeys(tokenize(q)))
+        if not terms:
+            return []
+        with self._lock:
+            n_docs = max(len(self._docs), 1)
+            per_term: List[Dict[str, float]] = []
+            for term in terms:
+                scores: Dict[str, float] = {}
+                for tok, factor in self._expand(term, prefix):
+                    plist = self._postings[tok]
+                    idf = math.log(1 + n_docs / len(plist))
+                    for asset_id, w in plist.items():
+                        s = w * idf * factor
+                        if s > scores.get(asset_id, 0.0):
+                            scores[asset_id] = s
+                if not scores:
+                    return []
+                per_term.append(scores)
+
+            # 모든 검색어를 포함하는 자산만 (AND), 가장 작은 후보 집합부터 교집합
+            per_term.sort(key=len)
+            candidates = per_term[0]
+            totals = {}
+            for asset_id, s in candidates.items():
+                doc = self._docs.get(asset_id)
+                if doc is None or not doc.meta:
+                    continue
+                if service_id and doc.meta["service_id"] != service_id:
+                    continue
+                if sensitivity_level and doc.meta["sensitivity_level"] != sensitivity_level:
+                    continue
+                total = s
+                for other in per_term[1:]:
+                    if asset_id not in other:
+                        break
+                    total += other[asset_id]
+                else:
+                    totals[asset_id] = total
+
+            top = heapq.nlargest(limit, totals.items(), key=lambda kv: kv[1])
+            return [{**self._docs[aid].meta, "score": round(score, 4)} for aid, score in top]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "building": self._building,
+                "rebuilds": self.rebuilds,
+                "refreshes": self.refreshes,
+                "assets": self._assets,
+                "columns": len(self._column_owner),
+                "terms": len(self._postings),
+            }
+
+
+search_index = CatalogSearchIndex(settings.CATALOG_SNAPSHOT_OVERLAP_SECONDS)
+
+
+_HIT_FIELDS = ("id", "name", "schema_name", "database_name", "service_id", "sensitivity_level",
+               "owner_id", "requires_permission")
+
+
+def _like(term: str) -> str:
+    # 토큰은 \w+ 이므로 LIKE 와일드카드 중 '_' 만 이스케이프
+    return "%" + term.replace("_", "\\_") + "%"
+
+
+def sql_search(
+    db: Session,
+    q: str,
+    *,
+    service_id: Optional[str] = None,
+    sensitivity_level: Optional[str] = None,
+    limit: int = 20,
+    prefix: bool = True,
+) -> List[dict]:
+    # 색인이 준비되기 전 임시 경로: 모든 검색어를 포함하는 자산을 LIKE 로 찾고 자산 필드 가중치로 근사 점수
+    # (후보는 부분 문자열 일치로 찾고, 점수는 prefix 설정에 맞춰 자산 필드 토큰으로 계산. 컬럼은 포함 여부만 확인)
+    terms = list(dict.fromkeys(tokenize(q)))
+    if not terms:
+        return []
+    query = select(*_ASSET_COLS)
+    for term in terms:
+        pattern = _like(term)
+        query = query.where(or_(
+            DataAsset.name.ilike(pattern, escape="\\"),
+            DataAsset.description.ilike(pattern, escape="\\"),
+            DataAsset.business_definition.ilike(pattern, escape="\\"),
+            cast(DataAsset.tags, Text).ilike(pattern, escape="\\"),
+            exists().where(and_(AssetColumn.asset_id == DataAsset.id, or_(
+                AssetColumn.column_name.ilike(pattern, escape="\\"),
+                AssetColumn.description.ilike(pattern, escape="\\"),
+            ))),
+        ))
+    if service_id:
+        query = query.where(DataAsset.service_id == service_id)
+    if sensitivity_level:
+        query = query.where(DataAsset.sensitivity_level == sensitivity_level)
+    # 이름에 첫 검색어가 들어간 자산을 먼저 가져와 후보를 제한
+    query = query.order_by(DataAsset.name.ilike(_like(terms[0]), escape="\\").desc(), DataAsset.id).limit(limit * 5)
+
+    hits = []
+    for row in db.execute(query):
+        a = row._asdict()
+        weights = _asset_terms(a)
+        score = 0.0
+        for term in terms:
+            score += max((w * (1.0 if tok == term else PREFIX_PENALTY)
+                          for tok, w in weights.items() if tok == term or (prefix and tok.startswith(term))), default=FIELD_WEIGHTS["column_name"])
+        hits.append(({f: a[f] for f in _HIT_FIELDS}, score))
+    top = heapq.nlargest(limit, hits, key=lambda h: h[1])
+    return [{**meta, "score": round(score, 4)} for meta, score in top]
+
+
+# --- 쓰기 시점 증분 갱신 -------------------------------------------------------
+# flush 시점에 변경분을 session.info 에 모아두고, commit 이 성공한 경우에만 색인에 반영
+
+_ASSET_FIELDS = ("id", "name", "description", "business_definition", "tags",
+                 "schema_name", "database_name", "service_id", "sensitivity_level", "owner_id", "requires_permission")
+_COLUMN_FIELDS = ("id", "asset_id", "column_name", "description")
+_PENDING_KEY = "search_index_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    if not search_index.loaded:
+        return
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, DataAsset):
+            pending.append(("asset", {f: getattr(obj, f) for f in _ASSET_FIELDS}))
+        elif isinstance(obj, AssetColumn):
+            pending.append(("column", {f: getattr(obj, f) for f in _COLUMN_FIELDS}))
+    for obj in session.deleted:
+        if isinstance(obj, DataAsset):
+            pending.append(("del_asset", obj.id))
+        elif isinstance(obj, AssetColumn):
+            pending.append(("del_column", obj.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for kind, payload in pending:
+        if kind == "asset":
+            search_index.upsert_asset(payload)
+        elif kind == "column":
+            search_index.upsert_column(payload)
+        elif kind == "del_asset":
+            search_index.remove_asset(payload)
+        else:
+            search_index.remove_column(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_PENDING_KEY, None)
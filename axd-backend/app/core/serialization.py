@@ -0,0 +1,42 @@
+from decimal import Decimal
+from typing import Any, Iterable, List, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    # orjson 이 직접 처리하지 못하는 타입만 변환 (결과는 jsonable_encoder 와 같게 맞춤)
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    table = getattr(obj, "__table__", None)
+    if table is not None:
+        # ORM 객체는 컬럼 값만 (관계 속성 제외)
+        return {c.key: getattr(obj, c.key) for c in table.columns}
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    # 엔드포인트가 이미 dict/list 로 만든 결과를 검증/jsonable_encoder 없이 바로 직렬화
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def row_dicts(keys: Sequence[str], rows: Iterable[tuple]) -> List[dict]:
+    # SELECT 한 컬럼 튜플을 그대로 dict 로 (ORM 객체 생성 없음)
+    return [dict(zip(keys, r)) for r in rows]
+
+
+def column_keys(model) -> List[str]:
+    return [c.key for c in model.__table__.columns]
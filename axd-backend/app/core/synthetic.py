@@ -0,0 +1,231 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from app.core.facets import normalize_tags
+from app.core.jobs import Job
+from app.core.notifications import add_notifications
+from app.models.all_models import (
+    Service, DataAsset, AssetTag, AssetTombstone, AssetColumn, DataLineage, AssetComment, AssetPermission,
+    PermissionRequest, SampleData, AssetProfile, Notification, CrawlState,
+)
+from app.schemas.system import SyntheticCatalogConfig
+
+# 생성 결과가 실행 시각에 좌우되지 않도록 고정된 기준 시각을 사용
+BASE_TIME = datetime(2025, 1, 1)
+
+_DOMAINS = ["sales", "hr", "finance", "marketing", "product", "logs", "billing", "crm", "ops", "risk"]
+_NOUNS = ["orders", "customers", "events", "payments", "sessions", "invoices", "employees", "accounts",
+          "metrics", "transactions", "shipments", "reviews", "campaigns", "tickets", "inventory"]
+_SUFFIXES = ["", "_daily", "_hourly", "_snapshot", "_agg", "_raw", "_stg", "_hist"]
+_COLUMN_TYPES = [("id", "int"), ("name", "varchar"), ("status", "varchar"), ("amount", "decimal"),
+                 ("count", "int"), ("code", "varchar"), ("flag", "boolean"), ("note", "text"),
+                 ("created_at", "datetime"), ("updated_at", "datetime"), ("event_date", "date")]
+_TAGS = ["pii", "gold", "silver", "bronze", "finance", "core", "deprecated", "realtime", "batch", "kpi"]
+_TRANSFORMS = ["ETL", "ELT", "CDC", "VIEW", "AGGREGATION"]
+_LEVELS = ["viewer", "developer", "owner"]
+_PURPOSES = ["analysis", "reporting", "development", "other"]
+_DURATIONS = ["1month", "3months", "6months", "permanent"]
+
+_CLEAR_ORDER = [Notification, AssetProfile, SampleData, AssetComment, AssetPermission, PermissionRequest,
+                DataLineage, AssetColumn, AssetTag, AssetTombstone, DataAsset, Service]
+
+
+class _Gen:
+    def __init__(self, cfg: SyntheticCatalogConfig):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.seed)
+        levels = list(cfg.sensitivity_weights)
+        self._levels = levels
+        self._level_weights = [cfg.sensitivity_weights[k] for k in levels]
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def poisson_like(self, mean: float) -> int:
+        # 평균 근처로 흩어지는 정수 (0 ~ 2*mean)
+        if mean <= 0:
+            return 0
+        return int(self.rng.uniform(0, 2 * mean) + 0.5)
+
+    def time(self, days: int = 365) -> datetime:
+        return BASE_TIME - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def sensitivity(self) -> str:
+        return self.rng.choices(self._levels, weights=self._level_weights)[0]
+
+    def sample_value(self, data_type: str, i: int):
+        r = self.rng
+        if r.random() < 0.05:
+            return None
+        if data_type == "int":
+            return r.randrange(1_000_000)
+        if data_type == "decimal":
+            return round(r.uniform(0, 10_000), 2)
+        if data_type == "boolean":
+            return r.random() < 0.5
+        if data_type in ("datetime", "date"):
+            value = self.time()
+            return value.date().isoformat() if data_type == "date" else value.isoformat(sep=" ")
+        return f"{data_type}_{i}_{r.randrange(1000)}"
+
+
+def clear_catalog(db: Session):
+    # 자기참조 FK 때문에 댓글의 parent_id 를 먼저 끊고 삭제
+    db.execute(update(AssetComment).values(parent_id=None))
+    for model in _CLEAR_ORDER:
+        db.execute(delete(model))
+    # 카탈로그를 비우면 메타데이터 수집 지문도 무효 (다음 수집에서 전체 재반영)
+    db.execute(delete(CrawlState))
+    db.commit()
+
+
+def seed_synthetic_catalog(db: Session, cfg: SyntheticCatalogConfig, job: Optional[Job] = None) -> dict:
+    g = _Gen(cfg)
+    rng = g.rng
+    counts: Dict[str, int] = {t.__tablename__: 0 for t in _CLEAR_ORDER}
+
+    def write(model, rows: List[dict]):
+        if rows:
+            db.execute(model.__table__.insert(), rows)
+            counts[model.__tablename__] += len(rows)
+
+    if cfg.reset:
+        clear_catalog(db)
+
+    services = []
+    for i in range(cfg.services):
+        services.append({
+            "id": g.uuid(), "name": f"service_{i}", "description": f"synthetic service {i}",
+            "icon": "database", "color": rng.choice(["blue", "emerald", "orange", "purple"]),
+            "created_at": g.time(),
+        })
+    write(Service, services)
+    db.commit()
+
+    users = [(f"user-{i:06d}", f"User {i}", f"user{i}@example.com") for i in range(cfg.users)]
+    asset_ids: List[str] = []
+    col_lo, col_hi = sorted((cfg.columns_min, cfg.columns_max))
+
+    for start in range(0, cfg.assets, cfg.batch_size):
+        assets, columns, lineage, comments, grants, requests, samples, notifications = [], [], [], [], [], [], [], []
+        for i in range(start, min(start + cfg.batch_size, cfg.assets)):
+            svc_idx = rng.randrange(cfg.services)
+            svc = services[svc_idx]
+            domain = rng.choice(_DOMAINS)
+            level = g.sensitivity()
+            asset_id = g.uuid()
+            owner = rng.choice(users)
+            created = g.time()
+            name = f"{domain}_{rng.choice(_NOUNS)}{rng.choice(_SUFFIXES)}_{i}"
+            assets.append({
+                "id": asset_id, "name": name,
+                "description": f"{domain} {name} synthetic table",
+                "schema_name": f"{domain}_s{rng.randrange(cfg.schemas_per_database)}",
+                "database_name": f"svc{svc_idx}_db{rng.randrange(cfg.databases_per_service)}",
+                "service_id": svc["id"], "owner_id": owner[0], "owner_name": owner[1], "owner_email": owner[2],
+                "tags": rng.sample(_TAGS, rng.randrange(4)), "business_definition": f"{name} 비즈니스 정의",
+                "doc_links": [], "sensitivity_level": level, "requires_permission": level != "public",
+                "created_at": created, "updated_at": created + timedelta(days=rng.randrange(30)),
+            })
+
+            col_defs = []
+            for pos in range(1, rng.randint(col_lo, col_hi) + 1):
+                if pos <= len(_COLUMN_TYPES):
+                    col_name, dtype = _COLUMN_TYPES[pos - 1]
+                else:
+                    base, dtype = rng.choice(_COLUMN_TYPES)
+                    col_name = f"{base}_{pos}"
+                col_defs.append((col_name, dtype))
+                columns.append({
+                    "id": g.uuid(), "asset_id": asset_id, "column_name": col_name, "data_type": dtype,
+                    "description": f"{col_name} 컬럼", "is_nullable": pos != 1, "ordinal_position": pos,
+                })
+
+            # 항상 더 앞선 자산에서 뒤 자산으로만 엣지를 만들어 순환이 없도록 한다
+            if asset_ids:
+                window = asset_ids[-cfg.lineage_window:]
+                for src_idx in {rng.randrange(len(window)) for _ in range(g.poisson_like(cfg.lineage_fanout))}:
+                    lineage.append({
+                        "id": g.uuid(), "source_asset_id": window[src_idx], "target_asset_id": asset_id,
+                        "transformation_type": rng.choice(_TRANSFORMS), "etl_logic_summary": "",
+                        "source_name": "", "target_name": name, "source_type": "table", "target_type": "table",
+                    })
+            asset_ids.append(asset_id)
+
+            thread: List[str] = []
+            for _ in range(g.poisson_like(cfg.comments_per_asset)):
+                user = rng.choice(users)
+                parent = rng.choice(thread) if thread and rng.random() < cfg.reply_ratio else None
+                comment_id = g.uuid()
+                comments.append({
+                    "id": comment_id, "asset_id": asset_id, "user_id": user[0], "user_name": user[1],
+                    "content": f"{name} 관련 질문/답변", "parent_id": parent, "is_answer": parent is not None,
+                    "created_at": g.time(90),
+                })
+                thread.append(comment_id)
+
+            if level != "public":
+                for _ in range(g.poisson_like(cfg.grants_per_protected_asset)):
+                    user = rng.choice(users)
+                    granted = g.time(180)
+                    expires = granted + timedelta(days=rng.choice([30, 90, 180])) if rng.random() < 0.7 else None
+                    grants.append({
+                        "id": g.uuid(), "asset_id": asset_id, "user_id": user[0], "user_name": user[1],
+                        "user_email": user[2], "permission_level": rng.choice(_LEVELS), "granted_by": owner[0],
+                        "granted_by_name": owner[1], "granted_at": granted, "expires_at": expires,
+                        "revoked_at": granted + timedelta(days=7) if rng.random() < 0.05 else None,
+                        "revoked_by": None,
+                    })
+
+            for _ in range(g.poisson_like(cfg.requests_per_asset)):
+                user = rng.choice(users)
+                created_req = g.time(60)
+                requests.append({
+                    "id": g.uuid(), "asset_id": asset_id, "requester_id": user[0], "requester_name": user[1],
+                    "requester_email": user[2], "requested_level": rng.choice(_LEVELS),
+                    "purpose_category": rng.choice(_PURPOSES), "reason": "synthetic request",
+                    "duration": rng.choice(_DURATIONS),
+                    "status": rng.choices(["pending", "approved", "rejected"], weights=[5, 3, 2])[0],
+                    "created_at": created_req, "updated_at": created_req,
+                })
+                # 요청마다 소유자 알림 (난수를 쓰지 않아 기존 seed 의 생성 결과는 그대로 유지)
+                notifications.append({
+                    "id": str(uuid.uuid5(uuid.NAMESPACE_OID, requests[-1]["id"])), "user_id": owner[0],
+                    "type": "permission_request",
+                    "title": f"{user[1]} 님의 {name} 권한 요청", "message": "synthetic request",
+                    "link": f"/assets/{asset_id}", "is_read": requests[-1]["status"] != "pending",
+                    "created_at": created_req,
+                })
+
+            for r in range(cfg.sample_rows):
+                samples.append({
+                    "id": g.uuid(), "asset_id": asset_id,
+                    "row_data": {c: g.sample_value(t, r) for c, t in col_defs},
+                    "created_at": BASE_TIME,
+                })
+
+        # FK 순서대로 기록 후 배치 단위 커밋
+        write(DataAsset, assets)
+        write(AssetTag, [{"asset_id": a["id"], "tag": t} for a in assets for t in normalize_tags(a["tags"])])
+        write(AssetColumn, columns)
+        write(DataLineage, lineage)
+        write(AssetComment, comments)
+        write(AssetPermission, grants)
+        write(PermissionRequest, requests)
+        write(SampleData, samples)
+        if notifications:
+            # 재연결 커서(seq)는 생성 시각 순으로, 커밋 직전에 매겨 INSERT
+            notifications.sort(key=lambda n: (n["created_at"], n["id"]))
+            add_notifications(db, notifications)
+            counts[Notification.__tablename__] += len(notifications)
+        db.commit()
+
+        if job is not None:
+            job.update(assets_done=len(asset_ids), assets_total=cfg.assets, rows=dict(counts))
+
+    return counts
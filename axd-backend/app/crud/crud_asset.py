@@ -1,13 +1,82 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from app.models import DataAsset
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
+
+# fields= 로 요청 가능한 컬럼 목록
+ASSET_FIELDS = tuple(c.key for c in DataAsset.__table__.columns)
+# 커서 생성과 마스킹 판단에 항상 필요한 컬럼
+_REQUIRED_FIELDS = ("id", "updated_at", "requires_permission", "owner_id")
+
+
+def encode_cursor(updated_at: Optional[datetime], id: str) -> str:
+    payload = json.dumps([updated_at.isoformat() if updated_at else None, id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(updated_at) if updated_at else None), str(id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
 
 class CRUDAsset:
-    def get_multi(self, db: Session, *, service_id: Optional[str] = None) -> List[DataAsset]:
-        query = db.query(DataAsset)
+    @staticmethod
+    def check_fields(fields: Optional[Sequence[str]]):
+        unknown = [f for f in fields or () if f not in ASSET_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        service_id: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        # (updated_at, id) 내림차순 keyset 페이지네이션
+        # fields 가 주어지면 해당 컬럼만 SELECT 한 Row 를, 아니면 DataAsset 객체를 반환
+        if fields:
+            self.check_fields(fields)
+            selected = list(dict.fromkeys([*_REQUIRED_FIELDS, *fields]))
+            query = db.query(*[getattr(DataAsset, f) for f in selected])
+        else:
+            query = db.query(DataAsset)
+
         if service_id:
             query = query.filter(DataAsset.service_id == service_id)
-        return query.all()
+
+        if cursor:
+            updated_at, last_id = decode_cursor(cursor)
+            if updated_at is None:
+                query = query.filter(DataAsset.updated_at.is_(None), DataAsset.id < last_id)
+            else:
+                query = query.filter(or_(
+                    DataAsset.updated_at < updated_at,
+                    and_(DataAsset.updated_at == updated_at, DataAsset.id < last_id),
+                    DataAsset.updated_at.is_(None),
+                ))
+
+        rows = (
+            query.order_by(DataAsset.updated_at.desc(), DataAsset.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.updated_at, last.id)
+        return rows, next_cursor
 
     def get(self, db: Session, id: str) -> Optional[DataAsset]:
         return db.query(DataAsset).filter(DataAsset.id == id).first()
@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.crud_asset import decode_cursor, encode_cursor
+from app.models import AssetComment
+
+_COLUMNS = tuple(AssetComment.__table__.columns)
+
+
+def _sort_key(created_at: Optional[datetime], id: str) -> Tuple[datetime, str]:
+    # created_at 이 없는 댓글은 가장 오래된 것으로 취급
+    if created_at is None:
+        return datetime.min, id
+    return created_at.replace(tzinfo=None), id
+
+
+class CRUDComment:
+    def get_threads(
+        self,
+        db: Session,
+        *,
+        asset_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str], int]:
+        # 자산의 댓글 전체를 쿼리 한 번으로 읽고 parent_id 로 트리를 선형 시간에 구성
+        # 최상위 스레드 기준 최신순 페이지네이션 (cursor: 이전 페이지의 마지막 스레드, since: 이보다 새 스레드만)
+        before = _sort_key(*decode_cursor(cursor)) if cursor else None
+        after = _sort_key(*decode_cursor(since)) if since else None
+
+        rows = db.execute(
+            select(*_COLUMNS).where(AssetComment.asset_id == asset_id)
+            .order_by(AssetComment.created_at, AssetComment.id)
+        ).all()
+
+        nodes: Dict[str, dict] = {}
+        for row in rows:
+            node = dict(row._mapping)
+            node["replies"] = []
+            nodes[node["id"]] = node
+
+        roots = []
+        for node in nodes.values():
+            parent = nodes.get(node["parent_id"]) if node["parent_id"] else None
+            # 부모가 없거나 다른 자산의 댓글을 가리키면 최상위 스레드로 취급
+            if parent is None or parent is node:
+                roots.append(node)
+            else:
+                parent["replies"].append(node)
+
+        # 최상위 스레드는 최신순, 답글은 작성순 (조회 순서가 이미 작성순이므로 그대로 유지)
+        roots.sort(key=lambda n: _sort_key(n["created_at"], n["id"]), reverse=True)
+        total = len(roots)
+        if after is not None:
+            roots = [n for n in roots if _sort_key(n["created_at"], n["id"]) > after]
+        if before is not None:
+            roots = [n for n in roots if _sort_key(n["created_at"], n["id"]) < before]
+
+        page = roots[:limit]
+        for root in page:
+            root["reply_count"] = self._count_replies(root)
+        next_cursor = None
+        if len(roots) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+        return page, next_cursor, total
+
+    @staticmethod
+    def _count_replies(root: dict) -> int:
+        # 재귀 대신 스택으로 순회 (깊은 답글 체인에서도 재귀 한도에 걸리지 않음)
+        count, stack = 0, list(root["replies"])
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node["replies"])
+        return count
+
+
+comment = CRUDComment()
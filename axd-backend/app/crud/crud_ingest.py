@@ -0,0 +1,175 @@
+import time
+import uuid
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.catalog_snapshot import catalog_snapshot
+from app.core.facets import sync_tags
+from app.core.lineage_index import lineage_graph
+from app.core.sample_store import sample_store
+from app.core.search_index import search_index
+from app.database import MYSQL_DIALECTS
+from app.models import AssetColumn, DataAsset, SampleData
+from app.schemas.asset import AssetIngest
+
+NaturalKey = Tuple[str, str, str]
+
+# ux_data_assets_natural_key 와 같은 순서
+NATURAL_KEY = ("database_name", "schema_name", "name")
+_ASSET_FIELDS = (
+    "name", "schema_name", "database_name", "description", "service_id", "owner_name", "owner_email",
+    "tags", "business_definition", "doc_links", "sensitivity_level", "requires_permission",
+)
+
+_assets = DataAsset.__table__
+
+
+def _natural_key(a) -> NaturalKey:
+    return (a.database_name, a.schema_name, a.name)
+
+
+def _upsert(dialect: str, fields: Sequence[str]):
+    # 자연키 유니크 인덱스 충돌 시 레코드에 지정된 필드와 updated_at 만 갱신 (새 자산은 전체 필드로 INSERT)
+    # MySQL/MariaDB 는 ON DUPLICATE KEY UPDATE, 그 외(SQLite/PostgreSQL)는 ON CONFLICT DO UPDATE
+    if dialect in MYSQL_DIALECTS:
+        stmt = mysql_insert(_assets)
+        return stmt.on_duplicate_key_update({**{f: stmt.inserted[f] for f in fields}, "updated_at": func.now()})
+    stmt = (postgresql_insert if dialect == "postgresql" else sqlite_insert)(_assets)
+    return stmt.on_conflict_do_update(
+        index_elements=list(NATURAL_KEY),
+        set_={**{f: stmt.excluded[f] for f in fields}, "updated_at": func.now()},
+    )
+
+
+def _select_by_keys(db: Session, keys: List[NaturalKey], *columns) -> list:
+    # 열마다 IN 목록으로 자연키 인덱스를 탐색한 뒤 정확한 키만 남김
+    # (행 값 IN (VALUES ..) 은 SQLite 가 키 수가 많으면 테이블 전체 스캔을 고름)
+    wanted = set(keys)
+    rows = db.execute(
+        select(DataAsset.id, *[getattr(DataAsset, f) for f in NATURAL_KEY], *columns)
+        .where(*[getattr(DataAsset, f).in_({k[i] for k in wanted}) for i, f in enumerate(NATURAL_KEY)])
+    )
+    return [r for r in rows if _natural_key(r) in wanted]
+
+
+class AssetIngestor:
+    # NDJSON 으로 들어오는 자산을 batch_size 단위로 모아 자연키 기준 INSERT .. ON CONFLICT 로 upsert
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = batch_size
+        self._pending: Dict[NaturalKey, AssetIngest] = {}
+        self.batches = 0
+
+    def add(self, record: AssetIngest) -> bool:
+        # 같은 배치 안의 중복 자연키는 마지막 레코드가 우선
+        self._pending[_natural_key(record)] = record
+        return len(self._pending) >= self.batch_size
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def take_batch(self) -> List[AssetIngest]:
+        batch = list(self._pending.values())
+        self._pending = {}
+        return batch
+
+    def write_batch(self, db: Session, batch: List[AssetIngest]) -> dict:
+        started = time.perf_counter()
+        self.batches += 1
+        if not batch:
+            return {"batch": self.batches, "assets": 0, "inserted": 0, "updated": 0,
+                    "columns": 0, "samples": 0, "elapsed_ms": 0.0}
+
+        keys = [_natural_key(a) for a in batch]
+        # 자연키 유니크 인덱스로 찾는 기존 자산 id -> 자연키
+        # (대소문자 무시 collation 에서는 표기만 다른 이름도 같은 자산이므로 upsert 후 이름이 바뀔 수 있음)
+        before = {r.id: _natural_key(r) for r in _select_by_keys(db, keys)}
+
+        # 생략된 필드는 기존 값을 유지하도록 지정된 필드 조합별로 문장을 나눠 executemany
+        groups: Dict[Tuple[str, ...], List[dict]] = {}
+        for a in batch:
+            fields = tuple(f for f in _ASSET_FIELDS if f in a.model_fields_set)
+            row = {f: getattr(a, f) for f in _ASSET_FIELDS}
+            row["id"] = str(uuid.uuid4())
+            groups.setdefault(fields, []).append(row)
+        dialect = db.get_bind().dialect.name
+        for fields, rows in groups.items():
+            db.execute(_upsert(dialect, fields), rows)
+
+        # 실제로 저장된 행 (동시에 같은 자산이 들어온 경우에도 최종 id 와 값을 사용)
+        stored = {_natural_key(r): r._asdict() for r in _select_by_keys(
+            db, keys, *[getattr(DataAsset, f) for f in _ASSET_FIELDS if f not in NATURAL_KEY]
+        )}
+        asset_rows = [stored[k] for k in keys]
+        new_ids = {row["id"] for row in asset_rows if row["id"] not in before}
+        renamed = any(row["id"] in before and before[row["id"]] != k for k, row in zip(keys, asset_rows))
+
+        # 벌크 upsert 는 매퍼 이벤트를 타지 않으므로 태그 색인도 같은 트랜잭션에서 직접 교체
+        sync_tags(db, {row["id"]: row["tags"] for row, a in zip(asset_rows, batch)
+                       if row["id"] in new_ids or "tags" in a.model_fields_set})
+
+        # 컬럼/샘플은 레코드에 포함된 경우에만 자산 단위로 통째 교체
+        column_rows: Dict[str, List[dict]] = {}
+        sample_rows: List[dict] = []
+        replace_columns, replace_samples = [], []
+        for row, a in zip(asset_rows, batch):
+            if a.columns is not None:
+                replace_columns.append(row["id"])
+                column_rows[row["id"]] = [
+                    {
+                        "id": str(uuid.uuid4()), "asset_id": row["id"], "column_name": c.column_name,
+                        "data_type": c.data_type, "description": c.description, "is_nullable": c.is_nullable,
+                        "ordinal_position": c.ordinal_position if c.ordinal_position is not None else i + 1,
+                    }
+                    for i, c in enumerate(a.columns)
+                ]
+            if a.samples is not None:
+                replace_samples.append(row["id"])
+                sample_rows += [
+                    {"id": str(uuid.uuid4()), "asset_id": row["id"], "row_data": s} for s in a.samples
+                ]
+
+        stale_columns = [i for i in replace_columns if i not in new_ids]
+        stale_samples = [i for i in replace_samples if i not in new_ids]
+        if stale_columns:
+            db.execute(delete(AssetColumn).where(AssetColumn.asset_id.in_(stale_columns)))
+        if stale_samples:
+            db.execute(delete(SampleData).where(SampleData.asset_id.in_(stale_samples)))
+
+        flat_columns = [c for cols in column_rows.values() for c in cols]
+        if flat_columns:
+            db.execute(insert(AssetColumn.__table__), flat_columns)
+        if sample_rows:
+            db.execute(insert(SampleData.__table__), sample_rows)
+        db.commit()
+
+        # 벌크 경로는 ORM flush 이벤트를 타지 않으므로 캐시/검색 색인을 직접 갱신
+        response_cache.invalidate(["assets", "columns"])
+        catalog_snapshot.mark_stale()
+        if renamed:
+            # 리니지 노드 이름은 자산 이름에서 가져오므로 이름이 바뀐 경우에만 다시 만듦
+            lineage_graph.invalidate()
+        if stale_samples:
+            sample_store.invalidate(stale_samples)
+        if search_index.loaded:
+            for row in asset_rows:
+                search_index.upsert_asset(row)
+            for asset_id, cols in column_rows.items():
+                search_index.replace_columns(asset_id, cols)
+
+        return {
+            "batch": self.batches,
+            "assets": len(batch),
+            "inserted": len(new_ids),
+            "updated": len(batch) - len(new_ids),
+            "columns": len(flat_columns),
+            "samples": len(sample_rows),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
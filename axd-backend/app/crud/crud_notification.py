@@ -0,0 +1,113 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.crud.crud_asset import decode_cursor, encode_cursor
+from app.models import Notification, NotificationSequence
+
+_counter = NotificationSequence.__table__
+_notifications = Notification.__table__
+
+
+def seed_sequence(conn):
+    # 카운터 행을 기존 알림 seq 최댓값으로 만들어 둠 (마이그레이션에서 한 번).
+    # 이후 예약은 UPDATE 만 하므로 새 DB 의 첫 예약끼리 INSERT 로 경합하지 않음
+    if conn.execute(select(_counter.c.id).where(_counter.c.id == 1)).first() is None:
+        start = conn.execute(select(func.coalesce(func.max(_notifications.c.seq), 0))).scalar()
+        conn.execute(_counter.insert().values(id=1, value=start))
+
+
+def allocate_sequence(conn, n: int) -> int:
+    # seq n 개를 UPDATE 한 번으로 예약하고 첫 번호를 반환. conn 은 Session 또는 Connection.
+    # 카운터 행은 호출한 트랜잭션이 커밋할 때까지 잠기므로 앱에서는 커밋 직전에만 호출
+    # (app/core/notifications.py 의 before_commit) -> 잠금은 짧고 seq 순서는 커밋 순서와 같음
+    result = conn.execute(update(_counter).where(_counter.c.id == 1).values(value=_counter.c.value + n))
+    if result.rowcount == 0:
+        raise RuntimeError("notification_sequence is not seeded; run schema migrations")
+    return conn.execute(select(_counter.c.value).where(_counter.c.id == 1)).scalar() - n + 1
+
+
+def assign_sequence(conn, ids: Sequence[str]) -> Dict[str, int]:
+    # 이미 기록된 알림에 주어진 순서대로 seq 를 매김 (마이그레이션 백필용)
+    if not ids:
+        return {}
+    first = allocate_sequence(conn, len(ids))
+    seqs = {notification_id: first + i for i, notification_id in enumerate(ids)}
+    conn.execute(
+        update(_notifications).where(_notifications.c.id == bindparam("_id")).values(seq=bindparam("_seq")),
+        [{"_id": k, "_seq": v} for k, v in seqs.items()],
+    )
+    return seqs
+
+
+def event_id(n) -> Optional[str]:
+    # SSE 이벤트 id 이자 재연결 시 이어받기 위한 커서 (커밋 순서 seq)
+    return str(n.seq) if n.seq is not None else None
+
+
+def parse_event_id(value: str) -> int:
+    # Last-Event-ID 는 event_id 가 보낸 seq
+    if not value.isdigit():
+        raise ValueError(f"Invalid event id: {value}")
+    return int(value)
+
+
+def to_event(n) -> dict:
+    return {
+        "id": n.id,
+        "event_id": event_id(n),
+        "user_id": n.user_id,
+        "type": n.type,
+        "title": n.title,
+        "message": n.message or "",
+        "link": n.link or "",
+        "is_read": bool(n.is_read),
+        "created_at": n.created_at.isoformat() if n.created_at else None,
+    }
+
+
+class CRUDNotification:
+    def get_multi(
+        self, db: Session, *, user_id: str, limit: int = 50, cursor: Optional[str] = None, unread_only: bool = False
+    ) -> Tuple[List[Notification], Optional[str]]:
+        # 최신순 keyset 페이지네이션
+        query = db.query(Notification).filter(Notification.user_id == user_id)
+        if unread_only:
+            query = query.filter(Notification.is_read.is_(False))
+        if cursor:
+            created_at, id = decode_cursor(cursor)
+            query = query.filter(or_(
+                Notification.created_at < created_at,
+                and_(Notification.created_at == created_at, Notification.id < id),
+            ))
+        rows = query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1).all()
+        next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def since(self, db: Session, *, user_id: str, after: int, limit: int) -> List[Notification]:
+        # Last-Event-ID 이후에 커밋된 알림을 커밋 순으로 (재연결 시 누락분 전달).
+        # created_at 은 커밋 전에 찍히므로 늦게 커밋된 알림을 놓치지 않도록 seq 로 비교
+        return db.query(Notification).filter(
+            Notification.user_id == user_id, Notification.seq > after,
+        ).order_by(Notification.seq).limit(limit).all()
+
+    def count_unread(self, db: Session, user_id: str) -> Tuple[int, Optional[int]]:
+        # 읽지 않은 건수와 그 시점의 가장 최근 알림 seq (이후 도착하는 이벤트만 카운터에 더하기 위함)
+        count = db.scalar(
+            select(func.count()).select_from(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+        )
+        latest = db.scalar(select(func.max(Notification.seq)).where(Notification.user_id == user_id))
+        return count, latest
+
+    def mark_read(self, db: Session, *, user_id: str, ids: Optional[Sequence[str]] = None) -> int:
+        stmt = update(Notification).where(Notification.user_id == user_id, Notification.is_read.is_(False))
+        if ids is not None:
+            stmt = stmt.where(Notification.id.in_(ids))
+        result = db.execute(stmt.values(is_read=True).execution_options(synchronize_session=False))
+        db.commit()
+        return result.rowcount
+
+
+notification = CRUDNotification()
@@ -1,36 +1,261 @@
-import os
-from sqlalchemy import create_engine
+import asyncio
+import queue
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from fastapi import Request
+from greenlet import getcurrent, greenlet
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# docker-compose 내부에서는 'db', 로컬 직접 실행 시에는 'localhost'
-# 13306 포트는 로컬에서 접근할 때용, 3306은 컨테이너끼리 통신할 때용
-DB_HOST = os.getenv("DB_HOST", "db")
-DB_PORT = os.getenv("DB_PORT", "3306")
-DB_USER = os.getenv("MARIADB_USER", "axd_user")
-DB_PASS = os.getenv("MARIADB_PASSWORD", "axd_password")
-DB_NAME = os.getenv("MARIADB_DATABASE", "axd_db")
-
-# 우선순위: 환경변수 DATABASE_URL > 조합된 URL
-SQLALCHEMY_DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
-    f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-)
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import settings
+from app.core.replicas import create_replica_pool
+
+# 동기 드라이버 -> 비동기 드라이버 매핑 (MariaDB: aiomysql, 로컬 SQLite: aiosqlite)
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mariadb+pymysql": "mariadb+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+# mariadb+ URL 은 dialect 이름이 "mariadb" 라 MySQL 전용 구문(ON DUPLICATE KEY 등) 분기 시 함께 확인
+MYSQL_DIALECTS = ("mysql", "mariadb")
+
+def to_async_url(url: str) -> URL:
+    u = make_url(url)
+    return u.set(drivername=_ASYNC_DRIVERS.get(u.drivername, u.drivername))
+
+def create_db_engine(url: str, *, is_async: bool = False):
+    # 모든 엔진 생성은 이 팩토리를 거치도록 하여 프로세스당 드라이버별 풀 하나만 사용
+    kwargs = {"pool_pre_ping": True, "echo": settings.DB_ECHO}
+    if make_url(url).get_backend_name() == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if is_async:
+        return create_async_engine(to_async_url(url), **kwargs)
+    return create_engine(url, **kwargs)
+
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+# URL 당 엔진(풀)은 하나. API 요청은 비동기 엔진을, 백그라운드 작업/스크립트의 동기 코드는 같은 풀의
+# sync_engine 을 call_sync 로 사용 (동기 엔진을 따로 만들면 커넥션 풀이 두 벌이 됨)
+async_engine = create_db_engine(SQLALCHEMY_DATABASE_URL, is_async=True)
+engine = async_engine.sync_engine
+
+_T = TypeVar("_T")
+_app_loop: Optional[asyncio.AbstractEventLoop] = None
+_fallback_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+class _BridgeGreenlet(greenlet):
+    # SQLAlchemy 의 await_ 는 이 표시가 있는 greenlet 에서 드라이버 코루틴을 부모로 넘김 (greenlet_spawn 과 같은 방식)
+    __sqlalchemy_greenlet_provider__ = True
+
+def bind_loop(loop: Optional[asyncio.AbstractEventLoop]):
+    # 앱 기동 시 이벤트 루프를 등록하면 작업 스레드의 드라이버 I/O 가 요청과 같은 루프(같은 풀)에서 실행됨
+    global _app_loop
+    _app_loop = loop
+
+def _driver_loop() -> asyncio.AbstractEventLoop:
+    # 앱 루프가 없으면(스크립트/벤치마크) 프로세스에 하나뿐인 데몬 루프 스레드를 띄워 사용
+    global _fallback_loop
+    if _app_loop is not None and _app_loop.is_running():
+        return _app_loop
+    with _loop_lock:
+        if _fallback_loop is None:
+            _fallback_loop = asyncio.new_event_loop()
+            threading.Thread(target=_fallback_loop.run_forever, name="axd-db-loop", daemon=True).start()
+    return _fallback_loop
+
+async def _await(awaitable):
+    return await awaitable
+
+def call_sync(fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    # 작업 스레드/스크립트의 동기 DB 코드(SessionLocal, engine)를 비동기 엔진의 풀로 실행.
+    # fn 은 호출한 스레드에서 그대로 돌고 드라이버 I/O 만 이벤트 루프에서 기다리므로 긴 작업도 루프를 막지 않음
+    # (이벤트 루프 스레드에서는 AsyncSession.run_sync 사용)
+    if getattr(getcurrent(), "__sqlalchemy_greenlet_provider__", False):
+        return fn(*args, **kwargs)
+    loop = _driver_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("call_sync would block the event loop; use AsyncSession.run_sync instead")
+    child = _BridgeGreenlet(fn, getcurrent())
+    result = child.switch(*args, **kwargs)
+    while not child.dead:
+        try:
+            value = asyncio.run_coroutine_threadsafe(_await(result), loop).result()
+        except BaseException as e:
+            result = child.throw(e)
+        else:
+            result = child.switch(value)
+    return result
+
+_DONE = object()
+
+def iterate_sync(factory: Callable[..., Iterable[_T]], *args: Any, maxsize: int = 4, **kwargs: Any) -> Iterator[_T]:
+    # 동기 제너레이터를 전용 스레드 하나에서 call_sync 로 돌리고 결과를 넘겨받음
+    # (greenlet 은 스레드에 묶이므로 StreamingResponse 처럼 매번 다른 스레드에서 next() 하는 소비자용)
+    items: "queue.Queue" = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(factory(*args, **kwargs))
+        try:
+            for item in iterator:
+                if not put(item):
+                    break
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True
+    def run():
+        try:
+            call_sync(produce)
+        except BaseException as e:
+            put((_DONE, e))
+        else:
+            put((_DONE, None))
+
+    threading.Thread(target=run, name="axd-db-iter", daemon=True).start()
+    try:
+        while True:
+            item = items.get()
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is _DONE:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
+    finally:
+        stop.set()
+
+# 읽기 레플리카 풀 (DB_REPLICA_URLS 미지정 시 비어 있고 모든 세션이 primary 사용)
+replica_pool = create_replica_pool(settings.DB_REPLICA_URLS, create_db_engine)
+
+class RoutingSession(Session):
+    # 레플리카가 지정된 세션도 flush/INSERT/UPDATE/DELETE 는 primary 로 보내고,
+    # 한 번 쓰기가 일어나면 이후 조회도 primary 에서 읽어 자기 쓰기가 보이도록 함
+    # bind 를 명시한 조회(bind_arguments={"bind": ...})는 그대로 사용 (primary 고정 조회용)
+    def get_bind(self, mapper=None, *, clause=None, bind=None, **kw):
+        if bind is not None:
+            return bind
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["replica_bind"] = None
+            self.info["wrote"] = True
+        replica_bind = self.info.get("replica_bind")
+        if replica_bind is not None:
+            return replica_bind
+        return super().get_bind(mapper, clause=clause, **kw)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False, sync_session_class=RoutingSession
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+# 요청 단위 라우팅 기록 (ReplicaRetryMiddleware 가 요청마다 새 dict 를 넣고 세션 생성 시 채움)
+_routing: ContextVar[Optional[dict]] = ContextVar("axd_replica_routing", default=None)
+
+def served_by_replica() -> bool:
+    # 현재 요청의 세션 중 하나라도 레플리카로 보내졌는지 (응답 캐시가 복제 지연된 본문을 저장하지 않도록)
+    routing = _routing.get()
+    return bool(routing and routing.get("replica"))
+
+def _client_key(request: Request) -> str:
+    return request.headers.get("x-user-id") or (request.client.host if request.client else "")
+
+def _session_info(request: Request) -> dict:
+    # 조회 요청만 레플리카로. 쓰기 직후의 같은 클라이언트와 X-Consistency: strong 요청은 primary
+    client = _client_key(request)
+    info = {"client": client}
+    if (
+        replica_pool.enabled
+        and request.method in ("GET", "HEAD")
+        and request.headers.get("x-consistency") != "strong"
+        and not replica_pool.recently_wrote(client)
+    ):
+        replica = replica_pool.choose()
+        if replica is not None:
+            info["replica_bind"] = replica.async_engine.sync_engine
+            replica_pool.record_route(replica.name)
+            routing = _routing.get()
+            if routing is not None:
+                routing["replica"] = replica.name
+            return info
+    if replica_pool.enabled:
+        replica_pool.record_route("primary")
+    return info
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal(info=_session_info(request)) as db:
         yield db
-    finally:
-        db.close()
+
+@event.listens_for(RoutingSession, "after_commit")
+def _note_write(session):
+    # primary 에 쓴 클라이언트는 잠시 레플리카 대신 primary 에서 읽음 (read-your-writes)
+    if session.info.pop("wrote", False):
+        replica_pool.note_write(session.info.get("client"))
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_write(session):
+    session.info.pop("wrote", None)
+
+class ReplicaRetryMiddleware:
+    # 순수 ASGI 미들웨어. 레플리카로 보낸 조회 요청이 응답을 시작하기 전에 연결 오류로 실패하면
+    # (레플리카는 handle_error 에서 바로 제외됨) X-Consistency: strong 으로 primary 에서 한 번만 다시 실행
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        routing: dict = {}
+        started = False
+
+        async def send_wrapper(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        token = _routing.set(routing)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except DBAPIError as e:
+            if started or not routing.get("replica") or not (
+                isinstance(e, OperationalError) or e.connection_invalidated
+            ):
+                raise
+            replica_pool.record_retry(routing["replica"])
+            headers = [(k, v) for k, v in scope["headers"] if k != b"x-consistency"]
+            await self.app({**scope, "headers": [*headers, (b"x-consistency", b"strong")]}, receive, send)
+        finally:
+            _routing.reset(token)
@@ -1,20 +1,2 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
-
-# SQLite를 위한 추가 설정 (connect_args)
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL, connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+# 엔진/세션은 app.database 의 팩토리 하나로 통합됨 (하위 호환용 re-export)
+from app.database import engine, async_engine, SessionLocal, AsyncSessionLocal, get_async_db  # noqa: F401
@@ -1,15 +1,67 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.v1.api import api_router
+from app.core.catalog_snapshot import catalog_snapshot
 from app.core.config import settings
-from app.database import Base, engine
+from app.core.crawler import schedule_crawls
+from app.core.grants import grant_sweeper
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.migrations import run_migrations
+from app.core.serialization import FastJSONResponse
+from app.database import Base, ReplicaRetryMiddleware, async_engine, bind_loop, replica_pool
+from contextlib import asynccontextmanager
+import asyncio
 
-# DB 테이블 생성 (Production에서는 Alembic 권장)
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 작업 스레드의 동기 DB 코드(call_sync)도 이 루프에서 같은 커넥션 풀을 사용
+    bind_loop(asyncio.get_running_loop())
+    # DB 테이블 생성 후 기존 DB 에 없는 인덱스 등 버전별 마이그레이션 적용 (app/core/migrations.py)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+    # 읽기 레플리카 헬스체크 (비정상 레플리카는 복구될 때까지 primary 로 대체)
+    health_task = None
+    if replica_pool.enabled:
+        await replica_pool.check(settings.DB_REPLICA_HEALTH_TIMEOUT)
+        health_task = asyncio.create_task(replica_pool.run_health_checks(
+            settings.DB_REPLICA_HEALTH_INTERVAL, settings.DB_REPLICA_HEALTH_TIMEOUT
+        ))
+    # 자산/서비스 조회용 메모리 스냅샷 적재 후 주기적으로 변경분 반영
+    snapshot_task = None
+    if settings.CATALOG_SNAPSHOT_ENABLED:
+        await catalog_snapshot.ensure_fresh(async_engine, force=True)
+        snapshot_task = asyncio.create_task(catalog_snapshot.run_refresh(
+            async_engine, settings.CATALOG_SNAPSHOT_REFRESH_SECONDS
+        ))
+    # 소스 DB 메타데이터 주기 수집 (CRAWL_INTERVAL_SECONDS > 0 일 때)
+    crawl_task = None
+    if settings.CRAWL_SOURCES and settings.CRAWL_INTERVAL_SECONDS > 0:
+        crawl_task = asyncio.create_task(schedule_crawls(settings.CRAWL_INTERVAL_SECONDS))
+    # 만료된 권한을 주기적으로 회수 처리 (워커가 여러 개여도 DB 임대를 가진 하나만 실행)
+    sweep_task = None
+    if settings.GRANT_SWEEP_INTERVAL_SECONDS > 0:
+        sweep_task = asyncio.create_task(grant_sweeper.run(settings.GRANT_SWEEP_INTERVAL_SECONDS))
+    yield
+    if sweep_task is not None:
+        sweep_task.cancel()
+    if crawl_task is not None:
+        crawl_task.cancel()
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    if health_task is not None:
+        health_task.cancel()
+        await replica_pool.dispose()
+    await async_engine.dispose()
+    bind_loop(None)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # 직접 만든 응답 외의 일반 응답도 orjson 으로 렌더링
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -21,13 +73,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 레플리카가 요청 도중 실패한 조회는 primary 에서 한 번 다시 실행 (메트릭보다 안쪽이라 한 요청으로 집계)
+if replica_pool.enabled:
+    app.add_middleware(ReplicaRetryMiddleware)
+
+# 요청별 지연/응답 크기/SQL 구문 수 수집 (CORS 보다 바깥에서 측정)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # API 라우터 등록
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/health")
 def health_check():
+    if replica_pool.enabled:
+        return {"status": "ok", "replicas": replica_pool.stats()}
     return {"status": "ok"}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,6 +1,8 @@
 from .all_models import (
     Service,
     DataAsset,
+    AssetTag,
+    AssetTombstone,
     AssetColumn,
     DataLineage,
     AssetComment,
@@ -10,5 +12,11 @@ from .all_models import (
     RequestType,
     ServiceRequest,
     Notification,
-    SampleData
+    NotificationSequence,
+    SampleData,
+    AssetProfile,
+    ActivityRollup,
+    ActivityTotal,
+    UserActivityDay,
+    CrawlState
 )
\ No newline at end of file
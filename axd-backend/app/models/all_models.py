@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, JSON, Numeric
+from sqlalchemy import BigInteger, Column, Integer, String, Boolean, ForeignKey, Date, DateTime, Text, JSON, Numeric, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -22,6 +22,15 @@ class Service(Base):
 
 class DataAsset(Base):
     __tablename__ = "data_assets"
+    # 목록 API 의 (updated_at DESC, id DESC) 정렬/키셋 페이지네이션과 서비스별 필터
+    __table_args__ = (
+        Index("ix_data_assets_updated_at_id", "updated_at", "id"),
+        Index("ix_data_assets_service_id_updated_at_id", "service_id", "updated_at", "id"),
+        # 패싯 집계 (GET /assets/facets) 를 테이블 대신 이 인덱스만 읽어 처리
+        Index("ix_data_assets_facets", "service_id", "database_name", "schema_name", "sensitivity_level", "id"),
+        # 수집(POST /system/ingest) upsert 의 자연키
+        Index("ux_data_assets_natural_key", "database_name", "schema_name", "name", unique=True),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     name = Column(String(255), nullable=False)
@@ -41,13 +50,33 @@ class DataAsset(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     service = relationship("Service", back_populates="assets")
-    columns = relationship("AssetColumn", back_populates="asset", cascade="all, delete-orphan")
+    columns = relationship("AssetColumn", back_populates="asset", cascade="all, delete-orphan", order_by="AssetColumn.ordinal_position")
     comments = relationship("AssetComment", back_populates="asset", cascade="all, delete-orphan")
     permissions = relationship("AssetPermission", back_populates="asset", cascade="all, delete-orphan")
     permission_requests = relationship("PermissionRequest", back_populates="asset", cascade="all, delete-orphan")
+    # 리니지는 별도 API 로 관리되므로 조회 전용 관계로만 둔다
+    upstream_lineage = relationship("DataLineage", foreign_keys="DataLineage.target_asset_id", viewonly=True)
+    downstream_lineage = relationship("DataLineage", foreign_keys="DataLineage.source_asset_id", viewonly=True)
+
+class AssetTag(Base):
+    # DataAsset.tags(JSON) 의 정규화 색인. 태그별 자산 수/태그 필터용 (app/core/facets.py 가 쓰기 시점에 동기화)
+    __tablename__ = "asset_tags"
+    __table_args__ = (Index("ix_asset_tags_tag_asset_id", "tag", "asset_id"),)
+
+    asset_id = Column(String(36), ForeignKey("data_assets.id"), primary_key=True)
+    tag = Column(String(255), primary_key=True)
+
+class AssetTombstone(Base):
+    # 삭제된 자산 id. 다른 워커의 카탈로그 스냅샷이 삭제를 감지하는 데 사용 (app/core/catalog_snapshot.py 가 기록)
+    __tablename__ = "asset_tombstones"
+    __table_args__ = (Index("ix_asset_tombstones_deleted_at", "deleted_at"),)
+
+    asset_id = Column(String(36), primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 class AssetColumn(Base):
     __tablename__ = "asset_columns"
+    __table_args__ = (Index("ix_asset_columns_asset_id_ordinal_position", "asset_id", "ordinal_position"),)
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=False)
@@ -65,8 +94,8 @@ class DataLineage(Base):
     __tablename__ = "data_lineage"
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
-    source_asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=True)
-    target_asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=True)
+    source_asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=True, index=True)
+    target_asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=True, index=True)
     transformation_type = Column(String(50), default="ETL")
     etl_logic_summary = Column(Text, default="")
     source_name = Column(String(255), default="")
@@ -76,6 +105,7 @@ class DataLineage(Base):
 
 class AssetComment(Base):
     __tablename__ = "asset_comments"
+    __table_args__ = (Index("ix_asset_comments_asset_id_created_at", "asset_id", "created_at"),)
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=False)
@@ -91,6 +121,12 @@ class AssetComment(Base):
 
 class AssetPermission(Base):
     __tablename__ = "asset_permissions"
+    __table_args__ = (
+        Index("ix_asset_permissions_user_id", "user_id"),
+        Index("ix_asset_permissions_asset_id", "asset_id"),
+        # 만료 권한 정리 (revoked_at IS NULL AND expires_at <= now ORDER BY expires_at)
+        Index("ix_asset_permissions_revoked_at_expires_at", "revoked_at", "expires_at"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=False)
@@ -109,6 +145,11 @@ class AssetPermission(Base):
 
 class PermissionRequest(Base):
     __tablename__ = "permission_requests"
+    __table_args__ = (
+        Index("ix_permission_requests_status_created_at", "status", "created_at"),
+        Index("ix_permission_requests_asset_id", "asset_id"),
+        Index("ix_permission_requests_requester_id", "requester_id"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=False)
@@ -148,7 +189,7 @@ class RequestType(Base):
     __tablename__ = "request_types"
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
-    category_id = Column(String(36), ForeignKey("request_categories.id"), nullable=False)
+    category_id = Column(String(36), ForeignKey("request_categories.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     slug = Column(String(255), nullable=False)
     description = Column(Text, default="")
@@ -163,6 +204,11 @@ class RequestType(Base):
 
 class ServiceRequest(Base):
     __tablename__ = "service_requests"
+    __table_args__ = (
+        Index("ix_service_requests_status_created_at", "status", "created_at"),
+        Index("ix_service_requests_requester_id", "requester_id"),
+        Index("ix_service_requests_request_type_id", "request_type_id"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     request_type_id = Column(String(36), ForeignKey("request_types.id"), nullable=False)
@@ -186,6 +232,12 @@ class ServiceRequest(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    # 사용자별 최신순 목록/SSE 재전송 커서와 안 읽은 수 집계
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_notifications_user_id_is_read", "user_id", "is_read"),
+        Index("ix_notifications_user_id_seq", "user_id", "seq"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     user_id = Column(String(36), nullable=False)
@@ -195,13 +247,84 @@ class Notification(Base):
     link = Column(String(255), default="")
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # 커밋 순서대로 증가하는 번호. SSE 이벤트 id 이자 재연결 커서 (crud_notification.allocate_sequence)
+    seq = Column(BigInteger)
+
+class NotificationSequence(Base):
+    # 알림 seq 카운터 (단일 행, 마이그레이션에서 생성). 커밋 직전에 갱신하고 커밋할 때까지 행이 잠겨
+    # seq 순서가 커밋 순서와 같아짐 (app/core/notifications.py)
+    __tablename__ = "notification_sequence"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    value = Column(BigInteger, nullable=False)
 
 class SampleData(Base):
     __tablename__ = "sample_data"
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
-    asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=False)
+    asset_id = Column(String(36), ForeignKey("data_assets.id"), nullable=False, index=True)
     row_data = Column(JSON, nullable=False)  # 실제 데이터를 JSON으로 저장
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     asset = relationship("DataAsset", backref="samples")
+
+
+class AssetProfile(Base):
+    # 샘플 데이터 품질 프로파일 (app/core/profiling.py). 컬럼별 상세 통계는 column_stats 에 보관
+    __tablename__ = "asset_profiles"
+
+    asset_id = Column(String(36), ForeignKey("data_assets.id"), primary_key=True)
+    sample_fingerprint = Column(String(128), nullable=False)  # 샘플이 바뀌었는지 판단 (건수:sha1(id, 행 내용))
+    row_count = Column(Integer, default=0)
+    freshness = Column(String(50), nullable=True)
+    latest_value_at = Column(DateTime(timezone=True), nullable=True)
+    column_stats = Column(JSON, default=dict)
+    profiled_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ActivityRollup(Base):
+    # 관리자 대시보드용 시간 단위 집계 (쓰기 시점에 증분 갱신, app/core/activity_rollup.py)
+    __tablename__ = "activity_rollups"
+    # 대시보드는 버킷 전체에 걸쳐 metric/status 별로 합산
+    __table_args__ = (Index("ix_activity_rollups_metric_status", "metric", "status", "bucket"),)
+
+    bucket = Column(DateTime, primary_key=True)  # 정시 단위로 절삭한 생성 시각
+    metric = Column(String(50), primary_key=True)  # comments / permission_requests / service_requests
+    status = Column(String(50), primary_key=True, default="")
+    count = Column(Integer, nullable=False, default=0)
+
+class ActivityTotal(Base):
+    # activity_rollups 의 전체 기간 누계 (metric/status 별 한 행). 대기 건수를 버킷 합산 없이 읽음
+    __tablename__ = "activity_totals"
+
+    metric = Column(String(50), primary_key=True)
+    status = Column(String(50), primary_key=True, default="")
+    count = Column(Integer, nullable=False, default=0)
+
+class UserActivityDay(Base):
+    # 일자별 활동 사용자 (댓글/요청 작성 기준)
+    __tablename__ = "user_activity_days"
+
+    day = Column(Date, primary_key=True)
+    user_id = Column(String(36), primary_key=True)
+
+class SchedulerLease(Base):
+    # 주기 작업 임대 (app/core/leases.py). 여러 워커/호스트 중 expires_at 전까지 owner 만 해당 작업을 실행
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(100), primary_key=True)
+    owner = Column(String(255), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+class CrawlState(Base):
+    # 소스 DB 별 메타데이터 수집 상태 (app/core/crawler.py). 실패/중단된 소스는 같은 run_id 로 재개
+    __tablename__ = "crawl_state"
+
+    source = Column(String(255), primary_key=True)
+    run_id = Column(String(36), nullable=False)
+    status = Column(String(50), nullable=False, default="running")  # running / succeeded / failed
+    fingerprint = Column(String(64), nullable=True)  # 마지막으로 반영한 스키마 스냅샷 해시
+    tables = Column(Integer, default=0)
+    stats = Column(JSON, default=dict)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from datetime import datetime
 
 class AssetBase(BaseModel):
@@ -26,4 +26,57 @@ class AssetResponse(AssetBase):
     created_at: datetime
     updated_at: datetime
     isMasked: bool = False
-    hasPermission: bool = False
\ No newline at end of file
+    hasPermission: bool = False
+
+class AssetPage(BaseModel):
+    # fields= 프로젝션 시 일부 컬럼만 포함되므로 dict 로 반환
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+class CommentThreadPage(BaseModel):
+    # 최상위 댓글마다 replies(중첩) 와 reply_count(전체 답글 수) 포함
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+    total_threads: int = 0
+
+class AssetSearchHit(BaseModel):
+    id: str
+    name: Optional[str] = None
+    schema_name: Optional[str] = None
+    database_name: Optional[str] = None
+    service_id: Optional[str] = None
+    sensitivity_level: Optional[str] = None
+    score: float
+
+class FacetCount(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+class AssetFacets(BaseModel):
+    # 현재 필터 조건에 맞는 자산 수와 차원별(service_id/database_name/schema_name/sensitivity_level/tags) 건수
+    total: int
+    facets: Dict[str, List[FacetCount]]
+
+class ColumnIngest(BaseModel):
+    column_name: str
+    data_type: str
+    description: str = ""
+    is_nullable: bool = True
+    ordinal_position: Optional[int] = None
+
+class AssetIngest(BaseModel):
+    # 자연키: (database_name, schema_name, name)
+    name: str
+    schema_name: str
+    database_name: str
+    description: str = ""
+    service_id: Optional[str] = None
+    owner_name: str = ""
+    owner_email: str = ""
+    tags: List[str] = []
+    business_definition: str = ""
+    doc_links: List[Dict[str, str]] = []
+    sensitivity_level: str = "public"
+    requires_permission: bool = False
+    columns: Optional[List[ColumnIngest]] = None
+    samples: Optional[List[Dict[str, Any]]] = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+class NotificationPage(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+class MarkReadRequest(BaseModel):
+    # ids 를 생략하면 해당 사용자의 읽지 않은 알림 전체를 읽음 처리
+    ids: Optional[List[str]] = None
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+class PermissionReviewRequest(BaseModel):
+    # 대기 중인 권한 요청을 한 트랜잭션으로 승인/반려 (이미 처리된 요청은 skipped 로 반환)
+    ids: List[str] = Field(..., min_length=1)
+    decision: Literal["approved", "rejected"]
+    comment: str = ""
+    reviewer_name: str = ""
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+class SyntheticCatalogConfig(BaseModel):
+    # 동일한 seed 와 설정이면 항상 같은 카탈로그가 생성됨
+    seed: int = 42
+    reset: bool = True
+    services: int = Field(5, ge=1, le=1000)
+    assets: int = Field(1000, ge=1, le=1_000_000)
+    databases_per_service: int = Field(3, ge=1, le=100)
+    schemas_per_database: int = Field(4, ge=1, le=100)
+    columns_min: int = Field(5, ge=1, le=500)
+    columns_max: int = Field(30, ge=1, le=500)
+    # 자산당 평균 상위(upstream) 리니지 엣지 수, 가까운 이전 자산들 중에서 선택 (DAG 보장)
+    lineage_fanout: float = Field(1.5, ge=0, le=20)
+    lineage_window: int = Field(200, ge=1)
+    comments_per_asset: float = Field(1.0, ge=0, le=100)
+    reply_ratio: float = Field(0.4, ge=0, le=1)
+    users: int = Field(500, ge=1)
+    grants_per_protected_asset: float = Field(2.0, ge=0, le=100)
+    requests_per_asset: float = Field(0.3, ge=0, le=100)
+    sample_rows: int = Field(5, ge=0, le=1000)
+    sensitivity_weights: Dict[str, float] = {"public": 0.4, "internal": 0.4, "confidential": 0.2}
+    batch_size: int = Field(500, ge=1, le=50_000)
+
+class DQProfileRequest(BaseModel):
+    # force=False 이면 마지막 프로파일 이후 샘플이 바뀐 자산만 다시 계산
+    force: bool = False
+    asset_ids: Optional[List[str]] = None
+    workers: Optional[int] = Field(None, ge=0, le=32)
+
+class CrawlRequest(BaseModel):
+    # sources 미지정 시 CRAWL_SOURCES 전체. resume=True 이면 마지막 실행에서 실패/중단된 소스만 재실행
+    # full=True 이면 스키마 지문이 같아도 저장된 카탈로그와 다시 비교
+    sources: Optional[List[str]] = None
+    resume: bool = False
+    full: bool = False
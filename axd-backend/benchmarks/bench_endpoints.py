@@ -0,0 +1,331 @@
+"""API 엔드포인트 벤치마크 (MariaDB 없이 SQLite 카탈로그로 실행)
+
+axd-backend 디렉터리에서 실행:
+
+    python -m benchmarks.bench_endpoints --assets 5000 --concurrency 8 --output bench.json
+    python -m benchmarks.bench_endpoints --assets 5000 --output after.json --compare bench.json
+
+합성 카탈로그를 SQLite 파일에 생성한 뒤, app/api/v1 의 라우트를 in-process ASGI 클라이언트로
+지정한 동시성만큼 호출하여 엔드포인트별 처리량과 p50/p95/p99 지연을 JSON 으로 저장한다.
+--compare 로 이전 결과를 주면 p95 가 --threshold 이상 느려진 엔드포인트가 있을 때 종료 코드 1 을 반환한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_DB = "./bench_catalog.db"
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default=DEFAULT_DB, help="벤치마크용 SQLite 파일 경로")
+    p.add_argument("--assets", type=int, default=2000)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--reuse-db", action="store_true", help="DB 파일이 있으면 재생성하지 않음")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--requests", type=int, default=200, help="엔드포인트별 측정 요청 수")
+    p.add_argument("--warmup", type=int, default=10)
+    p.add_argument("--only", default=None, help="쉼표로 구분된 시나리오 이름만 실행")
+    p.add_argument("--no-cache", action="store_true", help="응답 캐시를 끄고 측정")
+    p.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    p.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    p.add_argument("--threshold", type=float, default=0.2, help="p95 회귀 허용 비율 (0.2 = 20%%)")
+    return p.parse_args(argv)
+
+
+def configure_env(args):
+    # app 모듈을 import 하기 전에 환경을 지정해야 엔진/캐시 설정에 반영됨
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    os.environ["METRICS_SERVER_TIMING"] = "false"
+    if args.no_cache:
+        os.environ["CACHE_MAX_ENTRIES"] = "0"
+
+
+def seed_database(args):
+    from app.database import call_sync
+
+    if args.reuse_db and os.path.exists(args.db):
+        return
+    call_sync(_seed_database, args)
+
+
+def _seed_database(args):
+    from app.core.activity_rollup import rebuild_rollups
+    from app.core.migrations import run_migrations
+    from app.core.profiling import run_profiling
+    from app.core.synthetic import seed_synthetic_catalog
+    from app.database import Base, SessionLocal, engine
+    from app.schemas.system import SyntheticCatalogConfig
+
+    # 앱 기동과 같이 테이블 생성 후 마이그레이션 (알림 seq 카운터 행 등)
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        run_migrations(conn)
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        seed_synthetic_catalog(db, SyntheticCatalogConfig(seed=args.seed, assets=args.assets))
+        rebuild_rollups(db)
+        run_profiling(db)
+        print(f"seeded {args.assets} assets in {time.perf_counter() - started:.1f}s -> {args.db}")
+    finally:
+        db.close()
+
+
+def pick_fixtures() -> dict:
+    from app.database import call_sync
+
+    return call_sync(_pick_fixtures)
+
+
+def _pick_fixtures() -> dict:
+    from sqlalchemy import func
+    from app.database import SessionLocal
+    from app.models import AssetComment, DataAsset, DataLineage, Service
+
+    db = SessionLocal()
+    try:
+        # 리니지/댓글이 있는 자산을 골라 상세 엔드포인트가 실제 데이터를 반환하도록 한다
+        busy = (
+            db.query(AssetComment.asset_id)
+            .join(DataLineage, DataLineage.target_asset_id == AssetComment.asset_id)
+            .group_by(AssetComment.asset_id)
+            .order_by(func.count().desc())
+            .first()
+        )
+        asset_id = busy[0] if busy else db.query(DataAsset.id).first()[0]
+        service_id = db.query(Service.id).first()[0]
+        return {"asset_id": asset_id, "service_id": service_id}
+    finally:
+        db.close()
+
+
+def ingest_body(n: int = 20) -> bytes:
+    rows = []
+    for i in range(n):
+        rows.append(json.dumps({
+            "name": f"bench_{i}", "schema_name": "bench", "database_name": "bench_db",
+            "columns": [{"column_name": f"c{j}", "data_type": "int"} for j in range(10)],
+        }))
+    return ("\n".join(rows) + "\n").encode()
+
+
+class Scenario:
+    def __init__(self, name: str, method: str, route: str, url: str, params: Optional[dict] = None,
+                 body: Optional[bytes] = None, headers: Optional[dict] = None):
+        self.name, self.method, self.route, self.url = name, method, route, url
+        self.params, self.body, self.headers = params or {}, body, headers or {}
+
+
+# 라우트 중 벤치마크에서 일부러 제외하는 것 (파괴적이거나 백그라운드 작업을 띄우는 라우트)
+SKIPPED_ROUTES = {
+    ("POST", "/api/v1/system/init-sample-data"): "drops and recreates every table",
+    ("POST", "/api/v1/system/synthetic-catalog"): "starts a background reseed job",
+    ("GET", "/api/v1/system/jobs/{job_id}"): "requires a job id",
+    ("POST", "/api/v1/system/dq-profile"): "starts a background profiling job",
+    ("POST", "/api/v1/admin/stats/rebuild"): "rewrites the dashboard rollups",
+    ("POST", "/api/v1/admin/permission-requests/review"): "approves or rejects pending permission requests",
+    ("POST", "/api/v1/admin/permissions/sweep"): "revokes expired grants",
+    ("GET", "/api/v1/system/export"): "streams a full catalog dump",
+    ("POST", "/api/v1/system/crawl"): "starts a background crawl of the configured source databases",
+    ("GET", "/api/v1/notifications/stream"): "long-lived SSE connection",
+    ("POST", "/api/v1/notifications/read"): "marks the benchmark user's notifications read",
+}
+
+
+def build_scenarios(fx: dict) -> List[Scenario]:
+    a, s = fx["asset_id"], fx["service_id"]
+    base = "/api/v1"
+    return [
+        Scenario("services", "GET", "/api/v1/assets/services", f"{base}/assets/services"),
+        Scenario("assets_page", "GET", "/api/v1/assets/", f"{base}/assets/", {"limit": 100}),
+        Scenario("assets_page_max", "GET", "/api/v1/assets/", f"{base}/assets/", {"limit": 1000}),
+        # 합성 카탈로그의 사용자 id 로 권한 색인 기반 마스킹 경로를 측정
+        Scenario("assets_page_user", "GET", "/api/v1/assets/", f"{base}/assets/", {"limit": 1000},
+                 headers={"X-User-Id": "user-000001"}),
+        Scenario("assets_by_service", "GET", "/api/v1/assets/", f"{base}/assets/", {"service_id": s}),
+        Scenario("assets_projected", "GET", "/api/v1/assets/", f"{base}/assets/",
+                 {"limit": 1000, "fields": "name,schema_name,database_name"}),
+        Scenario("search", "GET", "/api/v1/assets/search", f"{base}/assets/search", {"q": "orders daily"}),
+        Scenario("search_prefix", "GET", "/api/v1/assets/search", f"{base}/assets/search", {"q": "cust"}),
+        Scenario("facets", "GET", "/api/v1/assets/facets", f"{base}/assets/facets"),
+        Scenario("facets_filtered", "GET", "/api/v1/assets/facets", f"{base}/assets/facets",
+                 {"sensitivity_level": "internal", "tag": "pii"}),
+        Scenario("asset", "GET", "/api/v1/assets/{asset_id}", f"{base}/assets/{a}"),
+        Scenario("bundle", "GET", "/api/v1/assets/{asset_id}/bundle", f"{base}/assets/{a}/bundle"),
+        Scenario("columns", "GET", "/api/v1/assets/{asset_id}/columns", f"{base}/assets/{a}/columns"),
+        Scenario("lineage", "GET", "/api/v1/assets/{asset_id}/lineage", f"{base}/assets/{a}/lineage"),
+        Scenario("lineage_graph", "GET", "/api/v1/assets/{asset_id}/lineage/graph",
+                 f"{base}/assets/{a}/lineage/graph", {"depth": 5}),
+        Scenario("comments", "GET", "/api/v1/assets/{asset_id}/comments", f"{base}/assets/{a}/comments"),
+        Scenario("comment_threads", "GET", "/api/v1/assets/{asset_id}/comments/threads",
+                 f"{base}/assets/{a}/comments/threads"),
+        Scenario("preview", "GET", "/api/v1/assets/{asset_id}/preview", f"{base}/assets/{a}/preview"),
+        Scenario("profile", "GET", "/api/v1/assets/{asset_id}/profile", f"{base}/assets/{a}/profile"),
+        Scenario("admin_stats", "GET", "/api/v1/admin/stats", f"{base}/admin/stats"),
+        Scenario("grant_sweep_status", "GET", "/api/v1/admin/permissions/sweep",
+                 f"{base}/admin/permissions/sweep"),
+        Scenario("jobs", "GET", "/api/v1/system/jobs", f"{base}/system/jobs"),
+        Scenario("dq_profile_status", "GET", "/api/v1/system/dq-profile", f"{base}/system/dq-profile"),
+        Scenario("crawl_status", "GET", "/api/v1/system/crawl", f"{base}/system/crawl"),
+        Scenario("notifications", "GET", "/api/v1/notifications/", f"{base}/notifications/",
+                 headers={"X-User-Id": "user-000001"}),
+        Scenario("notifications_unread", "GET", "/api/v1/notifications/unread-count",
+                 f"{base}/notifications/unread-count", headers={"X-User-Id": "user-000001"}),
+        Scenario("ingest_20", "POST", "/api/v1/system/ingest", f"{base}/system/ingest", body=ingest_body()),
+    ]
+
+
+def list_api_routes(app) -> set:
+    # OpenAPI 스키마 기준으로 나열 (FastAPI 버전별 라우터 중첩 방식과 무관)
+    routes = set()
+    for path, ops in app.openapi()["paths"].items():
+        if path.startswith("/api/v1"):
+            routes.update((m.upper(), path) for m in ops)
+    return routes
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[idx]
+
+
+async def run_scenario(client, sc: Scenario, n: int, concurrency: int, warmup: int) -> dict:
+    async def one() -> Optional[float]:
+        started = time.perf_counter()
+        r = await client.request(sc.method, sc.url, params=sc.params, content=sc.body, headers=sc.headers)
+        elapsed = time.perf_counter() - started
+        return elapsed if r.status_code < 400 else None
+
+    for _ in range(warmup):
+        await one()
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = n
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            result = await one()
+            if result is None:
+                errors += 1
+            else:
+                latencies.append(result)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 3)
+    return {
+        "method": sc.method,
+        "route": sc.route,
+        "params": sc.params,
+        "requests": n,
+        "errors": errors,
+        "throughput_rps": round(n / wall, 1) if wall else 0.0,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    regressed = False
+    print(f"\n{'scenario':<22}{'p95 before':>12}{'p95 after':>12}{'delta':>9}{'rps before':>12}{'rps after':>12}")
+    for name, cur in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            print(f"{name:<22}{'-':>12}{cur['p95_ms']:>12}{'new':>9}")
+            continue
+        delta = (cur["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        flag = " <-- regression" if delta > threshold else ""
+        regressed |= delta > threshold
+        print(f"{name:<22}{old['p95_ms']:>12}{cur['p95_ms']:>12}{delta:>+9.0%}"
+              f"{old['throughput_rps']:>12}{cur['throughput_rps']:>12}{flag}")
+    return regressed
+
+
+async def main_async(args) -> dict:
+    import httpx
+    from app.main import app
+
+    fx = await asyncio.to_thread(pick_fixtures)
+    scenarios = build_scenarios(fx)
+    if args.only:
+        wanted = set(args.only.split(","))
+        scenarios = [s for s in scenarios if s.name in wanted]
+
+    covered = {(s.method, s.route) for s in build_scenarios(fx)}
+    for method, path in sorted(list_api_routes(app) - covered - set(SKIPPED_ROUTES)):
+        print(f"warning: {method} {path} has no benchmark scenario", file=sys.stderr)
+
+    results: Dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for sc in scenarios:
+                results[sc.name] = await run_scenario(client, sc, args.requests, args.concurrency, args.warmup)
+                r = results[sc.name]
+                print(f"{sc.name:<22}{r['throughput_rps']:>9} rps  p50 {r['p50_ms']:>8}ms  "
+                      f"p95 {r['p95_ms']:>8}ms  p99 {r['p99_ms']:>8}ms  errors {r['errors']}")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "assets": args.assets,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "cache": not args.no_cache,
+            "skipped": {f"{m} {p}": why for (m, p), why in SKIPPED_ROUTES.items()},
+        },
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_env(args)
+    seed_database(args)
+    report = asyncio.run(main_async(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""목록 응답 직렬화 비용 벤치마크 (행 10k 건 기준, 이전 경로 vs 빠른 경로)
+
+axd-backend 디렉터리에서 실행:
+
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5 --output serialization.json
+
+합성 카탈로그를 SQLite 파일에 만든 뒤 같은 행 집합에 대해 다음을 각각 측정한다.
+  query  : 조회 자체 (ORM 객체 로딩 / 컬럼 튜플 SELECT)
+  before : ORM 객체 -> AssetResponse.model_validate/model_dump -> 페이지 모델 검증 -> jsonable_encoder -> json
+  after  : 컬럼 튜플(또는 메모리 스냅샷 레코드) -> dict 매핑 -> orjson
+결과는 행 10k 건당 밀리초로 환산해 출력한다.
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+from benchmarks.bench_endpoints import configure_env, seed_database
+
+DEFAULT_DB = "./bench_serialization.db"
+PER_ROWS = 10_000
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default=DEFAULT_DB, help="벤치마크용 SQLite 파일 경로")
+    p.add_argument("--assets", type=int, default=10_000)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--reuse-db", action="store_true", help="DB 파일이 있으면 재생성하지 않음")
+    p.add_argument("--rows", type=int, default=PER_ROWS, help="측정에 사용할 행 수")
+    p.add_argument("--repeat", type=int, default=5, help="반복 횟수 (최솟값 사용)")
+    p.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    return p.parse_args(argv)
+
+
+def best_ms(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def run(args) -> Dict[str, dict]:
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import select
+
+    from app.api.v1.endpoints.assets import _COLUMN_KEYS, _to_asset_page
+    from app.core.catalog_snapshot import AssetRecord
+    from app.core.permission_index import FULL_ACCESS
+    from app.core.serialization import dumps, row_dicts
+    from app.crud.crud_asset import ASSET_FIELDS
+    from app.database import SessionLocal
+    from app.models.all_models import AssetColumn, DataAsset
+    from app.schemas.asset import AssetPage, AssetResponse
+
+    db = SessionLocal()
+    now = datetime.now()
+    results: Dict[str, dict] = {}
+    try:
+        # --- 자산 목록 (GET /assets) ---------------------------------------
+        def orm_assets():
+            return db.scalars(select(DataAsset).limit(args.rows)).all()
+
+        def asset_tuples():
+            return db.execute(select(*[getattr(DataAsset, f) for f in ASSET_FIELDS]).limit(args.rows)).all()
+
+        orm_rows = orm_assets()
+        records = [AssetRecord(r) for r in asset_tuples()]
+        n = len(orm_rows)
+
+        def assets_before():
+            items = []
+            for a in orm_rows:
+                item = AssetResponse.model_validate(a).model_dump()
+                item["isMasked"] = a.requires_permission
+                item["hasPermission"] = True
+                items.append(item)
+            page = AssetPage(items=items, next_cursor=None)
+            return JSONResponse(content=jsonable_encoder(page)).body
+
+        def assets_after():
+            return dumps(_to_asset_page(records, None, None, FULL_ACCESS, now))
+
+        results["assets"] = {
+            "rows": n,
+            "same_output": json.loads(assets_before()) == json.loads(assets_after()),
+            "query_orm_ms": best_ms(lambda: (db.expunge_all(), orm_assets()), args.repeat),
+            "query_tuples_ms": best_ms(asset_tuples, args.repeat),
+            "before_ms": best_ms(assets_before, args.repeat),
+            "after_ms": best_ms(assets_after, args.repeat),
+        }
+
+        # --- 컬럼 목록 (GET /assets/{id}/columns) --------------------------
+        def orm_columns():
+            return db.scalars(select(AssetColumn).limit(args.rows)).all()
+
+        def column_tuples():
+            return db.execute(select(*AssetColumn.__table__.columns).limit(args.rows)).all()
+
+        orm_cols = orm_columns()
+        col_rows = column_tuples()
+
+        def columns_before():
+            return JSONResponse(content=jsonable_encoder(orm_cols)).body
+
+        def columns_after():
+            return dumps(row_dicts(_COLUMN_KEYS, col_rows))
+
+        results["columns"] = {
+            "rows": len(orm_cols),
+            "same_output": json.loads(columns_before()) == json.loads(columns_after()),
+            "query_orm_ms": best_ms(lambda: (db.expunge_all(), orm_columns()), args.repeat),
+            "query_tuples_ms": best_ms(column_tuples, args.repeat),
+            "before_ms": best_ms(columns_before, args.repeat),
+            "after_ms": best_ms(columns_after, args.repeat),
+        }
+    finally:
+        db.close()
+
+    # 행 10k 건당으로 환산
+    for r in results.values():
+        scale = PER_ROWS / r["rows"] if r["rows"] else 0
+        for k in [k for k in r if k.endswith("_ms")]:
+            r[k] = round(r[k] * scale, 2)
+        r["speedup"] = round(r["before_ms"] / r["after_ms"], 1) if r["after_ms"] else None
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    args.no_cache = True
+    configure_env(args)
+    seed_database(args)
+    from app.database import call_sync
+
+    results = call_sync(run, args)
+
+    print(f"\n{'per 10k rows':<12}{'query(orm)':>12}{'query(tuple)':>14}{'before':>10}{'after':>10}{'speedup':>9}"
+          f"{'same output':>13}")
+    for name, r in results.items():
+        print(f"{name:<12}{r['query_orm_ms']:>10}ms{r['query_tuples_ms']:>12}ms"
+              f"{r['before_ms']:>8}ms{r['after_ms']:>8}ms{r['speedup']:>8}x{str(r['same_output']):>13}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows_basis": PER_ROWS, "results": results}, f, indent=2)
+        print(f"\nresults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
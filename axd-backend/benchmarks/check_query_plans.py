@@ -0,0 +1,158 @@
+"""엔드포인트가 실행하는 모든 조회 쿼리의 실행 계획 점검 (SQLite EXPLAIN QUERY PLAN)
+
+axd-backend 디렉터리에서 실행:
+
+    python -m benchmarks.check_query_plans
+    python -m benchmarks.check_query_plans --assets 2000 --verbose
+
+bench_endpoints 의 시나리오(GET/POST)를 한 번씩 호출하면서 실행된 SELECT/UPDATE/DELETE 문을 모두 수집하고,
+각 문장에 대해 EXPLAIN QUERY PLAN 을 실행해 테이블 전체를 읽는 단계(COVERING INDEX 가 아닌 SCAN <table>,
+인덱스 순서로 모든 행을 읽는 SCAN .. USING INDEX 포함)가 있으면 종료 코드 1 을 반환한다.
+카탈로그 스냅샷이 켜져 있으면 목록/단건 조회가 SQL 을 거의 내지 않으므로 스냅샷을 끈 상태로 한 번 더 점검한다.
+전체 테이블을 읽는 것이 목적인 쿼리는 INTENTIONAL_SCANS 에 사유와 함께 등록한다.
+"""
+import argparse
+import asyncio
+import re
+import sys
+from typing import Dict, List, Tuple
+
+from benchmarks.bench_endpoints import build_scenarios, configure_env, pick_fixtures, seed_database
+
+DEFAULT_DB = "./plan_check.db"
+
+# (시나리오, 테이블) -> 전체 스캔을 허용하는 사유
+INTENTIONAL_SCANS = {
+    ("services", "services"): "returns every service (a handful of rows)",
+    # 첫 keyset 페이지는 (updated_at, id) 인덱스를 정렬 순서대로 읽다가 LIMIT 에서 멈춤 (스냅샷을 끈 패스)
+    ("assets_page", "data_assets"): "first keyset page walks ix_data_assets_updated_at_id up to LIMIT",
+    ("assets_page_max", "data_assets"): "first keyset page walks ix_data_assets_updated_at_id up to LIMIT",
+    ("assets_page_user", "data_assets"): "first keyset page walks ix_data_assets_updated_at_id up to LIMIT",
+    ("assets_projected", "data_assets"): "first keyset page walks ix_data_assets_updated_at_id up to LIMIT",
+    ("search", "data_assets"): "background build of the search index reads all assets; LIKE fallback until ready",
+    ("search", "asset_columns"): "background build indexes every column name and description",
+    ("search_prefix", "data_assets"): "LIKE fallback or background build when the index is not ready",
+    ("lineage_graph", "data_lineage"): "first query builds the in-memory adjacency index from all edges",
+    ("dq_profile_status", "asset_profiles"): "counts every profiled asset",
+    ("crawl_status", "crawl_state"): "one row per configured crawl source",
+}
+
+# 커버링 인덱스만 읽는 경우를 제외한 모든 SCAN 단계
+_SCAN = re.compile(r"^SCAN (\w+)\b(?!.*\bCOVERING INDEX\b)")
+_CHECKED = ("SELECT", "WITH", "UPDATE", "DELETE")
+# (이름, CATALOG_SNAPSHOT_ENABLED)
+PASSES = (("snapshot", True), ("sql", False))
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default=DEFAULT_DB, help="점검용 SQLite 파일 경로")
+    p.add_argument("--assets", type=int, default=500)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--reuse-db", action="store_true", help="DB 파일이 있으면 재생성하지 않음")
+    p.add_argument("--verbose", action="store_true", help="모든 쿼리의 실행 계획 출력")
+    return p.parse_args(argv)
+
+
+async def capture_statements(scenarios) -> Dict[Tuple[str, str], List[Tuple[str, tuple]]]:
+    # (패스, 시나리오)별로 실행된 SELECT/UPDATE/DELETE 문과 파라미터 수집 (응답 캐시는 꺼서 매 요청이 DB 를 거치도록)
+    # executemany 는 첫 파라미터 묶음으로 계획을 확인
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from app.core.config import settings
+    from app.core.search_index import search_index
+    from app.main import app
+
+    captured: Dict[Tuple[str, str], List[Tuple[str, tuple]]] = {}
+    current = {"key": None}
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if current["key"] and statement.lstrip().upper().startswith(_CHECKED):
+            if executemany:
+                parameters = parameters[0] if parameters else ()
+            captured.setdefault(current["key"], []).append((statement, tuple(parameters or ())))
+
+    snapshot_enabled = settings.CATALOG_SNAPSHOT_ENABLED
+    event.listen(Engine, "before_cursor_execute", before_execute)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://plan") as client:
+                for pass_name, enabled in PASSES:
+                    settings.CATALOG_SNAPSHOT_ENABLED = enabled
+                    for sc in scenarios:
+                        current["key"] = (pass_name, sc.name)
+                        r = await client.request(sc.method, sc.url, params=sc.params, content=sc.body,
+                                                 headers=sc.headers)
+                        # 백그라운드 색인 구성 쿼리는 그 구성을 시작한 시나리오에 묶음
+                        while search_index.building:
+                            await asyncio.sleep(0.01)
+                        current["key"] = None
+                        if r.status_code >= 400:
+                            print(f"warning: [{pass_name}] {sc.name} returned {r.status_code}", file=sys.stderr)
+    finally:
+        settings.CATALOG_SNAPSHOT_ENABLED = snapshot_enabled
+        event.remove(Engine, "before_cursor_execute", before_execute)
+    return captured
+
+
+def full_scans(conn, statement: str, parameters: tuple) -> Tuple[List[str], List[str]]:
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+    scans = [m.group(1) for m in map(_SCAN.match, plan) if m]
+    return plan, scans
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    args.no_cache = True
+    configure_env(args)
+    seed_database(args)
+
+    from app.database import call_sync
+    from app.models.all_models import Base
+
+    tables = set(Base.metadata.tables)
+    scenarios = build_scenarios(pick_fixtures())
+    captured = asyncio.run(capture_statements(scenarios))
+    failures, checked = call_sync(explain_all, args, scenarios, captured, tables)
+    print(f"\n{checked} distinct statements checked, {failures} with unexpected full table scans")
+    return 1 if failures else 0
+
+
+def explain_all(args, scenarios, captured, tables) -> Tuple[int, int]:
+    from app.database import engine
+
+    failures = 0
+    checked = set()
+    raw = engine.raw_connection()
+    try:
+        for pass_name, _ in PASSES:
+            for sc in scenarios:
+                key = (pass_name, sc.name)
+                seen = set()
+                for statement, parameters in captured.get(key, []):
+                    if statement in seen:
+                        continue
+                    seen.add(statement)
+                    checked.add(statement)
+                    plan, scans = full_scans(raw, statement, parameters)
+                    bad = [t for t in scans if t in tables and (sc.name, t) not in INTENTIONAL_SCANS]
+                    if bad or args.verbose:
+                        status = "FULL SCAN " + ", ".join(bad) if bad else "ok"
+                        print(f"[{pass_name}:{sc.name}] {status}\n  {' '.join(statement.split())}")
+                        for step in plan:
+                            print(f"    {step}")
+                    failures += bool(bad)
+                if key not in captured:
+                    print(f"[{pass_name}:{sc.name}] no SQL issued")
+        # EXPLAIN 이 쓰기 문장을 실행하지는 않지만 같은 연결에서 열린 트랜잭션이 남지 않도록 정리
+        raw.rollback()
+    finally:
+        raw.close()
+
+    return failures, len(checked)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+import pytest
+
+# app 모듈은 import 시점에 설정/엔진을 만들므로 테스트 모듈을 수집하기 전에 임시 SQLite 파일로 지정
+TEST_DIR = tempfile.mkdtemp(prefix="axd-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'catalog.db')}"
+os.environ["SAMPLE_STORE_DIR"] = os.path.join(TEST_DIR, "samples")
+for name in ("DB_REPLICA_URLS", "CACHE_BACKEND_URL", "CRAWL_SOURCES"):
+    os.environ.pop(name, None)
+
+
+@pytest.fixture(scope="session")
+def catalog_db() -> str:
+    # 앱 기본 엔진(primary)이 쓰는 SQLite 파일 경로
+    return os.path.join(TEST_DIR, "catalog.db")
@@ -0,0 +1,133 @@
+import os
+import sqlite3
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker, selectinload
+
+from app.core.crawler import MetadataCrawler, Source, apply_snapshot
+from app.database import Base, RoutingSession, call_sync, create_db_engine
+from app.models.all_models import CrawlState, DataAsset
+
+
+def _make_source(path: str, *statements: str):
+    conn = sqlite3.connect(path)
+    try:
+        for statement in statements:
+            conn.execute(statement)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    # 크롤러가 반영할 카탈로그 DB (앱과 같이 비동기 엔진의 sync_engine 을 call_sync 로 사용)
+    engine = create_db_engine(f"sqlite:///{os.path.join(tmp_path, 'catalog.db')}", is_async=True)
+    call_sync(Base.metadata.create_all, engine.sync_engine)
+    yield sessionmaker(bind=engine.sync_engine, class_=RoutingSession)
+    call_sync(engine.sync_engine.dispose)
+
+
+def _assets(session_factory, database_name: str) -> dict:
+    def run():
+        db = session_factory()
+        try:
+            assets = db.scalars(
+                select(DataAsset).where(DataAsset.database_name == database_name)
+                .options(selectinload(DataAsset.columns))
+            )
+            return {a.name: [c.column_name for c in sorted(a.columns, key=lambda c: c.ordinal_position)]
+                    for a in assets}
+        finally:
+            db.close()
+    return call_sync(run)
+
+
+def _state(crawler: MetadataCrawler, name: str) -> CrawlState:
+    return call_sync(crawler.states)[name]
+
+
+def test_crawl_applies_only_the_diff(catalog, tmp_path):
+    path = os.path.join(tmp_path, "sales.db")
+    _make_source(path, "CREATE TABLE orders (id INTEGER, total REAL)", "CREATE TABLE refunds (id INTEGER)")
+    source = Source("sales", f"sqlite:///{path}")
+    crawler = MetadataCrawler(catalog, workers=2)
+
+    first = call_sync(crawler.run, [source])
+    assert first["failed"] == {}
+    assert first["sources"]["sales"]["inserted"] == 2
+    assert _assets(catalog, "sales") == {"orders": ["id", "total"], "refunds": ["id"]}
+
+    # 스키마가 그대로면 지문 비교로 건너뜀
+    assert call_sync(crawler.run, [source])["sources"]["sales"] == {"skipped": True}
+
+    _make_source(path, "ALTER TABLE orders ADD COLUMN status TEXT", "DROP TABLE refunds",
+                 "CREATE TABLE customers (id INTEGER)")
+    stats = call_sync(crawler.run, [source])["sources"]["sales"]
+    # columns_added: orders.status + 새 테이블 customers.id
+    assert (stats["inserted"], stats["updated"], stats["deleted"], stats["columns_added"]) == (1, 1, 1, 2)
+    assert _assets(catalog, "sales") == {"orders": ["id", "total", "status"], "customers": ["id"]}
+    assert _state(crawler, "sales").status == "succeeded"
+
+
+def test_apply_snapshot_updates_changed_description(catalog):
+    source = Source("hr", "sqlite:///hr.db")
+    snapshot = {("main", "people"): {"description": "staff", "columns": []}}
+
+    def apply():
+        db = catalog()
+        try:
+            stats = apply_snapshot(db, source, snapshot)
+            db.commit()
+            description = db.scalars(select(DataAsset.description).where(DataAsset.name == "people")).one()
+            return stats, description
+        finally:
+            db.close()
+
+    assert call_sync(apply)[0]["inserted"] == 1
+    snapshot[("main", "people")]["description"] = "current and former staff"
+    stats, description = call_sync(apply)
+    assert (stats["inserted"], stats["updated"]) == (0, 1)
+    assert description == "current and former staff"
+
+
+def test_resume_recrawls_only_failed_sources_with_same_run_id(catalog, tmp_path):
+    good = os.path.join(tmp_path, "good.db")
+    _make_source(good, "CREATE TABLE t (id INTEGER)")
+    missing = os.path.join(tmp_path, "missing", "late.db")
+    crawler = MetadataCrawler(catalog, workers=2)
+
+    result = call_sync(crawler.run, [Source("good", f"sqlite:///{good}"), Source("late", f"sqlite:///{missing}")])
+    assert set(result["sources"]) == {"good"} and set(result["failed"]) == {"late"}
+    assert _state(crawler, "late").status == "failed"
+
+    os.makedirs(os.path.dirname(missing))
+    _make_source(missing, "CREATE TABLE events (id INTEGER)")
+    resumed = call_sync(
+        crawler.run, [Source("good", f"sqlite:///{good}"), Source("late", f"sqlite:///{missing}")], resume=True
+    )
+    assert resumed["run_id"] == result["run_id"]
+    assert set(resumed["sources"]) == {"late"} and resumed["failed"] == {}
+    assert _assets(catalog, "late") == {"events": ["id"]}
+
+
+def test_lease_keeps_concurrent_crawls_apart(catalog, tmp_path):
+    path = os.path.join(tmp_path, "ops.db")
+    _make_source(path, "CREATE TABLE jobs (id INTEGER)")
+    source = Source("ops", f"sqlite:///{path}")
+    crawler = MetadataCrawler(catalog, lease_seconds=3600)
+
+    # 다른 워커가 임대 중인 소스는 건너뜀
+    assert call_sync(crawler._claim, "ops", "other-run")
+    assert call_sync(crawler.crawl_source, source, "this-run") == {"skipped": True, "claimed": False}
+    assert _state(crawler, "ops").run_id == "other-run"
+
+    # 임대 시간이 지나면(중단된 워커) 다시 가져옴
+    expired = MetadataCrawler(catalog, lease_seconds=0)
+    assert call_sync(expired.crawl_source, source, "this-run")["inserted"] == 1
+    state = _state(crawler, "ops")
+    assert (state.run_id, state.status) == ("this-run", "succeeded")
+
+    # 이번 주기 안에 이미 성공한 소스는 예약 실행에서 건너뜀
+    assert call_sync(crawler.crawl_source, source, "next-run", False, None, 60) == {"skipped": True, "claimed": False}
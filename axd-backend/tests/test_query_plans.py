@@ -0,0 +1,6 @@
+from benchmarks import check_query_plans
+
+
+def test_endpoint_queries_use_indexes(catalog_db):
+    # 엔드포인트가 내는 모든 조회가 의도하지 않은 전체 테이블 스캔 없이 실행되는지
+    assert check_query_plans.main(["--db", catalog_db, "--assets", "200"]) == 0
@@ -0,0 +1,155 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app import database
+from app.core.replicas import ReplicaPool, create_replica_pool
+from app.database import Base, ReplicaRetryMiddleware, RoutingSession, call_sync, create_db_engine, get_async_db
+from app.models.all_models import Service
+
+
+def _sqlite_url(tmp_path, name: str) -> str:
+    return f"sqlite:///{os.path.join(tmp_path, name)}"
+
+
+def _seed(engine, service_name: str):
+    # 레플리카와 primary 를 구분할 수 있도록 서비스 이름을 다르게 넣음
+    def run():
+        Base.metadata.create_all(engine.sync_engine)
+        db = sessionmaker(bind=engine.sync_engine)()
+        try:
+            db.add(Service(name=service_name))
+            db.commit()
+        finally:
+            db.close()
+    call_sync(run)
+
+
+def _request(method: str = "GET", headers: dict = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": method, "path": "/", "headers": raw, "client": ("10.0.0.1", 1)})
+
+
+@pytest.fixture
+def pool(tmp_path):
+    replicas = create_replica_pool(
+        ",".join(_sqlite_url(tmp_path, f"replica{i}.db") for i in range(2)), create_db_engine
+    )
+    yield replicas
+    asyncio.run(replicas.dispose())
+
+
+def test_round_robin_skips_unhealthy_replicas(pool):
+    first, second = pool.replicas
+    assert [pool.choose() for _ in range(4)] == [first, second, first, second]
+
+    second.mark_down("connection refused")
+    assert [pool.choose() for _ in range(2)] == [first, first]
+
+    first.mark_down("connection refused")
+    assert pool.choose() is None
+
+    second.mark_up(0.001)
+    assert pool.choose() is second
+
+
+def test_least_latency_prefers_fastest_replica(pool):
+    slow, fast = pool.replicas
+    pool.strategy = "least_latency"
+    slow.mark_up(0.050)
+    fast.mark_up(0.001)
+    assert pool.choose() is fast
+
+
+def test_health_check_marks_replica_without_catalog_down(pool, tmp_path):
+    ready, empty = pool.replicas
+    _seed(ready.async_engine, "replica")
+
+    asyncio.run(pool.check(timeout=2.0))
+
+    assert ready.healthy and ready.latency is not None
+    assert not empty.healthy and "data_assets" in empty.last_error
+
+
+def test_session_info_routes_only_plain_reads(pool, monkeypatch):
+    monkeypatch.setattr(database, "replica_pool", pool)
+
+    assert database._session_info(_request())["replica_bind"] is not None
+    assert "replica_bind" not in database._session_info(_request("POST"))
+    assert "replica_bind" not in database._session_info(_request(headers={"X-Consistency": "strong"}))
+
+    # 쓰기 직후 같은 클라이언트의 조회는 primary, 다른 클라이언트는 그대로 레플리카
+    pool.note_write("alice")
+    assert "replica_bind" not in database._session_info(_request(headers={"X-User-Id": "alice"}))
+    assert database._session_info(_request(headers={"X-User-Id": "bob"}))["replica_bind"] is not None
+
+    for replica in pool.replicas:
+        replica.mark_down("connection refused")
+    assert "replica_bind" not in database._session_info(_request())
+
+
+def test_routing_session_reads_replica_until_first_write(tmp_path):
+    primary = create_db_engine(_sqlite_url(tmp_path, "primary.db"), is_async=True)
+    replica = create_db_engine(_sqlite_url(tmp_path, "replica.db"), is_async=True)
+    _seed(primary, "primary")
+    _seed(replica, "replica")
+
+    def run():
+        db = sessionmaker(bind=primary.sync_engine, class_=RoutingSession)(
+            info={"replica_bind": replica.sync_engine}
+        )
+        try:
+            before = db.scalars(select(Service.name)).all()
+            db.add(Service(name="written"))
+            db.flush()
+            after = db.scalars(select(Service.name).order_by(Service.name)).all()
+            db.commit()
+            return before, after, db.info.get("replica_bind")
+        finally:
+            db.close()
+
+    try:
+        before, after, bind = call_sync(run)
+    finally:
+        call_sync(primary.sync_engine.dispose)
+        call_sync(replica.sync_engine.dispose)
+
+    assert before == ["replica"]
+    # flush 이후 조회는 방금 쓴 행이 보이는 primary 에서
+    assert after == ["primary", "written"]
+    assert bind is None
+
+
+def test_failed_replica_read_is_retried_on_primary(tmp_path, monkeypatch):
+    # 카탈로그 테이블이 없는 레플리카: 조회가 OperationalError 로 실패하면 primary 에서 다시 실행
+    call_sync(Base.metadata.create_all, database.engine)
+    pool = create_replica_pool(_sqlite_url(tmp_path, "broken.db"), create_db_engine)
+    monkeypatch.setattr(database, "replica_pool", pool)
+    routed = []
+
+    app = FastAPI()
+    app.add_middleware(ReplicaRetryMiddleware)
+
+    @app.get("/services/count")
+    async def count_services(db=Depends(get_async_db)):
+        routed.append(db.info.get("replica_bind") is not None)
+        return (await db.execute(select(func.count()).select_from(Service))).scalar()
+
+    async def call():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get("/services/count")
+
+    try:
+        response = asyncio.run(call())
+    finally:
+        asyncio.run(pool.dispose())
+
+    assert response.status_code == 200
+    assert routed == [True, False]
+    assert not pool.replicas[0].healthy
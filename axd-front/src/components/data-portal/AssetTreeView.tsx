@@ -4,6 +4,7 @@ import { cn } from '../../lib/utils';
 import { TreeNode } from '../../hooks/useDataAssets';
 import { Input } from '../ui/input';
 import { ScrollArea } from '../ui/scroll-area';
+import { LoadMore } from '../ui/load-more';
 import { Badge } from '../ui/badge';
 import { Tooltip, TooltipContent, TooltipProvider, TooltipTrigger } from '../ui/tooltip';
 import { MyPermissionRequests } from './MyPermissionRequests';
@@ -14,6 +15,9 @@ interface AssetTreeViewProps {
   tree: TreeNode[];
   selectedAssetId: string | null;
   onSelectAsset: (assetId: string) => void;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 interface TreeItemProps {
@@ -167,7 +171,14 @@ function TreeItem({ node, depth, selectedAssetId, onSelectAsset, searchQuery, re
   );
 }
 
-export function AssetTreeView({ tree, selectedAssetId, onSelectAsset }: AssetTreeViewProps) {
+export function AssetTreeView({
+  tree,
+  selectedAssetId,
+  onSelectAsset,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore,
+}: AssetTreeViewProps) {
   const [searchQuery, setSearchQuery] = useState('');
   const { isAdmin } = useAuth();
   const { counts: requestCounts } = useAssetPermissionRequests();
@@ -207,6 +218,7 @@ export function AssetTreeView({ tree, selectedAssetId, onSelectAsset }: AssetTre
               />
             ))
           )}
+          {onLoadMore && <LoadMore hasMore={hasMore} loading={loadingMore} onLoadMore={onLoadMore} />}
         </div>
       </ScrollArea>
 
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Info, Columns, GitBranch, MessageSquare, Database, Lock, ChevronDown, Server, Users, Code, Eye, FileText } from 'lucide-react';
-import { useDataAssets, useAssetDetails, buildAssetTree } from '../../hooks/useDataAssets';
+import { useDataAssets, useAssetDetails, buildAssetTree, findAssetId } from '../../hooks/useDataAssets';
 import { useServices } from '../../hooks/useServices';
 import { useAssetPermission, canViewMetadata, canViewSchema, canViewPreview } from '../../hooks/useAssetPermission';
 import { useAuth } from '../../contexts/AuthContext';
@@ -44,7 +44,7 @@ export function DataPortal({ tableContext, onNavigateToSQL }: DataPortalProps) {
   const { isAdmin } = useAuth();
   const { services, loading: servicesLoading } = useServices();
   const [selectedService, setSelectedService] = useState<Service | null>(null);
-  const { assets, loading: assetsLoading } = useDataAssets(selectedService?.id);
+  const { assets, loading: assetsLoading, hasMore, loadingMore, loadMore } = useDataAssets(selectedService?.id);
   const [selectedAssetId, setSelectedAssetId] = useState<string | null>(null);
   const { asset, columns, lineage, comments, loading: detailsLoading, refetch } = useAssetDetails(selectedAssetId);
   const { pendingCount } = useAssetPermissionRequests(selectedAssetId || undefined);
@@ -73,9 +73,20 @@ export function DataPortal({ tableContext, onNavigateToSQL }: DataPortalProps) {
       );
       if (matchingAsset) {
         setSelectedAssetId(matchingAsset.id);
+      } else {
+        // 아직 받지 않은 페이지의 테이블이면 검색 API 로 찾음
+        let cancelled = false;
+        findAssetId(tableContext.tableName, tableContext.schemaName, tableContext.databaseName, selectedService?.id)
+          .then((assetId) => {
+            if (!cancelled && assetId) setSelectedAssetId(assetId);
+          })
+          .catch((err) => console.error(err));
+        return () => {
+          cancelled = true;
+        };
       }
     }
-  }, [tableContext, assets]);
+  }, [tableContext, assets, selectedService?.id]);
 
   const tree = buildAssetTree(assets);
 
@@ -160,6 +171,9 @@ export function DataPortal({ tableContext, onNavigateToSQL }: DataPortalProps) {
             tree={tree}
             selectedAssetId={selectedAssetId}
             onSelectAsset={setSelectedAssetId}
+            hasMore={hasMore}
+            loadingMore={loadingMore}
+            onLoadMore={loadMore}
           />
         )}
       </aside>
@@ -13,6 +13,7 @@ import {
 import { useTheme } from '../../contexts/ThemeContext';
 import { useAuth } from '../../contexts/AuthContext';
 import { useAdminStats } from '../../hooks/useAdminStats';
+import { useNotifications } from '../../hooks/useNotifications';
 import { Badge } from '../ui/badge';
 import { cn } from '../../lib/utils';
 import { LoginModal } from '../auth/LoginModal';
@@ -22,21 +23,15 @@ interface TopBarProps {
   onNavChange?: (nav: 'admin') => void;
 }
 
-const mockNotifications = [
-  { id: '1', title: '파이프라인 성공', message: 'daily_sales_aggregation 파이프라인이 성공적으로 실행되었습니다.', time: '10분 전', unread: true },
-  { id: '2', title: '권한 승인', message: 'users 테이블 접근 권한이 승인되었습니다.', time: '1시간 전', unread: true },
-  { id: '3', title: '파이프라인 실패', message: 'product_sync 파이프라인에서 오류가 발생했습니다.', time: '3시간 전', unread: false },
-];
-
 export function TopBar({ onSearchOpen, onNavChange }: TopBarProps) {
   const { theme, toggleTheme } = useTheme();
   const { user, isAdmin, signOut } = useAuth();
   const { stats } = useAdminStats();
-  const [notifications] = useState(mockNotifications);
+  const { notifications, unreadCount: userUnreadCount, markAllRead } = useNotifications(isAdmin ? null : user?.id);
   const [loginModalOpen, setLoginModalOpen] = useState(false);
 
   const adminNotificationCount = isAdmin ? stats.pendingPermissions + stats.pendingRequests + stats.newComments : 0;
-  const unreadCount = isAdmin ? adminNotificationCount : notifications.filter((n) => n.unread).length;
+  const unreadCount = isAdmin ? adminNotificationCount : userUnreadCount;
 
   return (
     <header className="flex h-14 items-center justify-between border-b border-border bg-card px-4">
@@ -61,7 +56,7 @@ export function TopBar({ onSearchOpen, onNavChange }: TopBarProps) {
           )}
         </Button>
 
-        <DropdownMenu>
+        <DropdownMenu onOpenChange={(open) => !open && !isAdmin && userUnreadCount > 0 && markAllRead()}>
           <DropdownMenuTrigger asChild>
             <Button variant="ghost" size="icon" className="relative">
               <Bell className="h-5 w-5" />
@@ -160,12 +155,12 @@ export function TopBar({ onSearchOpen, onNavChange }: TopBarProps) {
                   key={notification.id}
                   className={cn(
                     'flex flex-col items-start gap-1 p-3 cursor-pointer',
-                    notification.unread && 'bg-accent/50'
+                    !notification.is_read && 'bg-accent/50'
                   )}
                 >
                   <div className="flex w-full items-center justify-between">
                     <span className="font-medium text-sm">{notification.title}</span>
-                    <span className="text-xs text-muted-foreground">{notification.time}</span>
+                    <span className="text-xs text-muted-foreground">{formatTime(notification.created_at)}</span>
                   </div>
                   <span className="text-xs text-muted-foreground line-clamp-2">
                     {notification.message}
@@ -225,3 +220,12 @@ export function TopBar({ onSearchOpen, onNavChange }: TopBarProps) {
     </header>
   );
 }
+
+function formatTime(createdAt: string | null) {
+  if (!createdAt) return '';
+  const minutes = Math.floor((Date.now() - new Date(createdAt).getTime()) / 60000);
+  if (minutes < 1) return '방금 전';
+  if (minutes < 60) return `${minutes}분 전`;
+  if (minutes < 1440) return `${Math.floor(minutes / 60)}시간 전`;
+  return `${Math.floor(minutes / 1440)}일 전`;
+}
@@ -26,7 +26,7 @@ interface SQLWorkspaceProps {
 export function SQLWorkspace({ tableContext, onNavigateToDataPortal }: SQLWorkspaceProps) {
   const { services, loading: servicesLoading } = useServices();
   const [selectedService, setSelectedService] = useState<Service | null>(null);
-  const { assets } = useDataAssets(selectedService?.id);
+  const { assets, hasMore, loadingMore, loadMore } = useDataAssets(selectedService?.id);
   const tree = buildAssetTree(assets);
 
   useEffect(() => {
@@ -116,6 +116,9 @@ export function SQLWorkspace({ tableContext, onNavigateToDataPortal }: SQLWorksp
           selectedService={selectedService}
           onServiceChange={setSelectedService}
           servicesLoading={servicesLoading}
+          hasMore={hasMore}
+          loadingMore={loadingMore}
+          onLoadMore={loadMore}
         />
       </aside>
 
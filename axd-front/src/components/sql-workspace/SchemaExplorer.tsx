@@ -4,6 +4,7 @@ import { cn } from '../../lib/utils';
 import { TreeNode } from '../../hooks/useDataAssets';
 import { Input } from '../ui/input';
 import { ScrollArea } from '../ui/scroll-area';
+import { LoadMore } from '../ui/load-more';
 import { Badge } from '../ui/badge';
 import { Button } from '../ui/button';
 import {
@@ -36,6 +37,9 @@ interface SchemaExplorerProps {
   selectedService?: Service | null;
   onServiceChange?: (service: Service) => void;
   servicesLoading?: boolean;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 const mockColumns: Record<string, { name: string; type: string }[]> = {
@@ -190,7 +194,10 @@ export function SchemaExplorer({
   services = [],
   selectedService,
   onServiceChange,
-  servicesLoading = false
+  servicesLoading = false,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore,
 }: SchemaExplorerProps) {
   const [searchQuery, setSearchQuery] = useState('');
 
@@ -273,6 +280,7 @@ export function SchemaExplorer({
                 />
               ))
             )}
+            {onLoadMore && <LoadMore hasMore={hasMore} loading={loadingMore} onLoadMore={onLoadMore} />}
           </div>
         </ScrollArea>
       )}
@@ -0,0 +1,34 @@
+import { useEffect, useRef } from 'react';
+import { Loader2 } from 'lucide-react';
+import { Button } from './button';
+
+interface LoadMoreProps {
+  hasMore: boolean;
+  loading: boolean;
+  onLoadMore: () => void;
+}
+
+// 목록 끝에 두면 스크롤해서 보일 때 다음 페이지를 요청 (버튼으로도 요청 가능)
+export function LoadMore({ hasMore, loading, onLoadMore }: LoadMoreProps) {
+  const sentinelRef = useRef<HTMLDivElement>(null);
+
+  useEffect(() => {
+    const sentinel = sentinelRef.current;
+    if (!sentinel || !hasMore || loading) return;
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) onLoadMore();
+    });
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [hasMore, loading, onLoadMore]);
+
+  if (!hasMore) return null;
+
+  return (
+    <div ref={sentinelRef} className="flex justify-center py-2">
+      <Button variant="ghost" size="sm" className="h-7 text-xs" onClick={onLoadMore} disabled={loading}>
+        {loading ? <Loader2 className="h-3.5 w-3.5 animate-spin" /> : '더 보기'}
+      </Button>
+    </div>
+  );
+}
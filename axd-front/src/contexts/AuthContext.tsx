@@ -1,5 +1,6 @@
 import { createContext, useContext, useState, useEffect, ReactNode } from 'react';
 import { User, Session } from '@supabase/supabase-js';
+import axios from 'axios';
 import { supabase } from '../lib/supabase';
 
 interface AuthContextType {
@@ -38,6 +39,15 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     return () => subscription.unsubscribe();
   }, []);
 
+  // 백엔드가 사용자별 권한으로 자산 마스킹을 판단하도록 식별자를 전달
+  useEffect(() => {
+    if (user?.id) {
+      axios.defaults.headers.common['X-User-Id'] = user.id;
+    } else {
+      delete axios.defaults.headers.common['X-User-Id'];
+    }
+  }, [user?.id]);
+
   const signIn = async (email: string, password: string) => {
     const { error } = await supabase.auth.signInWithPassword({ email, password });
     return { error: error ? new Error(error.message) : null };
@@ -6,6 +6,12 @@ export interface AdminStats {
   pendingRequests: number;
   newComments: number;
   activeUsers: number;
+  trends?: {
+    days: string[];
+    comments: number[];
+    permissionRequests: Record<string, number[]>;
+    serviceRequests: Record<string, number[]>;
+  };
 }
 
 export function useAdminStats() {
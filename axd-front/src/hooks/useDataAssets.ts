@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import axios from 'axios';
 import { DataAsset, AssetColumn, DataLineage, AssetComment, SensitivityLevel } from '../lib/supabase';
 
@@ -9,34 +9,123 @@ export type MaskedDataAsset = DataAsset & {
   hasPermission: boolean;
 };
 
+type AssetPage = {
+  items: MaskedDataAsset[];
+  next_cursor: string | null;
+};
+
+// 첫 페이지만 받고 나머지는 스크롤/더 보기 시 next_cursor 로 이어서 요청
+const ASSET_PAGE_SIZE = 200;
+
 export function useDataAssets(serviceId?: string | null) {
   const [assets, setAssets] = useState<MaskedDataAsset[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  // 서비스가 바뀐 뒤 늦게 도착한 이전 서비스의 응답은 버림
+  const requestRef = useRef(0);
+
+  const fetchPage = useCallback(
+    (cursor: string | null) => {
+      const params: Record<string, string | number> = { limit: ASSET_PAGE_SIZE };
+      if (serviceId) params.service_id = serviceId;
+      if (cursor) params.cursor = cursor;
+      return axios.get<AssetPage>(`${API_URL}/api/v1/assets`, { params });
+    },
+    [serviceId]
+  );
 
   const fetchAssets = useCallback(async () => {
+    const request = ++requestRef.current;
     try {
       setLoading(true);
-      const params = serviceId ? { service_id: serviceId } : {};
-      const response = await axios.get<MaskedDataAsset[]>(`${API_URL}/api/v1/assets`, { params });
-      setAssets(response.data);
+      setError(null);
+      const response = await fetchPage(null);
+      if (request !== requestRef.current) return;
+      setAssets(response.data.items);
+      setNextCursor(response.data.next_cursor);
     } catch (err) {
+      if (request !== requestRef.current) return;
       console.error(err);
       setError(err instanceof Error ? err.message : 'An error occurred fetching assets');
       // Fallback or empty on error
       setAssets([]);
+      setNextCursor(null);
     } finally {
-      setLoading(false);
+      if (request === requestRef.current) {
+        setLoading(false);
+        setLoadingMore(false);
+      }
+    }
+  }, [fetchPage]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loading || loadingMore) return;
+    const request = requestRef.current;
+    try {
+      setLoadingMore(true);
+      const response = await fetchPage(nextCursor);
+      if (request !== requestRef.current) return;
+      setAssets((prev) => [...prev, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      if (request !== requestRef.current) return;
+      console.error(err);
+      setError(err instanceof Error ? err.message : 'An error occurred fetching assets');
+    } finally {
+      if (request === requestRef.current) setLoadingMore(false);
     }
-  }, [serviceId]);
+  }, [fetchPage, nextCursor, loading, loadingMore]);
 
   useEffect(() => {
     fetchAssets();
   }, [fetchAssets]);
 
-  return { assets, loading, error, refetch: fetchAssets };
+  return {
+    assets,
+    loading,
+    loadingMore,
+    hasMore: nextCursor !== null,
+    loadMore,
+    error,
+    refetch: fetchAssets,
+  };
+}
+
+type AssetSearchHit = {
+  id: string;
+  name: string;
+  schema_name: string;
+  database_name: string;
+};
+
+// 아직 받지 않은 페이지에 있는 테이블은 검색 API 로 id 를 찾음 (SQL 워크스페이스에서 이동할 때)
+export async function findAssetId(
+  tableName: string,
+  schemaName?: string,
+  databaseName?: string,
+  serviceId?: string | null
+): Promise<string | null> {
+  const params: Record<string, string | number | boolean> = { q: tableName, prefix: false, limit: 50 };
+  if (serviceId) params.service_id = serviceId;
+  const { data } = await axios.get<AssetSearchHit[]>(`${API_URL}/api/v1/assets/search`, { params });
+  const hit = data.find(
+    (a) =>
+      a.name === tableName &&
+      (!schemaName || a.schema_name === schemaName) &&
+      (!databaseName || a.database_name === databaseName)
+  );
+  return hit ? hit.id : null;
 }
 
+type AssetBundle = {
+  asset: DataAsset;
+  columns: AssetColumn[];
+  lineage: DataLineage[];
+  comments: AssetComment[];
+};
+
 export function useAssetDetails(assetId: string | null) {
   const [asset, setAsset] = useState<DataAsset | null>(null);
   const [columns, setColumns] = useState<AssetColumn[]>([]);
@@ -57,17 +146,14 @@ export function useAssetDetails(assetId: string | null) {
     try {
       setLoading(true);
 
-      const [assetRes, columnsRes, lineageRes, commentsRes] = await Promise.all([
-        axios.get<DataAsset>(`${API_URL}/api/v1/assets/${assetId}`),
-        axios.get<AssetColumn[]>(`${API_URL}/api/v1/assets/${assetId}/columns`),
-        axios.get<DataLineage[]>(`${API_URL}/api/v1/assets/${assetId}/lineage`),
-        axios.get<AssetComment[]>(`${API_URL}/api/v1/assets/${assetId}/comments`),
-      ]);
-
-      setAsset(assetRes.data);
-      setColumns(columnsRes.data);
-      setLineage(lineageRes.data);
-      setComments(commentsRes.data);
+      const { data } = await axios.get<AssetBundle>(`${API_URL}/api/v1/assets/${assetId}/bundle`, {
+        params: { include: 'columns,lineage,comments' },
+      });
+
+      setAsset(data.asset);
+      setColumns(data.columns);
+      setLineage(data.lineage);
+      setComments(data.comments);
 
     } catch (err) {
       console.error(err);
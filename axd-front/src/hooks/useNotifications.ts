@@ -0,0 +1,68 @@
+import { useState, useEffect, useCallback } from 'react';
+import axios from 'axios';
+
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+export interface AppNotification {
+  id: string;
+  event_id: string;
+  user_id: string;
+  type: string;
+  title: string;
+  message: string;
+  link: string;
+  is_read: boolean;
+  created_at: string | null;
+}
+
+export function useNotifications(userId?: string | null) {
+  const [notifications, setNotifications] = useState<AppNotification[]>([]);
+  const [unreadCount, setUnreadCount] = useState(0);
+
+  const fetchNotifications = useCallback(async () => {
+    if (!userId) return;
+    try {
+      const [list, count] = await Promise.all([
+        axios.get(`${API_URL}/api/v1/notifications/`, { params: { limit: 20 } }),
+        axios.get(`${API_URL}/api/v1/notifications/unread-count`),
+      ]);
+      setNotifications(list.data.items);
+      setUnreadCount(count.data.count);
+    } catch (error) {
+      console.error('Failed to fetch notifications:', error);
+    }
+  }, [userId]);
+
+  useEffect(() => {
+    if (!userId) {
+      setNotifications([]);
+      setUnreadCount(0);
+      return;
+    }
+    fetchNotifications();
+
+    // EventSource 는 헤더를 지정할 수 없으므로 사용자 id 를 쿼리로 전달
+    // 재연결 시 브라우저가 Last-Event-ID 를 보내 누락분을 이어받음
+    const source = new EventSource(
+      `${API_URL}/api/v1/notifications/stream?user_id=${encodeURIComponent(userId)}`
+    );
+    source.addEventListener('notification', (e) => {
+      const item: AppNotification = JSON.parse((e as MessageEvent).data);
+      setNotifications((prev) => [item, ...prev.filter((n) => n.id !== item.id)].slice(0, 20));
+      if (!item.is_read) setUnreadCount((c) => c + 1);
+    });
+    return () => source.close();
+  }, [userId, fetchNotifications]);
+
+  async function markAllRead() {
+    try {
+      await axios.post(`${API_URL}/api/v1/notifications/read`, {});
+      setNotifications((prev) => prev.map((n) => ({ ...n, is_read: true })));
+      setUnreadCount(0);
+    } catch (error) {
+      console.error('Failed to mark notifications read:', error);
+    }
+  }
+
+  return { notifications, unreadCount, refresh: fetchNotifications, markAllRead };
+}